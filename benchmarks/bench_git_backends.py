@@ -0,0 +1,107 @@
+"""
+Push benchmark: git subprocess backend vs the in-process dulwich backend.
+
+For each backend a fresh final-articles directory with --files generated articles is created,
+together with a local bare repository that acts as the remote (no network involved). The script
+times GitHubHandler construction plus add_commit_push() for the initial push, then again after
+modifying --changed articles.
+
+Usage (from the termux_article_cli directory):
+    python benchmarks/bench_git_backends.py [--files 1000] [--changed 10] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, APP_ROOT)
+
+from src.github_handler import GIT_BACKENDS, GitHubHandler
+
+ARTICLE_TEMPLATE = """---
+title: "Benchmark article {index}"
+description: "Generated for the git backend benchmark."
+excerpt: "Article {index}."
+categories: ['Benchmarks']
+tags: ['git', 'benchmark']
+date: 2024-01-01
+---
+{body}
+"""
+
+
+def write_articles(directory: str, count: int):
+    body = "Lorem ipsum dolor sit amet. " * 100
+    for index in range(count):
+        with open(os.path.join(directory, f"article_{index:05d}.md"), 'w') as f:
+            f.write(ARTICLE_TEMPLATE.format(index=index, body=body))
+
+
+def timed_push(backend: str, remote: str, local_dir: str) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        handler = GitHubHandler(repo_url=remote, local_dir=local_dir, default_branch="main",
+                                default_commit_message="bench: push articles", backend=backend)
+        success, message = handler.add_commit_push()
+    elapsed = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(f"{backend} push failed: {message}")
+    return elapsed
+
+
+def run_once(backend: str, files: int, changed: int) -> tuple[float, float]:
+    """Returns (initial push seconds, incremental push seconds) for one fresh repository."""
+    root = tempfile.mkdtemp(prefix="bench_git_")
+    try:
+        remote = os.path.join(root, "remote.git")
+        subprocess.run(["git", "init", "--bare", "-q", remote], check=True)
+        local_dir = os.path.join(root, "final")
+        os.makedirs(local_dir)
+        write_articles(local_dir, files)
+
+        initial = timed_push(backend, remote, local_dir)
+        for index in range(min(changed, files)):
+            with open(os.path.join(local_dir, f"article_{index:05d}.md"), 'a') as f:
+                f.write("\nUpdated.\n")
+        incremental = timed_push(backend, remote, local_dir)
+        return initial, incremental
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare git backends pushing to a local bare repository.")
+    parser.add_argument("--files", type=int, default=1000, help="Articles in the final directory (default: 1000).")
+    parser.add_argument("--changed", type=int, default=10, help="Articles modified before the second push (default: 10).")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh runs per backend; the fastest is reported (default: 3).")
+    args = parser.parse_args()
+
+    # Commits need an identity; use a throwaway one so the benchmark does not depend on the user's git config.
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        os.environ.setdefault(variable, "Benchmark")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        os.environ.setdefault(variable, "benchmark@example.com")
+
+    print(f"{args.files} articles, {args.changed} modified before the second push, best of {args.repeat}")
+    print(f"{'backend':<11} {'initial (s)':>12} {'incremental (s)':>16}")
+    for backend in GIT_BACKENDS:
+        if backend == "dulwich":
+            try:
+                import dulwich # noqa: F401
+            except ImportError:
+                print(f"{backend:<11} not installed (pip install dulwich)")
+                continue
+        runs = [run_once(backend, args.files, args.changed) for _ in range(max(1, args.repeat))]
+        initial = min(run[0] for run in runs)
+        incremental = min(run[1] for run in runs)
+        print(f"{backend:<11} {initial:>12.3f} {incremental:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
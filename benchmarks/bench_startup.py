@@ -0,0 +1,107 @@
+"""
+Startup-time benchmark for the CLI subcommands.
+
+Runs each subcommand's startup path in a fresh interpreter with `python -X importtime`
+and reports the summed import time, wall time, and whether the Gemini SDK was loaded.
+Only `generate` is expected to import google.generativeai; if any other subcommand does,
+the benchmark exits with status 1 so the regression is caught.
+
+Usage (from the termux_article_cli directory):
+    python benchmarks/bench_startup.py [--repeat 5] [--budget-ms 500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SDK_MODULE = "google.generativeai"
+
+# Each snippet exercises the same imports the real subcommand does, without touching the network.
+# generate: constructing ArticleGenerator is the point where the SDK gets imported and configured.
+SUBCOMMAND_SNIPPETS = {
+    "generate": (
+        "from src.main import ArticleGenerator; "
+        "ArticleGenerator(chat_history_file={chat_file!r}, gemini_api_key='benchmark-key')"
+    ),
+    "review": "import sys; from src.main import main_cli; sys.argv = ['main.py', 'review', '--status', 'draft']; main_cli()",
+    "finalize": "import sys; from src.main import main_cli; sys.argv = ['main.py', 'finalize', '--draft_name', 'missing.md']; main_cli()",
+    "push": "import sys; from src.main import main_cli; sys.argv = ['main.py', 'push']; main_cli()",
+}
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """Returns (total self import time in ms, set of imported module names) from -X importtime output."""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # Header line
+        total_us += int(fields[0].strip())
+        modules.add(fields[2].strip())
+    return total_us / 1000.0, modules
+
+
+def run_once(command: str, env: dict, chat_file: str) -> tuple[float, float, bool]:
+    snippet = SUBCOMMAND_SNIPPETS[command].format(chat_file=chat_file)
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=APP_ROOT, env=env, text=True, capture_output=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000.0
+    import_ms, modules = parse_importtime(process.stderr)
+    return import_ms, wall_ms, SDK_MODULE in modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of each CLI subcommand.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per subcommand; the fastest run is reported (default: 3).")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if any non-generate subcommand's import time exceeds this.")
+    args = parser.parse_args()
+
+    # Every data path points into a temporary directory so the benchmark leaves nothing behind in the repo.
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ)
+        env.update({
+            "DRAFTS_DIR": os.path.join(data_dir, "drafts"),
+            "FINAL_ARTICLES_DIR": os.path.join(data_dir, "final"),
+            "FAILED_VALIDATION_DIR": os.path.join(data_dir, "failed"),
+            "CHAT_HISTORY_FILE": os.path.join(data_dir, "chat_history.jsonl"),
+            "ARTICLE_CATALOG_DB": os.path.join(data_dir, "catalog.sqlite3"),
+            "RESPONSE_CACHE_DIR": os.path.join(data_dir, "response_cache"),
+            "GIT_SSH_CONTROL_DIR": os.path.join(data_dir, "ssh"),
+            "PUSH_QUEUE_DIR": os.path.join(data_dir, "push_queue"),
+            "DAEMON_SOCKET": os.path.join(data_dir, "daemon.sock"),
+            "GEMINI_API_KEY": "",
+            "GITHUB_REPO_URL": "",
+        })
+        chat_file = env["CHAT_HISTORY_FILE"]
+
+        failures = []
+        print(f"{'command':<10} {'imports (ms)':>13} {'wall (ms)':>10}  sdk loaded")
+        for command in SUBCOMMAND_SNIPPETS:
+            runs = [run_once(command, env, chat_file) for _ in range(max(1, args.repeat))]
+            import_ms, wall_ms, sdk_loaded = min(runs, key=lambda run: run[1])
+            print(f"{command:<10} {import_ms:>13.1f} {wall_ms:>10.1f}  {'yes' if sdk_loaded else 'no'}")
+
+            if command != "generate":
+                if sdk_loaded:
+                    failures.append(f"'{command}' imported {SDK_MODULE}")
+                if args.budget_ms is not None and import_ms > args.budget_ms:
+                    failures.append(f"'{command}' import time {import_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+
+    if failures:
+        print("\nREGRESSION:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
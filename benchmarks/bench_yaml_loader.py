@@ -0,0 +1,93 @@
+"""
+Frontmatter parsing benchmark: libyaml CSafeLoader vs the pure-Python SafeLoader.
+
+The corpus is the frontmatter of real generated articles, read header-only from the
+configured drafts, final and failed directories (or from --dir). If no articles are
+found, a small built-in sample is used so the script still runs.
+
+Usage (from the termux_article_cli directory):
+    python benchmarks/bench_yaml_loader.py [--dir PATH ...] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+import yaml
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, APP_ROOT)
+
+from src.article_utils import extract_frontmatter_block, parse_yaml, read_frontmatter_head
+
+SAMPLE_FRONTMATTER = """title: "Getting Started with Termux"
+description: "A practical introduction to running a Linux userland on Android."
+excerpt: "Install packages, set up SSH and automate tasks from your phone."
+categories: ['Tech Basics', 'Mobile']
+tags: ['termux', 'android', 'cli', 'beginner']
+date: 2024-01-01
+image: ""
+"""
+
+
+def collect_corpus(directories: list[str]) -> list[str]:
+    corpus = []
+    for directory in directories:
+        try:
+            with os.scandir(directory) as it:
+                paths = [entry.path for entry in it if entry.name.endswith(".md") and entry.is_file()]
+        except FileNotFoundError:
+            continue
+        for path in paths:
+            frontmatter = extract_frontmatter_block(read_frontmatter_head(path) or "")
+            if frontmatter:
+                corpus.append(frontmatter)
+    return corpus
+
+
+def default_directories() -> list[str]:
+    from src.config import get_drafts_dir, get_final_articles_dir, get_failed_validation_dir
+    return [get_drafts_dir(), get_final_articles_dir(), get_failed_validation_dir()]
+
+
+def time_loader(loader, corpus: list[str], repeat: int) -> float:
+    """Returns the best per-document parse time in microseconds over repeat passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in corpus:
+            try:
+                parse_yaml(document, loader=loader)
+            except yaml.YAMLError:
+                pass # Malformed frontmatter from the failed directory still costs parse time
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare YAML loaders on real generated frontmatter.")
+    parser.add_argument("--dir", action="append", dest="dirs", metavar="PATH", help="Directory of articles (repeatable). Defaults to the configured article directories.")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus; the best pass is reported (default: 20).")
+    args = parser.parse_args()
+
+    corpus = collect_corpus(args.dirs or default_directories())
+    source = f"{len(corpus)} articles"
+    if not corpus:
+        corpus = [SAMPLE_FRONTMATTER] * 200
+        source = "built-in sample (no articles found)"
+    print(f"Corpus: {source}, {sum(len(doc) for doc in corpus) / len(corpus):.0f} chars of frontmatter on average")
+
+    pure_us = time_loader(yaml.SafeLoader, corpus, args.repeat)
+    print(f"SafeLoader (pure Python): {pure_us:8.1f} us/doc")
+
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if c_loader is None:
+        print("CSafeLoader: not available (PyYAML built without libyaml)")
+        return
+    c_us = time_loader(c_loader, corpus, args.repeat)
+    print(f"CSafeLoader (libyaml):   {c_us:8.1f} us/doc")
+    print(f"Speedup: {pure_us / c_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
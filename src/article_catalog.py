@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+
+
+class ArticleCatalog:
+    """
+    Persistent SQLite index of the articles in each status directory (draft, final, failed).
+    For every article it stores filename, mtime, size and the parsed frontmatter fields, so
+    listing, sorting and paging do not have to open every file again.
+
+    refresh() updates the catalog incrementally: the directory is scanned with os.scandir and
+    only files whose mtime or size changed since the last refresh are re-parsed.
+    """
+    SORT_COLUMNS = {
+        "name": "filename",
+        "mtime": "mtime_ns",
+        "size": "size",
+        "title": "title",
+        "date": "date",
+    }
+
+    def __init__(self, db_path: str, frontmatter_parser=None):
+        self.db_path = db_path
+        # callable(article_path) -> (is_valid, frontmatter_dict | None, error_message | None),
+        # i.e. the same contract as validate_frontmatter. Without it only file metadata is indexed.
+        self.frontmatter_parser = frontmatter_parser
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            dir_name = os.path.dirname(self.db_path)
+            if dir_name:
+                os.makedirs(dir_name, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    status TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    title TEXT,
+                    date TEXT,
+                    tags TEXT,
+                    categories TEXT,
+                    is_valid INTEGER,
+                    error TEXT,
+                    PRIMARY KEY (status, filename)
+                );
+                CREATE INDEX IF NOT EXISTS idx_articles_status_mtime ON articles (status, mtime_ns);
+            """)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _parse(self, article_path: str) -> tuple:
+        """Returns (title, date, tags_json, categories_json, is_valid, error) for one article."""
+        if self.frontmatter_parser is None:
+            return None, None, None, None, None, None
+        try:
+            is_valid, frontmatter, error_message = self.frontmatter_parser(article_path)
+        except Exception as e:
+            return None, None, None, None, 0, f"Could not parse article: {e}"
+        if not frontmatter:
+            return None, None, None, None, int(bool(is_valid)), error_message
+
+        def as_text(value):
+            return None if value is None else str(value)
+
+        def as_json(value):
+            return None if value is None else json.dumps(value, default=str)
+
+        return (
+            as_text(frontmatter.get("title")),
+            as_text(frontmatter.get("date")),
+            as_json(frontmatter.get("tags")),
+            as_json(frontmatter.get("categories")),
+            int(bool(is_valid)),
+            error_message,
+        )
+
+    def refresh(self, status: str, articles_dir: str) -> dict:
+        """
+        Brings the catalog for status in line with articles_dir.
+        Returns counts of added, updated, removed and unchanged articles.
+        """
+        conn = self._connect()
+        known = {
+            row["filename"]: (row["mtime_ns"], row["size"])
+            for row in conn.execute("SELECT filename, mtime_ns, size FROM articles WHERE status = ?", (status,))
+        }
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+
+        try:
+            with os.scandir(articles_dir) as it:
+                entries = [entry for entry in it if entry.name.endswith(".md") and entry.is_file()]
+        except FileNotFoundError:
+            entries = []
+
+        with conn:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue # Removed between scandir and stat
+                seen.add(entry.name)
+                previous = known.get(entry.name)
+                if previous == (stat.st_mtime_ns, stat.st_size):
+                    counts["unchanged"] += 1
+                    continue
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO articles "
+                    "(status, filename, mtime_ns, size, title, date, tags, categories, is_valid, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (status, entry.name, stat.st_mtime_ns, stat.st_size, *self._parse(entry.path))
+                )
+                counts["updated" if previous else "added"] += 1
+
+            removed = [filename for filename in known if filename not in seen]
+            conn.executemany("DELETE FROM articles WHERE status = ? AND filename = ?",
+                             [(status, filename) for filename in removed])
+            counts["removed"] = len(removed)
+
+        return counts
+
+    def count(self, status: str) -> int:
+        row = self._connect().execute("SELECT COUNT(*) FROM articles WHERE status = ?", (status,)).fetchone()
+        return row[0]
+
+    def query(self, status: str, sort: str = "name", descending: bool = False,
+              limit: int | None = None, offset: int = 0) -> list[dict]:
+        """Returns catalog rows for status as dicts, sorted and paged in SQLite."""
+        if sort not in self.SORT_COLUMNS:
+            raise ValueError(f"Invalid sort key '{sort}'. Choose from {', '.join(self.SORT_COLUMNS)}.")
+        column = self.SORT_COLUMNS[sort]
+        direction = "DESC" if descending else "ASC"
+        sql = (f"SELECT * FROM articles WHERE status = ? "
+               f"ORDER BY {column} IS NULL, {column} {direction}, filename {direction} LIMIT ? OFFSET ?")
+        rows = self._connect().execute(sql, (status, limit if limit else -1, max(0, offset)))
+
+        articles = []
+        for row in rows:
+            article = dict(row)
+            for field in ("tags", "categories"):
+                article[field] = json.loads(article[field]) if article[field] else []
+            articles.append(article)
+        return articles
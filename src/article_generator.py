@@ -1,16 +1,181 @@
+import asyncio
+import contextlib
+import fcntl
 import json
 import os
-import google.generativeai as genai
+import threading
+import time
 import datetime # Added for generating current date
+
+# google.generativeai pulls in grpc and protobuf and takes seconds to import on a phone.
+# It is loaded on first use by _load_genai() so review/finalize/push never pay for it.
+genai = None
+
+
+def _load_genai():
+    global genai
+    if genai is None:
+        import google.generativeai as _genai
+        genai = _genai
+    return genai
+
+
+class ChatHistoryLog:
+    """
+    Append-only JSON Lines store for chat history: one JSON record per line.
+    Appending a generation costs O(1) regardless of how large the history has grown.
+    If a legacy chat_history.json (a single JSON list) sits next to the log, it is
+    migrated into the log on first use and renamed to '<name>.json.migrated'.
+    Several processes may share the log: appends hold a shared flock on '<log>.lock', while
+    migration, compaction, rewrites and rotation, which replace the log, hold it exclusively.
+    """
+    def __init__(self, path: str):
+        base, ext = os.path.splitext(path)
+        self.log_path = path if ext == ".jsonl" else base + ".jsonl"
+        self.legacy_path = base + ".json"
+        self.lock_path = self.log_path + ".lock"
+        self._lock = threading.Lock()
+        self._migration_checked = False
+
+    def _ensure_dir(self):
+        dir_name = os.path.dirname(self.log_path)
+        if dir_name: # Only create if dirname is not empty
+            os.makedirs(dir_name, exist_ok=True)
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool):
+        """
+        Holds the thread lock and an flock on the lock file. The log itself is not locked because
+        compaction replaces it: a process waiting on the old inode would then append to a dead file.
+        """
+        with self._lock:
+            self._ensure_dir()
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _migrate_legacy(self):
+        """One-time conversion of a legacy JSON list file into the JSON Lines log."""
+        if self._migration_checked:
+            return
+        if os.path.exists(self.legacy_path) and not os.path.exists(self.log_path):
+            with self._locked(exclusive=True):
+                self._migrate_legacy_locked()
+        self._migration_checked = True
+
+    def _migrate_legacy_locked(self):
+        # Checked again under the lock: another process may have migrated the file in the meantime.
+        if os.path.exists(self.log_path) or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r') as f:
+                content = f.read()
+            records = json.loads(content) if content.strip() else []
+        except (OSError, json.JSONDecodeError):
+            return # Leave an unreadable legacy file untouched for manual inspection
+        if not isinstance(records, list):
+            return
+        self._write_records(records)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+
+    def _write_records(self, records: list):
+        """Atomically replaces the log with records. Callers hold the exclusive lock."""
+        self._ensure_dir()
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self.log_path)
+
+    def _read_records(self):
+        try:
+            with open(self.log_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def append(self, record: dict):
+        self._migrate_legacy()
+        with self._locked(exclusive=False):
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+    def iter_records(self):
+        """Yields records one at a time. Lines that cannot be parsed (e.g. a torn final write) are skipped."""
+        self._migrate_legacy()
+        yield from self._read_records()
+
+    def load(self) -> list:
+        return list(self.iter_records())
+
+    def rewrite(self, records: list):
+        with self._locked(exclusive=True):
+            self._migration_checked = True # Explicit rewrite supersedes any legacy file
+            self._write_records(records)
+
+    def compact(self, keep_last: int) -> int:
+        """
+        Keeps only the most recent keep_last records. Returns the number of records dropped.
+        Appends from other processes wait until the compacted log is in place, so none are lost.
+        """
+        self._migrate_legacy()
+        with self._locked(exclusive=True):
+            records = list(self._read_records())
+            dropped = max(0, len(records) - max(0, keep_last))
+            if dropped:
+                self._write_records(records[dropped:])
+        return dropped
+
+    def rotate(self) -> str | None:
+        """
+        Moves the active log aside to '<log>.<YYYYMMDD_HHMMSS>' so new records start a fresh segment.
+        Returns the path of the rotated segment, or None if there was nothing to rotate.
+        """
+        with self._locked(exclusive=True):
+            if not self._migration_checked:
+                self._migrate_legacy_locked()
+                self._migration_checked = True
+            if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == 0:
+                return None
+            segment_path = f"{self.log_path}.{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            os.replace(self.log_path, segment_path)
+            return segment_path
+
+
 class ArticleGenerator:
-    def __init__(self, chat_history_file: str, gemini_api_key: str, openai_api_key: str = None, hf_api_key: str = None):
+    MODEL_NAME = 'gemini-1.5-flash-latest' # Or 'gemini-pro'
+    EXPECTED_OUTPUT_TOKENS = 2048 # Rate limiter estimate for one article; corrected from usage_metadata afterwards
+    EXTRACTION_ERROR = ("Error: Could not extract text from Gemini response. The response object did not contain "
+                        ".text (with content) or .parts with text.")
+
+    def __init__(self, chat_history_file: str, gemini_api_key: str, openai_api_key: str = None, hf_api_key: str = None,
+                 response_cache=None, rate_limiter=None, retry_policy=None):
         self.gemini_api_key = gemini_api_key
+        self.model_name = self.MODEL_NAME
+        # Optional ResponseCache; when set, identical prompts are answered from disk instead of the API.
+        self.response_cache = response_cache
+        # Optional RateLimiter (requests/tokens per minute) and RetryPolicy (backoff for 429/5xx errors).
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.total_retries = 0
+        self.total_rate_limit_wait_seconds = 0.0
         if self.gemini_api_key:
             try:
-                genai.configure(api_key=self.gemini_api_key)
+                sdk = _load_genai()
+                sdk.configure(api_key=self.gemini_api_key)
                 # Initialize the model here or in generate_article.
                 # Let's initialize it here if the API key is present.
-                self.model = genai.GenerativeModel('gemini-1.5-flash-latest') # Or 'gemini-pro'
+                self.model = sdk.GenerativeModel(self.model_name)
             except Exception as e:
                 print(f"Error configuring Gemini API or initializing model: {e}")
                 self.model = None
@@ -21,20 +186,16 @@ class ArticleGenerator:
         # self.openai_api_key = openai_api_key # Kept if needed for other funcs
         # self.hf_api_key = hf_api_key       # Kept if needed for other funcs
         self.chat_history_file = chat_history_file
-        self.chat_history = self.load_chat_history()
+        self.history_log = ChatHistoryLog(chat_history_file)
+        self._chat_history = None # Loaded lazily on first access to chat_history
+        # Batch mode calls generate_article from several threads; history updates must not interleave.
+        self._history_lock = threading.Lock()
 
 
-    def generate_article(self, topic_prompt: str) -> str: # Renamed 'prompt' to 'topic_prompt' for clarity
-        if not self.model:
-            response_text = "Error: Gemini API key not configured or model not initialized."
-            if not hasattr(self, 'chat_history'): self.chat_history = []
-            self.chat_history.append({"user": topic_prompt, "ai": response_text}) # Use topic_prompt for history
-            self.save_chat_history()
-            return response_text
-
+    def _build_prompt(self, topic_prompt: str) -> str:
         current_date = datetime.datetime.now().strftime('%Y-%m-%d')
 
-        detailed_internal_prompt = f"""Please generate a complete Markdown article based on the following topic: "{topic_prompt}"
+        return f"""Please generate a complete Markdown article based on the following topic: "{topic_prompt}"
 
 The article must start with a YAML frontmatter block, enclosed by '---' delimiters.
 The frontmatter must include the following fields:
@@ -50,53 +211,305 @@ Following the frontmatter, provide the main article content in well-structured M
 Ensure the Markdown is clean and adheres to common standards.
 The article content should be comprehensive and informative based on the topic: "{topic_prompt}".
 """
+
+    def generate_article(self, topic_prompt: str) -> str: # Renamed 'prompt' to 'topic_prompt' for clarity
+        if not self.model:
+            response_text = "Error: Gemini API key not configured or model not initialized."
+            self._record_history(topic_prompt, response_text) # Use topic_prompt for history
+            return response_text
+
+        detailed_internal_prompt = self._build_prompt(topic_prompt)
+
+        cache_key, cached_text = self._lookup_cache(detailed_internal_prompt)
+        if cached_text is not None:
+            self._record_history(topic_prompt, cached_text, model=self.model_name, cached=True)
+            return cached_text
+
+        call_stats = {"rate_limit_wait_s": 0.0, "retries": 0}
         try:
             # Using the detailed_internal_prompt to generate content
-            response = self.model.generate_content(detailed_internal_prompt)
-            
-            # Accessing the text content. For Gemini, response.text is typical.
-            # If response.parts is used, it's often for more complex content (e.g. multimodal)
-            # or when specific parts of a streamed response are handled.
-            # Based on common usage, response.text should be the primary way for simple text generation.
-            if hasattr(response, 'text') and response.text is not None: # Check if text is not None
-                response_text = response.text
-            elif hasattr(response, 'parts') and response.parts: # Check if parts exist and is not empty
-                 response_text = "".join(part.text for part in response.parts if hasattr(part, 'text'))
-            else: # If neither .text nor .parts with text is found.
-                response_text = "Error: Could not extract text from Gemini response. The response object did not contain .text (with content) or .parts with text."
-                # print(f"DEBUG: Unexpected Gemini response structure: {response}")
+            response = self._call_model(detailed_internal_prompt, call_stats)
+            response_text = self._extract_text(response)
+            if response_text is None:
+                response_text = self.EXTRACTION_ERROR
+                cache_key = None # Never cache an extraction failure
+        except Exception as e: 
+            response_text = self._api_error_text(e, call_stats)
+            cache_key = None
 
+        return self._finish_generation(topic_prompt, response_text, cache_key, call_stats)
 
-        except Exception as e: 
-            response_text = f"Error generating article using Gemini API: {str(e)}"
-        
-        # Store the original user topic_prompt and the full AI response in chat history
-        self.chat_history.append({"user": topic_prompt, "ai": response_text})
-        self.save_chat_history()
+    async def agenerate_article(self, topic_prompt: str, timeout: float | None = None,
+                                semaphore: asyncio.Semaphore | None = None) -> str:
+        """
+        Async counterpart of generate_article built on the SDK's generate_content_async, so many requests
+        can be in flight on one event loop without a thread each. Returns the same text or 'Error: ...' string;
+        a request that takes longer than timeout seconds is abandoned and reported as an error.
+        semaphore, if given, limits how many requests are in flight. A slot is held only while a request is
+        outstanding: cache hits, rate-limiter waits and retry backoff do not take one.
+        Cancelling the awaiting task cancels the request, and nothing is recorded for it.
+        """
+        if not self.model:
+            response_text = "Error: Gemini API key not configured or model not initialized."
+            self._record_history(topic_prompt, response_text)
+            return response_text
+
+        detailed_internal_prompt = self._build_prompt(topic_prompt)
+
+        cache_key, cached_text = self._lookup_cache(detailed_internal_prompt)
+        if cached_text is not None:
+            self._record_history(topic_prompt, cached_text, model=self.model_name, cached=True)
+            return cached_text
+
+        call_stats = {"rate_limit_wait_s": 0.0, "retries": 0}
+        try:
+            response = await self._acall_model(detailed_internal_prompt, call_stats, timeout, semaphore)
+            response_text = self._extract_text(response)
+            if response_text is None:
+                response_text = self.EXTRACTION_ERROR
+                cache_key = None
+        except asyncio.TimeoutError:
+            response_text = f"Error generating article using Gemini API: request timed out after {timeout} seconds."
+            cache_key = None
+        except Exception as e:
+            response_text = self._api_error_text(e, call_stats)
+            cache_key = None
+
+        return self._finish_generation(topic_prompt, response_text, cache_key, call_stats)
+
+    async def agenerate_many(self, topic_prompts: list[str], concurrency: int = 4, timeout: float | None = None,
+                             on_result=None) -> list[str]:
+        """
+        Generates an article for every prompt with at most concurrency requests in flight and returns the
+        results in prompt order. on_result(position, topic_prompt, text), if given, is called as soon as each
+        one finishes, e.g. to save it. If the caller is cancelled (or on_result raises), every request still
+        outstanding is cancelled before the exception propagates.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def generate(position: int, topic_prompt: str) -> str:
+            response_text = await self.agenerate_article(topic_prompt, timeout=timeout, semaphore=semaphore)
+            if on_result is not None:
+                on_result(position, topic_prompt, response_text)
+            return response_text
+
+        tasks = [asyncio.create_task(generate(position, prompt)) for position, prompt in enumerate(topic_prompts)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def _estimate_tokens(self, detailed_internal_prompt: str) -> int:
+        # Roughly 4 characters per prompt token, plus room for a full article in the response
+        return len(detailed_internal_prompt) // 4 + self.EXPECTED_OUTPUT_TOKENS
+
+    @staticmethod
+    def _usage_counts(response) -> dict:
+        """Token counts from a response's usage_metadata: prompt_tokens, output_tokens, total_tokens (when reported)."""
+        usage = getattr(response, "usage_metadata", None)
+        counts = {}
+        for field, attribute in (("prompt_tokens", "prompt_token_count"), ("output_tokens", "candidates_token_count"),
+                                 ("total_tokens", "total_token_count")):
+            value = getattr(usage, attribute, None)
+            if isinstance(value, int):
+                counts[field] = value
+        return counts
+
+    def _record_usage(self, response, estimated_tokens: int, call_stats: dict):
+        """Adds the response's token counts to call_stats and corrects the rate limiter's estimate with them."""
+        call_stats.update(self._usage_counts(response))
+        if self.rate_limiter is not None and "total_tokens" in call_stats:
+            self.rate_limiter.record_usage(estimated_tokens, call_stats["total_tokens"])
+
+    def _call_model(self, detailed_internal_prompt: str, call_stats: dict):
+        """
+        model.generate_content behind the rate limiter, retrying transient (429/5xx) errors per retry_policy.
+        Time spent waiting for the limiter, the number of retries, the latency of the last attempt and
+        the response's token counts are added to call_stats.
+        """
+        estimated_tokens = self._estimate_tokens(detailed_internal_prompt)
+        while True:
+            if self.rate_limiter is not None:
+                call_stats["rate_limit_wait_s"] += self.rate_limiter.acquire(estimated_tokens)
+            started = time.perf_counter()
+            try:
+                response = self.model.generate_content(detailed_internal_prompt)
+            except Exception as e:
+                call_stats["latency_s"] = time.perf_counter() - started
+                if self.retry_policy is None or not self.retry_policy.should_retry(e, call_stats["retries"]):
+                    raise
+                time.sleep(self.retry_policy.delay(call_stats["retries"]))
+                call_stats["retries"] += 1
+                continue
+            call_stats["latency_s"] = time.perf_counter() - started
+            self._record_usage(response, estimated_tokens, call_stats)
+            return response
+
+    async def _acall_model(self, detailed_internal_prompt: str, call_stats: dict, timeout: float | None,
+                           semaphore: asyncio.Semaphore | None = None):
+        """
+        Async _call_model(). timeout bounds each attempt; a timed-out attempt is not retried.
+        semaphore is held only around each attempt, so a request waiting for the limiter or backing off
+        leaves its slot to one that can go ahead.
+        """
+        estimated_tokens = self._estimate_tokens(detailed_internal_prompt)
+        while True:
+            if self.rate_limiter is not None:
+                call_stats["rate_limit_wait_s"] += await self.rate_limiter.aacquire(estimated_tokens)
+            retry = False
+            async with semaphore or contextlib.nullcontext():
+                started = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(self.model.generate_content_async(detailed_internal_prompt), timeout)
+                except asyncio.TimeoutError:
+                    call_stats["latency_s"] = time.perf_counter() - started
+                    raise
+                except Exception as e:
+                    call_stats["latency_s"] = time.perf_counter() - started
+                    if self.retry_policy is None or not self.retry_policy.should_retry(e, call_stats["retries"]):
+                        raise
+                    retry = True
+            if retry:
+                await asyncio.sleep(self.retry_policy.delay(call_stats["retries"]))
+                call_stats["retries"] += 1
+                continue
+            call_stats["latency_s"] = time.perf_counter() - started
+            self._record_usage(response, estimated_tokens, call_stats)
+            return response
+
+    @staticmethod
+    def _api_error_text(error: Exception, call_stats: dict) -> str:
+        retries = call_stats["retries"]
+        suffix = f" (gave up after {retries} {'retry' if retries == 1 else 'retries'})" if retries else ""
+        return f"Error generating article using Gemini API: {str(error)}{suffix}"
+
+    def _lookup_cache(self, detailed_internal_prompt: str) -> tuple[str | None, str | None]:
+        """Returns (cache key or None without a cache, cached response text or None)."""
+        if self.response_cache is None:
+            return None, None
+        cache_key = self.response_cache.make_key(self.model_name, detailed_internal_prompt)
+        return cache_key, self.response_cache.get(cache_key)
+
+    @staticmethod
+    def _extract_text(response) -> str | None:
+        """Returns the text of a Gemini response, or None if it has none."""
+        # Accessing the text content. For Gemini, response.text is typical.
+        # If response.parts is used, it's often for more complex content (e.g. multimodal)
+        # or when specific parts of a streamed response are handled.
+        if hasattr(response, 'text') and response.text is not None: # Check if text is not None
+            return response.text
+        if hasattr(response, 'parts') and response.parts: # Check if parts exist and is not empty
+            return "".join(part.text for part in response.parts if hasattr(part, 'text'))
+        return None
+
+    def _metrics_fields(self, call_stats: dict) -> dict:
+        """History record fields for one model call: model name, latency and token counts (when known)."""
+        fields = {"model": self.model_name}
+        for field in ("latency_s", "ttfb_s"):
+            if call_stats.get(field) is not None:
+                fields[field] = round(call_stats[field], 3)
+        for field in ("prompt_tokens", "output_tokens"):
+            if field in call_stats:
+                fields[field] = call_stats[field]
+        return fields
+
+    def _finish_generation(self, topic_prompt: str, response_text: str, cache_key: str | None,
+                           call_stats: dict | None = None) -> str:
+        if cache_key is not None:
+            try:
+                self.response_cache.put(cache_key, self.model_name, response_text)
+            except OSError as e:
+                print(f"Warning: Could not write response cache entry: {e}")
+
+        # Store the original user topic_prompt and the full AI response in chat history, with the call's metrics
+        extra = self._metrics_fields(call_stats) if call_stats is not None else {}
+        if call_stats is not None and (self.rate_limiter is not None or self.retry_policy is not None):
+            extra.update(rate_limit_wait_s=round(call_stats["rate_limit_wait_s"], 3), retries=call_stats["retries"])
+            with self._history_lock:
+                self.total_retries += call_stats["retries"]
+                self.total_rate_limit_wait_seconds += call_stats["rate_limit_wait_s"]
+        self._record_history(topic_prompt, response_text, **extra)
         return response_text # This is the raw_response_text
 
+    def stream_article(self, topic_prompt: str):
+        """
+        Yields the generated article text chunk by chunk as the model produces it.
+        Closing the generator early stops consuming the stream, so a caller that has already
+        rejected the frontmatter does not wait for (or keep) the rest of the body.
+        The article itself is not kept in chat history; the record notes how many characters
+        were received and whether the stream was stopped early, plus the rate limiter's wait when one is set.
+        A completed stream's final token counts correct the limiter's estimate, as for non-streamed calls.
+        """
+        if not self.model:
+            raise RuntimeError("Error: Gemini API key not configured or model not initialized.")
+
+        received_chars = 0
+        completed = False
+        call_stats = {"rate_limit_wait_s": 0.0}
+        try:
+            detailed_internal_prompt = self._build_prompt(topic_prompt)
+            estimated_tokens = self._estimate_tokens(detailed_internal_prompt)
+            if self.rate_limiter is not None: # A partly streamed response cannot be retried, only rate limited
+                call_stats["rate_limit_wait_s"] += self.rate_limiter.acquire(estimated_tokens)
+            started = time.perf_counter()
+            response = self.model.generate_content(detailed_internal_prompt, stream=True)
+            last_chunk = None
+            for chunk in response:
+                last_chunk = chunk
+                call_stats.update(self._usage_counts(chunk)) # Cumulative; the last chunk has the final counts
+                try:
+                    text = chunk.text
+                except (AttributeError, ValueError): # Chunks without text parts (e.g. safety metadata)
+                    text = None
+                if text:
+                    if received_chars == 0:
+                        call_stats["ttfb_s"] = time.perf_counter() - started # Time to first byte of the article
+                    received_chars += len(text)
+                    call_stats["latency_s"] = time.perf_counter() - started
+                    yield text
+            completed = True
+            call_stats["latency_s"] = time.perf_counter() - started
+            if last_chunk is not None:
+                self._record_usage(last_chunk, estimated_tokens, call_stats)
+        finally:
+            extra = self._metrics_fields(call_stats)
+            if self.rate_limiter is not None:
+                extra["rate_limit_wait_s"] = round(call_stats["rate_limit_wait_s"], 3)
+                with self._history_lock:
+                    self.total_rate_limit_wait_seconds += call_stats["rate_limit_wait_s"]
+            self._record_history(topic_prompt, None, streamed=True, received_chars=received_chars,
+                                 stopped_early=not completed, **extra)
+
+    @property
+    def chat_history(self) -> list:
+        if self._chat_history is None:
+            self._chat_history = self.load_chat_history()
+        return self._chat_history
+
+    @chat_history.setter
+    def chat_history(self, value: list):
+        self._chat_history = value
+
+    def _record_history(self, topic_prompt: str, response_text: str | None, **extra):
+        record = {"user": topic_prompt, "ai": response_text, **extra}
+        with self._history_lock:
+            self.history_log.append(record)
+            # Only keep the in-memory copy in sync if something has already loaded it.
+            if self._chat_history is not None:
+                self._chat_history.append(record)
+
     def load_chat_history(self) -> list:
         try:
-            if os.path.exists(self.chat_history_file):
-                with open(self.chat_history_file, 'r') as f:
-                    # Check if file is empty to prevent JSONDecodeError
-                    if os.path.getsize(self.chat_history_file) == 0:
-                        return []
-                    return json.load(f)
-            return []
-        except (FileNotFoundError, json.JSONDecodeError):
+            return self.history_log.load()
+        except OSError:
             return []
 
     def save_chat_history(self):
-        # Ensure the directory exists
-        # os.path.dirname() will return an empty string if chat_history_file is just a filename
-        # so we ensure that data directory is created if the path is like 'data/chat_history.json'
-        dir_name = os.path.dirname(self.chat_history_file)
-        if dir_name: # Only create if dirname is not empty
-            os.makedirs(dir_name, exist_ok=True)
-        
-        with open(self.chat_history_file, 'w') as f:
-            json.dump(self.chat_history, f, indent=4)
+        """Rewrites the whole log from chat_history. Generation only appends; use this after editing history in memory."""
+        self.history_log.rewrite(self.chat_history)
 
 # Example usage (primarily for testing, actual use will be in main.py)
 # if __name__ == '__main__':
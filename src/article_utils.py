@@ -1,17 +1,214 @@
 import os
 import datetime
+import errno
+import shutil
+import threading
 import yaml # Added for PyYAML
 
+def _select_yaml_loader():
+    """
+    Prefers PyYAML's libyaml-backed CSafeLoader, which parses frontmatter several times faster.
+    Falls back to the pure-Python SafeLoader when PyYAML was built without libyaml.
+    """
+    return getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader
+
+YAML_LOADER = _select_yaml_loader()
+
+def yaml_loader_description() -> str:
+    """Human-readable name of the active YAML loader, for diagnostics."""
+    if YAML_LOADER.__name__ == "CSafeLoader":
+        return "CSafeLoader (libyaml C extension)"
+    return f"{YAML_LOADER.__name__} (pure Python; PyYAML built without libyaml)"
+
+def parse_yaml(text: str, loader=None):
+    """Safely parses text with the active loader (or the given one)."""
+    return yaml.load(text, Loader=loader or YAML_LOADER)
+
 # Keep existing save_article, load_article, list_articles as they are.
 # Their functionality regarding which directory they use will be determined by the
 # 'articles_dir' argument passed to them, which in main.py will come from
 # the new config functions (e.g., get_drafts_dir()).
 
-def save_article(article_content: str, articles_dir: str, filename: str = None) -> str:
+def fsync_directory(dir_path: str):
+    """
+    Flushes a directory's entries (new names, renames) to disk. Best effort: some platforms and
+    filesystems cannot open or fsync a directory, in which case this does nothing.
+    """
+    try:
+        fd = os.open(dir_path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _temp_path_for(path: str) -> str:
+    """Hidden temporary name next to path; it never ends in '.md', so listings and the catalog skip it."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def _write_temp(path: str, content: str | bytes, fsync: bool) -> str:
+    """Writes content to a temporary file next to path and returns the temporary path."""
+    tmp_path = _temp_path_for(path)
+    try:
+        with open(tmp_path, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return tmp_path
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def atomic_write_text(path: str, content: str | bytes, durable: bool = True):
+    """
+    Replaces path with content so that readers (and a crash) see either the old file or the complete
+    new one, never a truncated write: the content goes to a temporary file, which is fsynced and then
+    renamed over path with os.replace, after which the directory is fsynced so the rename itself survives.
+    durable=False skips both fsyncs (still atomic, but not crash-durable).
+    """
+    tmp_path = _write_temp(path, content, fsync=durable)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    if durable:
+        fsync_directory(os.path.dirname(path))
+
+def move_article(source_path: str, destination_path: str, durable: bool = True):
+    """
+    Moves an article atomically with os.replace (overwriting destination_path), then fsyncs the
+    destination and source directories. If the two are on different filesystems, the article is
+    first written durably to the destination and only then removed from the source.
+    durable=False skips the directory fsyncs; GroupCommit uses that to do them once per batch.
+    """
+    try:
+        os.replace(source_path, destination_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        tmp_path = _temp_path_for(destination_path)
+        try:
+            shutil.copy2(source_path, tmp_path)
+            with open(tmp_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, destination_path)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        fsync_directory(os.path.dirname(destination_path)) # The copy must be on disk before the source goes
+        os.remove(source_path)
+    if durable:
+        fsync_directory(os.path.dirname(destination_path))
+        if os.path.dirname(source_path) != os.path.dirname(destination_path):
+            fsync_directory(os.path.dirname(source_path))
+
+class GroupCommit:
+    """
+    Batches the fsyncs of many atomic writes and moves, for bulk runs on slow flash storage.
+
+    write_text() writes a temporary file and renames it into place at once, so each file is complete and
+    visible as soon as the call returns (a crash can still lose its data until the next commit); move()
+    renames straight away too. The syncing is deferred: commit() flushes the data of every pending write
+    with a single os.sync() (or one fsync each where os.sync is unavailable), then fsyncs each touched
+    directory once. It runs automatically every max_pending writes and when the with-block exits.
+    Safe to use from several threads.
+    """
+    def __init__(self, max_pending: int = 64):
+        self.max_pending = max_pending
+        self._pending_writes = [] # Paths written since the last commit
+        self._dirty_dirs = set()
+        self._lock = threading.Lock()
+
+    def write_text(self, path: str, content: str | bytes):
+        tmp_path = _write_temp(path, content, fsync=False)
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+        with self._lock:
+            self._dirty_dirs.add(os.path.dirname(path))
+            self._pending_writes.append(path)
+            should_commit = len(self._pending_writes) >= self.max_pending
+        if should_commit:
+            self.commit()
+
+    def move(self, source_path: str, destination_path: str):
+        move_article(source_path, destination_path, durable=False)
+        with self._lock:
+            self._dirty_dirs.update({os.path.dirname(source_path), os.path.dirname(destination_path)})
+
+    def commit(self):
+        with self._lock:
+            pending, self._pending_writes = self._pending_writes, []
+            dirty_dirs, self._dirty_dirs = self._dirty_dirs, set()
+        if pending:
+            if hasattr(os, "sync"):
+                os.sync()
+            else:
+                for path in pending:
+                    with open(path, 'rb') as f:
+                        os.fsync(f.fileno())
+        for dir_path in dirty_dirs:
+            fsync_directory(dir_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.commit() # Keep whatever completed, even if the batch stopped early
+
+def _pid_is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError: # e.g. EPERM: it exists but belongs to someone else
+        return True
+    return True
+
+def remove_stale_temp_files(articles_dir: str) -> int:
+    """
+    Removes temporary files (see _temp_path_for) left in articles_dir by a process that died mid-write.
+    Files whose writer is still running are kept. Returns how many were removed.
+    """
+    try:
+        names = os.listdir(articles_dir)
+    except OSError:
+        return 0
+    removed = 0
+    for name in names:
+        if not (name.startswith(".") and name.endswith(".tmp")):
+            continue
+        parts = name[:-len(".tmp")].rsplit(".", 2) # ".{name}", pid, thread id
+        if len(parts) != 3 or not parts[1].isdigit() or _pid_is_running(int(parts[1])):
+            continue
+        try:
+            os.remove(os.path.join(articles_dir, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+def save_article(article_content: str, articles_dir: str, filename: str = None, group_commit: GroupCommit = None) -> str:
     """
     Saves the article_content to a file in articles_dir.
     If filename is not provided, generate one using a timestamp (e.g., article_YYYYMMDD_HHMMSS.md).
     Ensures articles_dir is created if it doesn't exist.
+    The write is atomic and fsynced (see atomic_write_text); with group_commit the file is in place as
+    soon as this returns and the fsyncs are batched until the group commits.
     Returns the full path of the saved article.
     """
     os.makedirs(articles_dir, exist_ok=True)
@@ -22,8 +219,10 @@ def save_article(article_content: str, articles_dir: str, filename: str = None)
     
     article_path = os.path.join(articles_dir, filename)
     
-    with open(article_path, 'w') as f:
-        f.write(article_content)
+    if group_commit is not None:
+        group_commit.write_text(article_path, article_content)
+    else:
+        atomic_write_text(article_path, article_content)
         
     return article_path
 
@@ -52,6 +251,55 @@ def list_articles(articles_dir: str) -> list[str]:
             articles.append(item)
     return articles
 
+# Frontmatter larger than this is treated as missing its closing delimiter,
+# so a file without one is never read to the end just to look for it.
+MAX_FRONTMATTER_CHARS = 64 * 1024
+
+def read_frontmatter_head(article_path: str, max_chars: int = MAX_FRONTMATTER_CHARS) -> str | None:
+    """
+    Reads article_path line by line only until the closing '---' of the frontmatter block.
+    Returns the text read so far (everything up to and including the closing delimiter line),
+    or None if the file is not found. Memory and time depend on the header size, not the body size.
+    """
+    head = ""
+    try:
+        with open(article_path, 'r') as f:
+            for line in f:
+                head += line
+                opening = head.find('---')
+                if opening != -1 and head.find('---', opening + 3) != -1:
+                    break # Closing delimiter reached; the body is never read
+                if len(head) > max_chars:
+                    break
+    except FileNotFoundError:
+        return None
+    return head
+
+def validate_article_file(article_path: str) -> tuple[bool, dict | None, str | None]:
+    """
+    Validates the frontmatter of the article at article_path without reading its body.
+    Same return contract as validate_frontmatter. A file that cannot be read or decoded is reported
+    as invalid rather than raising, so one bad file does not abort a bulk run.
+    """
+    try:
+        head = read_frontmatter_head(article_path)
+    except (OSError, UnicodeDecodeError) as e:
+        return False, None, f"Could not read article file '{article_path}': {e}"
+    if head is None:
+        return False, None, f"Article file not found: '{article_path}'."
+    return validate_frontmatter(head)
+
+def extract_frontmatter_block(text: str) -> str | None:
+    """
+    Returns the stripped YAML text between the first two '---' delimiters, or None if they are missing.
+    Only the header is sliced out; splitting the whole text would copy the entire article body.
+    """
+    opening = text.find('---')
+    closing = text.find('---', opening + 3) if opening != -1 else -1
+    if closing == -1:
+        return None
+    return text[opening + 3:closing].strip()
+
 def validate_frontmatter(generated_text: str) -> tuple[bool, dict | None, str | None]:
     errors = []
     frontmatter_dict = None
@@ -61,15 +309,14 @@ def validate_frontmatter(generated_text: str) -> tuple[bool, dict | None, str |
         if not isinstance(generated_text, str):
             return False, None, "Invalid input: generated_text must be a string."
 
-        parts = generated_text.split('---', 2)
-        if len(parts) < 3: # Must have at least three parts: before, frontmatter, after
+        frontmatter_str = extract_frontmatter_block(generated_text)
+        if frontmatter_str is None: # Need both delimiters: ---YAML---MarkdownContent
             return False, None, "Frontmatter delimiters '---' not found or incomplete. Expected structure: ---YAML---MarkdownContent"
         
-        frontmatter_str = parts[1].strip()
         if not frontmatter_str: # Check if the captured frontmatter string is empty
             return False, None, "Frontmatter block is empty."
 
-        frontmatter_dict = yaml.safe_load(frontmatter_str)
+        frontmatter_dict = parse_yaml(frontmatter_str)
         
         # Check if parsing resulted in a dictionary
         if not isinstance(frontmatter_dict, dict):
@@ -134,3 +381,45 @@ def validate_frontmatter(generated_text: str) -> tuple[bool, dict | None, str |
     
     # If all checks pass, return the parsed dictionary
     return True, frontmatter_dict, None
+
+def consume_article_stream(chunks, out_file) -> tuple[bool, dict | None, str | None, str]:
+    """
+    Consumes an iterable of text chunks and validates the frontmatter as soon as its
+    closing '---' has arrived.
+    - If the frontmatter is invalid, stops reading immediately so the caller can close the stream.
+    - If it is valid, writes what has been buffered and then every remaining chunk straight to
+      out_file, so the article body is never held in memory.
+    Returns (is_valid, frontmatter_dict, error_message, head_text), where head_text is the text
+    buffered up to the point of validation (useful for saving a rejected header for inspection).
+    """
+    buffered = ""
+    for chunk in chunks:
+        buffered += chunk
+        opening = buffered.find('---')
+        if opening == -1 or buffered.find('---', opening + 3) == -1:
+            continue # Frontmatter block not closed yet
+
+        is_valid, frontmatter_dict, error_message = validate_frontmatter(buffered)
+        if not is_valid:
+            return False, None, error_message, buffered
+
+        out_file.write(buffered)
+        for chunk in chunks:
+            out_file.write(chunk)
+        return True, frontmatter_dict, None, buffered
+
+    # Stream ended before the frontmatter block was closed; report the usual delimiter error.
+    _, _, error_message = validate_frontmatter(buffered)
+    return False, None, error_message, buffered
+
+def validate_article_files(article_paths: list[str]) -> list[tuple[str, bool, str | None]]:
+    """
+    Validates a batch of article files by header only.
+    Returns (article_path, is_valid, error_message) for each path, in order.
+    Module-level so it can be shipped to worker processes by a ProcessPoolExecutor.
+    """
+    results = []
+    for article_path in article_paths:
+        is_valid, _, error_message = validate_article_file(article_path)
+        results.append((article_path, is_valid, error_message))
+    return results
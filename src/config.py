@@ -1,4 +1,6 @@
 import os
+import threading
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
 # Path to the root of the termux_article_cli package/app
@@ -9,86 +11,299 @@ APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 dotenv_path = os.path.join(APP_ROOT, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
-def _get_and_ensure_dir(env_var: str, default_relative_path: str) -> str:
+def _resolve_path(env_var: str, default_relative_path: str) -> str:
     """
-    Gets a directory path from an environment variable or uses a default.
+    Gets a path from an environment variable or uses a default.
     The path (from env or default) is treated as relative to APP_ROOT if not absolute.
-    Ensures the directory exists.
     """
-    path_from_env = os.getenv(env_var)
-    
-    if path_from_env: # If variable is set
-        path_to_check = path_from_env
-    else: # Variable not set, use default
-        path_to_check = default_relative_path
-
+    path_to_check = os.getenv(env_var) or default_relative_path
     # Resolve path: if not absolute, assume it's relative to APP_ROOT
-    if not os.path.isabs(path_to_check):
-        resolved_path = os.path.join(APP_ROOT, path_to_check)
-    else:
-        resolved_path = path_to_check
-    
-    # Ensure the directory exists
-    os.makedirs(resolved_path, exist_ok=True)
-    return resolved_path
+    return path_to_check if os.path.isabs(path_to_check) else os.path.join(APP_ROOT, path_to_check)
+
+def _get_int(env_var: str, default: int) -> int:
+    """Gets an integer from an environment variable, falling back to default if unset or not a number."""
+    value = os.getenv(env_var)
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+def _get_float(env_var: str, default: float) -> float:
+    """Gets a number from an environment variable, falling back to default if unset or not a number."""
+    value = os.getenv(env_var)
+    try:
+        return float(value) if value not in (None, "") else default
+    except ValueError:
+        return default
+
+def _parse_mirror_remotes(value: str, warnings: list[str]) -> tuple[tuple[str, str, str | None], ...]:
+    """Parses GIT_MIRROR_REMOTES (name=url[#branch] entries). Malformed entries are skipped and added to warnings."""
+    mirrors = []
+    for entry in value.replace(",", " ").split():
+        name, separator, target = entry.partition("=")
+        url, _, branch = target.partition("#")
+        if not separator or not name or not url:
+            warnings.append(f"Ignoring malformed GIT_MIRROR_REMOTES entry '{entry}' (expected name=url[#branch]).")
+            continue
+        mirrors.append((name, url, branch or None))
+    return tuple(mirrors)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Every configuration value, resolved once from .env and the environment by get_settings().
+    Resolving is side-effect free: directories are only created when a getter hands them out, and
+    each directory at most once per Settings instance. Call reload_settings() after changing the environment.
+    Problems found while resolving (e.g. malformed entries that were skipped) are kept in warnings for the CLI to report.
+    """
+    drafts_dir: str
+    final_articles_dir: str
+    failed_validation_dir: str
+    chat_history_file: str
+    catalog_db_path: str
+    response_cache_dir: str
+    response_cache_max_entries: int
+    response_cache_ttl_seconds: int
+    openai_api_key: str | None
+    huggingface_api_key: str | None
+    gemini_api_key: str | None
+    gemini_requests_per_minute: int
+    gemini_tokens_per_minute: int
+    gemini_max_retries: int
+    gemini_retry_base_delay_seconds: float
+    github_token: str | None
+    github_repo_url: str | None
+    git_default_branch: str
+    git_default_commit_message: str
+    git_backend: str
+    git_sparse_path: str | None
+    git_mirror_remotes: tuple[tuple[str, str, str | None], ...]
+    git_push_timeout_seconds: int
+    git_ssh_control_dir: str
+    git_ssh_control_persist: int
+    git_ssh_server_alive_interval: int
+    push_queue_dir: str
+    push_queue_flush_threshold: int
+    daemon_socket_path: str
+    warnings: tuple[str, ...] = ()
+    _created_dirs: set = field(default_factory=set, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        warnings = []
+        return cls(
+            drafts_dir=_resolve_path("DRAFTS_DIR", "data/drafts"),
+            final_articles_dir=_resolve_path("FINAL_ARTICLES_DIR", "data/final_articles"),
+            failed_validation_dir=_resolve_path("FAILED_VALIDATION_DIR", "data/failed_validation"),
+            chat_history_file=_resolve_path("CHAT_HISTORY_FILE", "data/chat_history.jsonl"),
+            catalog_db_path=_resolve_path("ARTICLE_CATALOG_DB", "data/catalog.sqlite3"),
+            response_cache_dir=_resolve_path("RESPONSE_CACHE_DIR", "data/response_cache"),
+            response_cache_max_entries=_get_int("RESPONSE_CACHE_MAX_ENTRIES", 500),
+            response_cache_ttl_seconds=_get_int("RESPONSE_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            huggingface_api_key=os.getenv("HF_API_KEY"),
+            gemini_api_key=os.getenv("GEMINI_API_KEY"),
+            gemini_requests_per_minute=_get_int("GEMINI_REQUESTS_PER_MINUTE", 0),
+            gemini_tokens_per_minute=_get_int("GEMINI_TOKENS_PER_MINUTE", 0),
+            gemini_max_retries=_get_int("GEMINI_MAX_RETRIES", 3),
+            gemini_retry_base_delay_seconds=_get_float("GEMINI_RETRY_BASE_DELAY_SECONDS", 2.0),
+            github_token=os.getenv("GITHUB_TOKEN"),
+            github_repo_url=os.getenv("GITHUB_REPO_URL"),
+            git_default_branch=os.getenv("GIT_DEFAULT_BRANCH", "main"),
+            git_default_commit_message=os.getenv("GIT_DEFAULT_COMMIT_MESSAGE", "feat: Add/update articles via CLI"),
+            git_backend=os.getenv("GIT_BACKEND", "subprocess").strip().lower() or "subprocess",
+            git_sparse_path=os.getenv("GIT_SPARSE_PATH") or None,
+            git_mirror_remotes=_parse_mirror_remotes(os.getenv("GIT_MIRROR_REMOTES", ""), warnings),
+            git_push_timeout_seconds=_get_int("GIT_PUSH_TIMEOUT_SECONDS", 300),
+            git_ssh_control_dir=_resolve_path("GIT_SSH_CONTROL_DIR", "data/ssh"),
+            git_ssh_control_persist=_get_int("GIT_SSH_CONTROL_PERSIST", 600),
+            git_ssh_server_alive_interval=_get_int("GIT_SSH_SERVER_ALIVE_INTERVAL", 30),
+            push_queue_dir=_resolve_path("PUSH_QUEUE_DIR", "data/push_queue"),
+            push_queue_flush_threshold=_get_int("PUSH_QUEUE_FLUSH_THRESHOLD", 10),
+            daemon_socket_path=_resolve_path("DAEMON_SOCKET", "data/daemon.sock"),
+            warnings=tuple(warnings),
+        )
+
+    def ensure_dir(self, path: str) -> str:
+        """Creates path (once per Settings instance) and returns it."""
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+        return path
+
+
+_settings = None
+_settings_lock = threading.Lock()
+
+def get_settings() -> Settings:
+    """Returns the process-wide Settings, resolving them on first use."""
+    global _settings
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings.from_env()
+            settings = _settings
+    return settings
+
+def reload_settings() -> Settings:
+    """
+    Resolves the settings again from the current environment (e.g. after patching os.environ in tests)
+    and forgets which directories were created. The .env file itself is only read at import.
+    """
+    global _settings
+    with _settings_lock:
+        _settings = Settings.from_env()
+        return _settings
 
 def get_drafts_dir() -> str:
     """Gets the path to the drafts directory, ensuring it exists."""
-    return _get_and_ensure_dir("DRAFTS_DIR", "data/drafts")
+    settings = get_settings()
+    return settings.ensure_dir(settings.drafts_dir)
 
 def get_final_articles_dir() -> str:
     """Gets the path to the final articles directory, ensuring it exists."""
-    return _get_and_ensure_dir("FINAL_ARTICLES_DIR", "data/final_articles")
+    settings = get_settings()
+    return settings.ensure_dir(settings.final_articles_dir)
 
 def get_failed_validation_dir() -> str:
     """Gets the path to the failed validation directory, ensuring it exists."""
-    return _get_and_ensure_dir("FAILED_VALIDATION_DIR", "data/failed_validation")
+    settings = get_settings()
+    return settings.ensure_dir(settings.failed_validation_dir)
 
 def get_chat_history_file_path() -> str: # Renamed from get_chat_history_file
     """
-    Gets the path to the chat history JSON file.
+    Gets the path to the chat history JSON Lines file.
+    A path ending in '.json' (the legacy format) is still accepted; the log is kept next to it as '.jsonl'.
+    The path (from env or default) is treated as relative to APP_ROOT if not absolute.
+    Ensures the directory for the file exists.
+    """
+    settings = get_settings()
+    settings.ensure_dir(os.path.dirname(settings.chat_history_file))
+    return settings.chat_history_file
+
+def get_catalog_db_path() -> str:
+    """
+    Gets the path to the SQLite article catalog used by 'review'.
     The path (from env or default) is treated as relative to APP_ROOT if not absolute.
     Ensures the directory for the file exists.
     """
-    path_from_env = os.getenv("CHAT_HISTORY_FILE")
-    default_relative_path = "data/chat_history.json" # Default relative to APP_ROOT
-
-    if path_from_env:
-        path_to_check = path_from_env
-    else:
-        path_to_check = default_relative_path
-        
-    if not os.path.isabs(path_to_check):
-        resolved_path = os.path.join(APP_ROOT, path_to_check)
-    else:
-        resolved_path = path_to_check
-        
-    # Ensure the directory for the file exists
-    os.makedirs(os.path.dirname(resolved_path), exist_ok=True)
-    return resolved_path
+    settings = get_settings()
+    settings.ensure_dir(os.path.dirname(settings.catalog_db_path))
+    return settings.catalog_db_path
+
+def get_response_cache_dir() -> str:
+    """Gets the path to the response cache directory, ensuring it exists."""
+    settings = get_settings()
+    return settings.ensure_dir(settings.response_cache_dir)
+
+def get_response_cache_max_entries() -> int:
+    """Maximum number of cached responses kept on disk before LRU eviction."""
+    return get_settings().response_cache_max_entries
+
+def get_response_cache_ttl_seconds() -> int:
+    """Age after which a cached response expires. 0 disables expiry."""
+    return get_settings().response_cache_ttl_seconds
 
 # --- Keeping other existing API key and URL getters ---
 
 def get_openai_api_key(): # Kept as per previous requirements
-    return os.getenv("OPENAI_API_KEY")
+    return get_settings().openai_api_key
 
 def get_huggingface_api_key(): # Kept as per previous requirements
-    return os.getenv("HF_API_KEY")
+    return get_settings().huggingface_api_key
 
 def get_gemini_api_key():
-    return os.getenv("GEMINI_API_KEY")
+    return get_settings().gemini_api_key
+
+def get_gemini_requests_per_minute() -> int:
+    """Gemini requests-per-minute quota enforced client-side. 0 (default) disables request limiting."""
+    return get_settings().gemini_requests_per_minute
+
+def get_gemini_tokens_per_minute() -> int:
+    """Gemini tokens-per-minute quota enforced client-side. 0 (default) disables token limiting."""
+    return get_settings().gemini_tokens_per_minute
+
+def get_gemini_max_retries() -> int:
+    """Retries of a Gemini call that failed with a transient (429/5xx) error. 0 disables retrying."""
+    return get_settings().gemini_max_retries
+
+def get_gemini_retry_base_delay_seconds() -> float:
+    """Backoff before the first retry; it doubles for each further retry (with jitter)."""
+    return get_settings().gemini_retry_base_delay_seconds
 
 def get_github_token(): # Kept as per previous requirements
-    return os.getenv("GITHUB_TOKEN")
+    return get_settings().github_token
 
 def get_github_repo_url():
-    return os.getenv("GITHUB_REPO_URL")
+    return get_settings().github_repo_url
 
 def get_git_default_branch() -> str:
-    return os.getenv("GIT_DEFAULT_BRANCH", "main")
+    return get_settings().git_default_branch
 
 def get_git_default_commit_message() -> str:
-    return os.getenv("GIT_DEFAULT_COMMIT_MESSAGE", "feat: Add/update articles via CLI")
+    return get_settings().git_default_commit_message
+
+def get_push_queue_dir() -> str:
+    """Gets the path to the push queue spool directory, ensuring it exists."""
+    settings = get_settings()
+    return settings.ensure_dir(settings.push_queue_dir)
+
+def get_push_queue_flush_threshold() -> int:
+    """Number of queued push intents at which 'push --queue' flushes automatically. 0 disables auto-flush."""
+    return get_settings().push_queue_flush_threshold
+
+def get_daemon_socket_path() -> str:
+    """
+    Gets the path of the Unix socket used by 'serve' and '--daemon', ensuring its directory exists.
+    Keep it short: Unix socket paths are limited to about 100 characters.
+    """
+    settings = get_settings()
+    settings.ensure_dir(os.path.dirname(settings.daemon_socket_path))
+    return settings.daemon_socket_path
+
+def get_git_ssh_control_dir() -> str:
+    """
+    Directory for the SSH ControlMaster sockets used to reuse one connection across pushes.
+    Resolved relative to APP_ROOT if not absolute; the handler creates it (mode 0700) when connection sharing is on.
+    """
+    return get_settings().git_ssh_control_dir
+
+def get_git_ssh_control_persist() -> int:
+    """Seconds an idle shared SSH connection stays open after the last push. 0 disables connection sharing."""
+    return get_settings().git_ssh_control_persist
+
+def get_git_ssh_server_alive_interval() -> int:
+    """Seconds between SSH keep-alive probes on the shared connection. 0 disables them."""
+    return get_settings().git_ssh_server_alive_interval
+
+def get_git_sparse_path() -> str | None:
+    """
+    Path of the posts directory inside the site repository (e.g. '_posts'). When set, FINAL_ARTICLES_DIR must end
+    with it, and its parent is created as a shallow, sparse checkout holding only this path. Unset means a full checkout.
+    """
+    return get_settings().git_sparse_path
+
+def get_git_mirror_remotes() -> list[tuple[str, str, str | None]]:
+    """
+    Extra remotes that 'push' updates concurrently with origin, from GIT_MIRROR_REMOTES: entries of the form
+    name=url or name=url#branch, separated by commas or whitespace. Without #branch, GIT_DEFAULT_BRANCH is used.
+    Returns [(name, url, branch or None)]. Malformed entries are skipped (see get_config_warnings).
+    """
+    return list(get_settings().git_mirror_remotes)
+
+def get_config_warnings() -> list[str]:
+    """Problems found in the configuration while resolving it, e.g. skipped malformed entries. Reported by the CLI."""
+    return list(get_settings().warnings)
+
+def get_git_push_timeout_seconds() -> int:
+    """Seconds after which a single push (to origin or a mirror) is abandoned. Defaults to 300; 0 means no limit."""
+    return get_settings().git_push_timeout_seconds
+
+def get_git_backend() -> str:
+    """Backend used by 'push' for add/status/commit: 'subprocess' (default) or 'dulwich' (in-process, optional)."""
+    return get_settings().git_backend
 
 # --- Removing or commenting out old get_articles_dir ---
 # def get_articles_dir():
@@ -0,0 +1,144 @@
+import json
+import os
+import socket
+import socketserver
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Local daemon for `serve`: accepts one JSON request per connection on a Unix socket and answers with JSON
+    lines. Requests are handled one at a time in the serving thread: a command runs with the process-wide stdout,
+    stderr and working directory switched to the client's, and the commands share the on-disk article directories.
+
+    Requests:
+        {"op": "run", "argv": [...], "cwd": "..."} -> {"output": str} per chunk printed while the command runs,
+                                                      then {"ok": true, "exit_code": int, "output": str}
+        {"op": "ping"}                             -> {"ok": true, "pid": int}
+        {"op": "stop"}                             -> {"ok": true}, then the server shuts down
+    dispatch(argv, cwd, write) -> (exit_code, remaining output) runs a command, passing its output to write as it
+    is printed; it is supplied by main, which owns the warm objects.
+    """
+    allow_reuse_address = False
+
+    def __init__(self, socket_path: str, dispatch):
+        self.socket_path = socket_path
+        self.dispatch = dispatch
+        self._stop_requested = False
+        _remove_stale_socket(socket_path)
+        previous_umask = os.umask(0o177) # Socket is created 0600: only this user may send commands
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def serve_until_stopped(self):
+        """Serves requests until a 'stop' request or KeyboardInterrupt, then removes the socket."""
+        try:
+            while not self._stop_requested:
+                self.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            self._reply({"ok": False, "error": "Request is not valid JSON."})
+            return
+        op = request.get("op")
+        if op == "ping":
+            self._reply({"ok": True, "pid": os.getpid()})
+        elif op == "stop":
+            self.server._stop_requested = True
+            self._reply({"ok": True})
+        elif op == "run" and isinstance(request.get("argv"), list):
+            try:
+                exit_code, output = self.server.dispatch(request["argv"], request.get("cwd"), self._stream_output)
+                self._reply({"ok": True, "exit_code": exit_code, "output": output})
+            except Exception as e:
+                self._reply({"ok": False, "error": f"{type(e).__name__}: {e}"})
+        else:
+            self._reply({"ok": False, "error": f"Unknown request: {op!r}"})
+
+    def _reply(self, response: dict):
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    def _stream_output(self, text: str):
+        """Sends output of the running command. A client that went away does not stop the command."""
+        try:
+            self._reply({"output": text})
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str):
+    """Removes a socket file left by a daemon that is no longer running. Raises RuntimeError if one is."""
+    if not os.path.exists(socket_path):
+        return
+    try:
+        send_request(socket_path, {"op": "ping"}, timeout=2)
+    except OSError:
+        os.remove(socket_path) # Nobody is listening
+        return
+    raise RuntimeError(f"A daemon is already listening on '{socket_path}'.")
+
+
+def send_request(socket_path: str, request: dict, timeout: float | None = None) -> dict:
+    """
+    Sends one request to the daemon and returns its response.
+    Raises OSError (e.g. FileNotFoundError, ConnectionRefusedError) if no daemon is listening.
+    """
+    lines = _request_lines(socket_path, request, timeout)
+    try:
+        return next(lines)
+    finally:
+        lines.close()
+
+
+def _request_lines(socket_path: str, request: dict, timeout: float | None = None):
+    """Sends one request to the daemon and yields each JSON line of its answer."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection without a response.")
+            while line:
+                yield json.loads(line)
+                line = reader.readline()
+
+
+def run_remote(socket_path: str, argv: list[str], cwd: str | None = None, on_output=None) -> tuple[int, str]:
+    """
+    Runs a CLI command (argv without the program name) in the daemon. Returns (exit_code, output).
+    With on_output, each piece of output is passed to it as soon as the daemon sends it.
+    """
+    chunks = []
+    for response in _request_lines(socket_path, {"op": "run", "argv": argv, "cwd": cwd or os.getcwd()}):
+        if "ok" not in response: # Output streamed while the command runs
+            chunks.append(response["output"])
+            if on_output is not None:
+                on_output(response["output"])
+            continue
+        if not response["ok"]:
+            raise RuntimeError(response.get("error", "Daemon request failed."))
+        if response["output"]:
+            chunks.append(response["output"])
+            if on_output is not None:
+                on_output(response["output"])
+        return response["exit_code"], "".join(chunks)
+    raise ConnectionError("Daemon closed the connection before the command finished.")
@@ -0,0 +1,71 @@
+import collections
+
+# (history record field, label) of every per-generation metric that `stats` summarizes
+METRICS = (
+    ("latency_s", "Latency (s)"),
+    ("ttfb_s", "Time to first byte (s)"),
+    ("prompt_tokens", "Prompt tokens"),
+    ("output_tokens", "Output tokens"),
+    ("rate_limit_wait_s", "Rate limit wait (s)"),
+)
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentile of already sorted values, interpolating linearly between the closest ranks."""
+    if not sorted_values:
+        raise ValueError("percentile() of an empty list")
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize_generations(records, model: str | None = None, last: int | None = None) -> dict:
+    """
+    Summarizes chat history records written by ArticleGenerator: counts of generations, errors, cache hits,
+    streamed runs and retries, plus count/mean/min/max/percentiles of every metric in METRICS.
+    Records from before metrics were recorded (no 'model' field) are counted as skipped.
+    With last, only the last N records of the history are considered; with model, only that model's.
+    """
+    if last is not None:
+        records = collections.deque(records, maxlen=max(0, last))
+    values = {field: [] for field, _ in METRICS}
+    summary = {"generations": 0, "errors": 0, "cached": 0, "streamed": 0, "retries": 0, "skipped": 0}
+    output_tokens, output_seconds = 0, 0.0
+
+    for record in records:
+        if "model" not in record:
+            summary["skipped"] += 1
+            continue
+        if model is not None and record["model"] != model:
+            continue
+        summary["generations"] += 1
+        if isinstance(record.get("ai"), str) and record["ai"].startswith("Error"):
+            summary["errors"] += 1
+        summary["cached"] += bool(record.get("cached"))
+        summary["streamed"] += bool(record.get("streamed"))
+        summary["retries"] += record.get("retries", 0)
+        for field, _ in METRICS:
+            if isinstance(record.get(field), (int, float)):
+                values[field].append(record[field])
+        if isinstance(record.get("output_tokens"), int) and record.get("latency_s"):
+            output_tokens += record["output_tokens"]
+            output_seconds += record["latency_s"]
+
+    metrics = {}
+    for field, _ in METRICS:
+        field_values = sorted(values[field])
+        if not field_values:
+            continue
+        metrics[field] = {
+            "count": len(field_values),
+            "mean": sum(field_values) / len(field_values),
+            "min": field_values[0],
+            "max": field_values[-1],
+            **{f"p{pct}": percentile(field_values, pct) for pct in PERCENTILES},
+        }
+    summary["metrics"] = metrics
+    # Output tokens per second of request latency: the per-request generation speed
+    summary["output_tokens_per_s"] = output_tokens / output_seconds if output_seconds else None
+    return summary
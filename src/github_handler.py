@@ -1,24 +1,694 @@
 import subprocess
 import os
+import hashlib
+import json
+import shlex
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import re # For checking remote URL
 import datetime # For example usage, can be removed if example is stripped
 
+class SubprocessGitBackend:
+    """
+    Runs every git operation as a `git` subprocess. This is the default backend and needs
+    nothing beyond git itself.
+    """
+    name = "subprocess"
+    ADD_CHUNK_SIZE = 500
+
+    def __init__(self, run_command, run_network_command=None):
+        self._run_command = run_command # callable(command_list) -> (success, stdout, stderr)
+        # Same contract, used for commands that talk to the remote (adds the handler's SSH settings)
+        self._run_network_command = run_network_command or run_command
+
+    def add(self, target: str) -> tuple[bool, str, str]:
+        return self._run_command(["git", "add", target])
+
+    def add_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        """Stages exactly these paths, including deletions (`git add -A -- <paths>`), in chunks to stay under argv limits."""
+        for start in range(0, len(paths), self.ADD_CHUNK_SIZE):
+            result = self._run_command(["git", "add", "-A", "--", *paths[start:start + self.ADD_CHUNK_SIZE]])
+            if not result[0]:
+                return result
+        return True, "", ""
+
+    def staged_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        """Lists which of paths differ between the index and HEAD, one per line."""
+        for start in range(0, len(paths), self.ADD_CHUNK_SIZE):
+            success, stdout, stderr = self._run_command(
+                ["git", "diff", "--cached", "--name-only", "--", *paths[start:start + self.ADD_CHUNK_SIZE]])
+            if not success or stdout:
+                return success, stdout, stderr
+        return True, "", ""
+
+    def tracked_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        """Lists which of paths are in the index (`git ls-files`), one per line, including ones deleted from disk."""
+        tracked = []
+        for start in range(0, len(paths), self.ADD_CHUNK_SIZE):
+            success, stdout, stderr = self._run_command(["git", "ls-files", "-z", "--", *paths[start:start + self.ADD_CHUNK_SIZE]])
+            if not success:
+                return success, stdout, stderr
+            tracked.extend(path for path in stdout.split("\0") if path)
+        return True, "\n".join(tracked), ""
+
+    def ignored_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        """Lists which of paths are untracked and excluded by .gitignore, one per line, from one `git check-ignore`."""
+        if not paths:
+            return True, "", ""
+        success, stdout, stderr = self._run_command(["git", "check-ignore", "--stdin", "-z"],
+                                                    input_text="\0".join(paths) + "\0")
+        if not success and not stdout and not stderr:
+            return True, "", "" # Exit status 1: none of the paths is ignored
+        return success, "\n".join(path for path in stdout.split("\0") if path), stderr
+
+    def status_porcelain(self) -> tuple[bool, str, str]:
+        return self._run_command(["git", "status", "--porcelain"])
+
+    def commit(self, message: str, paths: list[str] = None) -> tuple[bool, str, str]:
+        """
+        Commits the whole index, or with paths only those paths (`git commit -- <paths>`): anything else that
+        happens to be staged stays staged and out of the commit. Long path lists are passed on stdin.
+        """
+        if paths is None:
+            return self._run_command(["git", "commit", "-m", message])
+        if len(paths) <= self.ADD_CHUNK_SIZE:
+            return self._run_command(["git", "commit", "-m", message, "--", *paths])
+        return self._run_command(["git", "commit", "-m", message, "--pathspec-from-file=-", "--pathspec-file-nul"],
+                                 input_text="\0".join(paths))
+
+    def push(self, remote: str, refspec: str) -> tuple[bool, str, str]:
+        return self._run_network_command(["git", "push", remote, refspec])
+
+
+class DulwichGitBackend:
+    """
+    Updates the index, computes status and creates commits in-process with dulwich, reusing one
+    open repository instead of spawning git (and re-discovering the repo) for each step.
+    The network push still shells out to git so SSH keys and agents behave exactly as before.
+    dulwich is optional; it is imported only when this backend is selected.
+    """
+    name = "dulwich"
+
+    def __init__(self, run_command, local_dir: str, run_network_command=None):
+        from dulwich import porcelain # Raises ImportError if dulwich is not installed
+        self._porcelain = porcelain
+        self._run_command = run_command
+        self._run_network_command = run_network_command or run_command
+        self.local_dir = local_dir
+        self._repo = None
+
+    def _open_repo(self):
+        if self._repo is None:
+            from dulwich.repo import Repo
+            self._repo = Repo(self.local_dir)
+        return self._repo
+
+    def add(self, target: str) -> tuple[bool, str, str]:
+        try:
+            repo = self._open_repo()
+            if target == ".":
+                self._porcelain.add(repo)
+                # Like `git add .`, also stage deletions of tracked files.
+                deleted = [path.decode() for path in self._porcelain.status(repo).unstaged
+                           if not os.path.lexists(os.path.join(self.local_dir, path.decode()))]
+                if deleted:
+                    self._porcelain.rm(repo, paths=[os.path.join(self.local_dir, path) for path in deleted], cached=True)
+            else:
+                self._porcelain.add(repo, paths=[os.path.join(self.local_dir, target)])
+            return True, "", ""
+        except Exception as e:
+            return False, "", f"dulwich add failed for '{target}': {e}"
+
+    def add_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        try:
+            repo = self._open_repo()
+            existing = [path for path in paths if os.path.lexists(os.path.join(self.local_dir, path))]
+            deleted = [path for path in paths if path not in existing]
+            if existing:
+                self._porcelain.add(repo, paths=[os.path.join(self.local_dir, path) for path in existing])
+            if deleted:
+                self._porcelain.rm(repo, paths=[os.path.join(self.local_dir, path) for path in deleted], cached=True)
+            return True, "", ""
+        except Exception as e:
+            return False, "", f"dulwich add failed: {e}"
+
+    def staged_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        try:
+            changes = self._porcelain.get_tree_changes(self._open_repo())
+        except Exception as e:
+            return False, "", f"dulwich status failed: {e}"
+        wanted = set(paths)
+        staged = sorted({path.decode() if isinstance(path, bytes) else path
+                         for kind in ("add", "modify", "delete") for path in changes[kind]} & wanted)
+        return True, "\n".join(staged), ""
+
+    def tracked_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        try:
+            index = self._open_repo().open_index()
+        except Exception as e:
+            return False, "", f"dulwich index read failed: {e}"
+        return True, "\n".join(path for path in paths if path.encode("utf-8") in index), ""
+
+    def ignored_paths(self, paths: list[str]) -> tuple[bool, str, str]:
+        if not paths:
+            return True, "", ""
+        try:
+            ignored = self._porcelain.check_ignore(self._open_repo(), [os.path.join(self.local_dir, path) for path in paths],
+                                                   quote_path=False)
+            return True, "\n".join(path.replace(os.sep, "/") for path in ignored), ""
+        except Exception as e:
+            return False, "", f"dulwich check-ignore failed: {e}"
+
+    def status_porcelain(self) -> tuple[bool, str, str]:
+        """Returns status in the same short format as `git status --porcelain`."""
+        try:
+            status = self._porcelain.status(self._open_repo())
+        except Exception as e:
+            return False, "", f"dulwich status failed: {e}"
+        lines = []
+        for kind, code in (("add", "A"), ("modify", "M"), ("delete", "D")):
+            lines.extend(f"{code}  {path.decode()}" for path in status.staged[kind])
+        lines.extend(f" M {path.decode()}" for path in status.unstaged)
+        lines.extend(f"?? {path}" for path in status.untracked)
+        return True, "\n".join(lines), ""
+
+    def commit(self, message: str, paths: list[str] = None) -> tuple[bool, str, str]:
+        try:
+            repo = self._open_repo()
+            if paths is None:
+                commit_id = self._porcelain.commit(repo, message=message)
+            else:
+                tree_id = self._tree_with_paths(repo, paths)
+                do_commit = repo.get_worktree().commit if hasattr(repo, "get_worktree") else repo.do_commit
+                commit_id = do_commit(message=message.encode("utf-8"), tree=tree_id)
+        except Exception as e:
+            return False, "", f"dulwich commit failed: {e}"
+        return True, commit_id.decode(), ""
+
+    @staticmethod
+    def _tree_with_paths(repo, paths: list[str]) -> bytes:
+        """HEAD's tree with only paths taken from the index (dropped if not in it), as `git commit -- <paths>` builds."""
+        from dulwich.index import commit_tree
+        from dulwich.object_store import iter_tree_contents
+        try:
+            head_tree = repo[repo.head()].tree
+        except KeyError: # Unborn branch
+            head_tree = None
+        entries = {}
+        if head_tree is not None:
+            entries = {entry.path: (entry.sha, entry.mode) for entry in iter_tree_contents(repo.object_store, head_tree)}
+        index = repo.open_index()
+        for path in paths:
+            key = path.encode("utf-8")
+            if key in index:
+                entries[key] = (index[key].sha, index[key].mode)
+            else:
+                entries.pop(key, None)
+        return commit_tree(repo.object_store, [(path, sha, mode) for path, (sha, mode) in entries.items()])
+
+    def push(self, remote: str, refspec: str) -> tuple[bool, str, str]:
+        return self._run_network_command(["git", "push", remote, refspec])
+
+
+GIT_BACKENDS = ("subprocess", "dulwich")
+# sun_path size on Linux (Android/Termux included); socket paths must be shorter, including the terminating NUL
+UNIX_SOCKET_PATH_MAX = 108
+
+
+def git_blob_sha1(path: str) -> str | None:
+    """
+    Computes the object id git would give the file's contents as a blob (SHA-1 of "blob <size>\\0" + data),
+    without running git. Returns None if the file cannot be read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class PushManifest:
+    """
+    Record of the articles as of the last successful push: relative path -> (mtime_ns, size, blob id).
+    Stored as JSON inside .git so it never shows up as a change itself.
+
+    changed_paths() stats the files and only hashes those whose mtime or size differ from the
+    manifest, so finding what changed does not depend on git walking the whole working tree.
+    Files excluded by .gitignore are never recorded: ignore_filter(paths) returns the set of
+    paths git ignores (raising OSError if it cannot tell), and those are left out before hashing.
+    """
+    # Files modified this close to the time they are recorded get a zero mtime, so the next
+    # comparison re-hashes them instead of trusting a timestamp that a later write could repeat.
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, path: str, repo_dir: str, ignore_filter=None):
+        self.path = path
+        self.repo_dir = repo_dir
+        self.ignore_filter = ignore_filter
+        self.entries = None # None until load() finds a manifest
+
+    def _ignored(self, paths: list[str]) -> set[str]:
+        return self.ignore_filter(paths) if self.ignore_filter is not None and paths else set()
+
+    def load(self) -> bool:
+        """Loads the manifest. Returns False if there is none (or it is unreadable)."""
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = {path: tuple(entry) for path, entry in json.load(f).items()}
+            return True
+        except (OSError, ValueError, TypeError):
+            self.entries = None
+            return False
+
+    def save(self):
+        """Writes the manifest atomically. Failure only means the next push does a full scan."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(self.entries or {}, separators=(",", ":"))) # One write; json.dump streams many small ones
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def scan(self) -> dict[str, os.stat_result]:
+        """Returns relative path ('/'-separated) -> stat for every file under repo_dir except .git."""
+        files = {}
+        pending = [""]
+        while pending:
+            relative_dir = pending.pop()
+            with os.scandir(os.path.join(self.repo_dir, relative_dir)) as it:
+                for entry in it:
+                    relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if relative_path != ".git":
+                            pending.append(relative_path)
+                    else:
+                        files[relative_path] = entry.stat(follow_symlinks=False)
+        return files
+
+    def make_entry(self, stat: os.stat_result, blob_id: str) -> tuple:
+        mtime_ns = stat.st_mtime_ns
+        if time.time_ns() - mtime_ns < self.RACY_WINDOW_NS:
+            mtime_ns = 0
+        return mtime_ns, stat.st_size, blob_id
+
+    def changed_paths(self) -> tuple[list[str], dict]:
+        """
+        Compares the working tree with the manifest. Returns (changed paths, pending entries), where
+        changed paths include new, modified and deleted files, and pending entries are the manifest
+        entries to record once those changes are pushed (None for deletions).
+        """
+        entries = self.entries or {}
+        changed, pending = [], {}
+        files = self.scan()
+        candidates = [relative_path for relative_path, stat in files.items()
+                      if entries.get(relative_path, ())[:2] != (stat.st_mtime_ns, stat.st_size)]
+        candidates += [relative_path for relative_path in entries if relative_path not in files]
+        ignored = self._ignored(candidates)
+        for relative_path in ignored:
+            files.pop(relative_path, None)
+            entries.pop(relative_path, None) # Recorded before ignored files were filtered out
+        for relative_path in candidates:
+            if relative_path in ignored or relative_path not in files:
+                continue
+            stat = files[relative_path]
+            previous = entries.get(relative_path)
+            blob_id = git_blob_sha1(os.path.join(self.repo_dir, relative_path))
+            if blob_id is None:
+                continue # Removed between scan and hash
+            if previous and previous[2] == blob_id:
+                entries[relative_path] = self.make_entry(stat, blob_id) # Touched but identical
+                continue
+            changed.append(relative_path)
+            pending[relative_path] = self.make_entry(stat, blob_id)
+        for relative_path in entries:
+            if relative_path not in files:
+                changed.append(relative_path)
+                pending[relative_path] = None
+        return sorted(changed), pending
+
+    def matches(self, relative_path: str) -> bool:
+        """True if the file's current contents are what the manifest recorded for it (it was pushed unchanged)."""
+        previous = (self.entries or {}).get(relative_path)
+        if previous is None:
+            return False
+        file_path = os.path.join(self.repo_dir, relative_path)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        if previous[:2] == (stat.st_mtime_ns, stat.st_size):
+            return True
+        return previous[2] == git_blob_sha1(file_path)
+
+    def apply(self, pending: dict):
+        entries = self.entries if self.entries is not None else {}
+        for relative_path, entry in pending.items():
+            if entry is None:
+                entries.pop(relative_path, None)
+            else:
+                entries[relative_path] = entry
+        self.entries = entries
+
+    def rebuild(self):
+        """Records every file currently in the working tree (after a full push)."""
+        entries = {}
+        files = self.scan()
+        ignored = self._ignored(list(files))
+        for relative_path, stat in files.items():
+            if relative_path in ignored:
+                continue
+            blob_id = git_blob_sha1(os.path.join(self.repo_dir, relative_path))
+            if blob_id is not None:
+                entries[relative_path] = self.make_entry(stat, blob_id)
+        self.entries = entries
+
+
+class GitCatFileSession:
+    """
+    A long-lived `git cat-file --batch-check` process. Object lookups (e.g. 'HEAD:article.md' or
+    ':article.md' for the index) are written to its stdin and answered on stdout, so any number of
+    queries during one CLI run cost a single git process instead of one fork each.
+    The process is started on the first query; call close() when done.
+    """
+    def __init__(self, repo_dir: str):
+        self.repo_dir = repo_dir
+        self._process = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch-check"],
+                cwd=self.repo_dir, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        return self._process
+
+    def object_info(self, object_spec: str) -> tuple[str, str, int] | None:
+        """
+        Returns (object_id, object_type, size) for object_spec, or None if it does not exist.
+        Raises OSError if the git process cannot be started or dies.
+        """
+        if "\n" in object_spec:
+            raise ValueError("Object names cannot contain newlines.")
+        with self._lock:
+            process = self._start()
+            try:
+                process.stdin.write(object_spec.encode("utf-8") + b"\n")
+                process.stdin.flush()
+                line = process.stdout.readline().decode("utf-8").strip()
+            except (BrokenPipeError, ValueError) as e:
+                self._process = None
+                raise OSError(f"git cat-file session ended unexpectedly: {e}") from e
+        if not line:
+            self._process = None
+            raise OSError("git cat-file session ended unexpectedly.")
+        fields = line.split()
+        if len(fields) != 3 or fields[-1] in ("missing", "ambiguous"):
+            return None
+        return fields[0], fields[1], int(fields[2])
+
+    def close(self):
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+        finally:
+            process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class GitHubHandler:
-    def __init__(self, repo_url: str, local_dir: str, default_branch: str, default_commit_message: str):
+    # Written inside .git/ once the remote is known to be correct, so later runs can skip `git remote -v`.
+    STATE_STAMP_NAME = "termux_article_cli_state.json"
+    # Manifest of what the last successful push contained, used to find changed articles without `git status`.
+    MANIFEST_NAME = "termux_article_cli_manifest.json"
+    # Remotes (origin or mirrors) whose last push failed; retried even when a later run has nothing new to commit.
+    PUSH_BEHIND_NAME = "termux_article_cli_push_behind.json"
+
+    def __init__(self, repo_url: str, local_dir: str, default_branch: str, default_commit_message: str,
+                 backend: str = "subprocess", ssh_control_dir: str = None, ssh_control_persist: int = 600,
+                 ssh_server_alive_interval: int = 30, sparse_path: str = None,
+                 mirrors: list[tuple[str, str, str | None]] = None, push_timeout: int = None):
         self.repo_url = repo_url
         self.local_dir = local_dir # This should be an absolute path
+        # With sparse_path (e.g. '_posts'), local_dir is that path inside a shallow, sparse checkout whose
+        # root is local_dir minus sparse_path. Only sparse_path is checked out and only the tip commit fetched.
+        self.sparse_path, self.repo_root = self._resolve_sparse_layout(local_dir, sparse_path)
+        self.git_dir = os.path.join(self.repo_root, ".git")
         self.default_branch = default_branch
         self.default_commit_message = default_commit_message
+        # With ssh_control_dir set, network commands share one persistent SSH connection (OpenSSH ControlMaster)
+        self.ssh_env = self._ssh_connection_env(ssh_control_dir, ssh_control_persist, ssh_server_alive_interval)
+        # Extra (remote name, url, branch or None for default_branch) targets pushed alongside origin, concurrently
+        self.mirrors = [(name, url, branch or default_branch) for name, url, branch in (mirrors or [])]
+        for name, _, _ in self.mirrors:
+            if name == "origin" or not re.fullmatch(r"[A-Za-z0-9._-]+", name):
+                raise ValueError(f"Invalid mirror remote name '{name}'.")
+        self.push_timeout = push_timeout if push_timeout and push_timeout > 0 else None # Per network command
+        self.last_push_results = [] # [(remote, branch, success, output)] from the most recent push
         # Ensure local_dir exists before trying to initialize a repo in it
         os.makedirs(self.local_dir, exist_ok=True)
+        self.repo_state_cached = False # True when _init_repo trusted the state stamp instead of running git
         self._init_repo()
+        self.backend = self._make_backend(backend)
+        self._cat_file = None # GitCatFileSession, started on the first object query
+        self._cat_file_index_stamp = None # Stat of .git/index when the session was started
+        self.manifest = PushManifest(os.path.join(self.git_dir, self.MANIFEST_NAME), self.local_dir,
+                                     ignore_filter=self._ignored_paths)
+
+    def _ignored_paths(self, paths: list[str]) -> set[str]:
+        """The subset of paths (relative to local_dir) that git ignores. Raises OSError if git cannot tell."""
+        success, stdout, stderr = self.backend.ignored_paths(paths)
+        if not success:
+            raise OSError(f"Could not check .gitignore rules: {stderr}")
+        return set(stdout.splitlines())
 
-    def _run_command(self, command: list[str], cwd: str = None) -> tuple[bool, str, str]:
+    @staticmethod
+    def _resolve_sparse_layout(local_dir: str, sparse_path: str | None) -> tuple[str | None, str]:
+        """Returns (normalized sparse path with '/' separators or None, repository root directory)."""
+        if not sparse_path:
+            return None, local_dir
+        normalized = os.path.normpath(sparse_path.strip("/\\"))
+        if normalized in (".", "") or normalized.startswith("..") or os.path.isabs(normalized):
+            raise ValueError(f"Invalid sparse path '{sparse_path}'. It must be a relative path inside the repository.")
+        local_dir_normalized = os.path.normpath(local_dir)
+        if not local_dir_normalized.endswith(os.sep + normalized):
+            raise ValueError(f"Final articles directory '{local_dir}' must end with the sparse path '{normalized}'; "
+                             f"the repository is checked out in the directory above it.")
+        repo_root = local_dir_normalized[:-len(os.sep + normalized)] or os.sep
+        return normalized.replace(os.sep, "/"), repo_root
+
+    def _repo_path(self, article_filename: str) -> str:
+        """Path of an article relative to the repository root, as git object names expect."""
+        relative_path = article_filename.replace(os.sep, "/")
+        return f"{self.sparse_path}/{relative_path}" if self.sparse_path else relative_path
+
+    def _index_stamp(self) -> tuple | None:
+        try:
+            stat = os.stat(os.path.join(self.git_dir, "index"))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def cat_file_session(self) -> GitCatFileSession:
+        """
+        The handler's long-lived `git cat-file --batch-check` session, shared by all queries in this run.
+        cat-file reads the index once, so ':<path>' lookups would go stale after a later add or commit (ours,
+        or anyone's while the daemon keeps this handler warm); the session is restarted when the index changes.
+        """
+        index_stamp = self._index_stamp()
+        if self._cat_file is not None and index_stamp != self._cat_file_index_stamp:
+            self._cat_file.close()
+            self._cat_file = None
+        if self._cat_file is None:
+            self._cat_file = GitCatFileSession(self.repo_root)
+            self._cat_file_index_stamp = index_stamp
+        return self._cat_file
+
+    def close(self):
+        """Stops the helper git process, if one was started."""
+        if self._cat_file is not None:
+            self._cat_file.close()
+            self._cat_file = None
+
+    def is_article_unchanged(self, article_filename: str) -> bool | None:
+        """
+        True if the article's contents match both the last commit (HEAD) and the index, i.e. `git add`
+        would stage nothing for it. False if it is new or modified. None if that cannot be determined.
+        The working file is hashed in-process; HEAD and the index are looked up through the cat-file session.
+        """
+        blob_id = git_blob_sha1(os.path.join(self.local_dir, article_filename))
+        if blob_id is None:
+            return None
+        repo_path = self._repo_path(article_filename)
+        try:
+            session = self.cat_file_session()
+            committed = session.object_info(f"HEAD:{repo_path}")
+            staged = session.object_info(f":{repo_path}")
+        except (OSError, ValueError):
+            return None
+        return committed is not None and staged is not None and committed[0] == staged[0] == blob_id
+
+    @staticmethod
+    def _ssh_connection_env(control_dir: str | None, control_persist: int, server_alive_interval: int) -> dict | None:
+        """
+        Builds the environment for network git commands: GIT_SSH_COMMAND extended with ControlMaster options so
+        the first push opens a master connection and later pushes (in this run or the next ControlPersist
+        seconds) reuse it without a new SSH handshake. Options already in the user's GIT_SSH_COMMAND take
+        precedence, since ssh uses the first value it sees. Returns None when connection sharing is off.
+        """
+        if not control_dir or not control_persist or control_persist <= 0:
+            return None
+        # %C is a 40-character hash of the local user, host, port and remote user, so the socket path has a fixed
+        # length however long those are. ssh briefly binds '<path>.<16 random chars>' while starting the master.
+        control_path = os.path.join(control_dir, "cm-%C")
+        if len(os.path.abspath(control_dir)) + len("/cm-") + 40 + 17 >= UNIX_SOCKET_PATH_MAX:
+            print(f"WARNING: SSH control directory '{control_dir}' is too long for a Unix socket path. "
+                  f"Set GIT_SSH_CONTROL_DIR to a shorter directory to reuse SSH connections.")
+            return None
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+        options = [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={control_path}",
+            "-o", f"ControlPersist={int(control_persist)}",
+        ]
+        if server_alive_interval and server_alive_interval > 0:
+            options += ["-o", f"ServerAliveInterval={int(server_alive_interval)}", "-o", "ServerAliveCountMax=3"]
+        base_command = os.environ.get("GIT_SSH_COMMAND")
+        if not base_command:
+            base_command = shlex.quote(os.environ["GIT_SSH"]) if os.environ.get("GIT_SSH") else "ssh"
+        env = dict(os.environ)
+        env["GIT_SSH_COMMAND"] = " ".join([base_command, *(shlex.quote(option) for option in options)])
+        return env
+
+    def _run_network_command(self, command: list[str]) -> tuple[bool, str, str]:
+        """Runs a git command that contacts the remote, with the shared-connection SSH settings if enabled."""
+        return self._run_command(command, env=self.ssh_env, timeout=self.push_timeout)
+
+    def _push_targets(self) -> list[tuple[str, str]]:
+        """(remote, branch) for origin and every mirror."""
+        return [("origin", self.default_branch)] + [(name, branch) for name, _, branch in self.mirrors]
+
+    def _push_head(self, targets: list[tuple[str, str]] = None) -> tuple[bool, str, str]:
+        """
+        Pushes HEAD to origin/default_branch and to every mirror (or only to targets). With several targets,
+        each push runs as its own git process in a thread pool, so a slow mirror does not hold up the others;
+        per-remote outcomes are kept in last_push_results, and remotes whose push failed are recorded so a
+        later run retries them. Returns (all succeeded, per-remote output, per-remote errors).
+        """
+        if targets is None:
+            targets = self._push_targets()
+            if len(targets) > 1:
+                print(f"Also pushing to mirror(s): {', '.join(f'{name} ({branch})' for name, branch in targets[1:])}...")
+        if len(targets) == 1:
+            name, branch = targets[0]
+            success, stdout, stderr = self.backend.push(name, f"HEAD:{branch}")
+            self.last_push_results = [(name, branch, success, stdout if success else stderr)]
+            self._record_push_outcomes()
+            return success, stdout, stderr
+
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [executor.submit(self.backend.push, name, f"HEAD:{branch}") for name, branch in targets]
+            outcomes = [future.result() for future in futures]
+
+        self.last_push_results = [
+            (name, branch, success, stdout if success else stderr)
+            for (name, branch), (success, stdout, stderr) in zip(targets, outcomes)
+        ]
+        self._record_push_outcomes()
+        succeeded = [f"{name} ({branch}): OK" for name, branch, success, _ in self.last_push_results if success]
+        failed = [f"{name} ({branch}): {output}" for name, branch, success, output in self.last_push_results if not success]
+        return not failed, "\n".join(succeeded), "\n".join(failed)
+
+    def _push_behind_path(self) -> str:
+        return os.path.join(self.git_dir, self.PUSH_BEHIND_NAME)
+
+    def _load_push_behind(self) -> set[tuple[str, str]]:
+        """(remote, branch) targets whose last push failed."""
+        try:
+            with open(self._push_behind_path()) as f:
+                return {(name, branch) for name, branch in json.load(f)}
+        except (OSError, ValueError, TypeError):
+            return set()
+
+    def _record_push_outcomes(self):
+        """Updates the recorded set of remotes left behind from last_push_results."""
+        behind = self._load_push_behind()
+        updated = set(behind)
+        for name, branch, success, _ in self.last_push_results:
+            if success:
+                updated.discard((name, branch))
+            else:
+                updated.add((name, branch))
+        if updated == behind:
+            return
+        path = self._push_behind_path()
+        try:
+            if updated:
+                with open(f"{path}.tmp", 'w') as f:
+                    json.dump(sorted(updated), f)
+                os.replace(f"{path}.tmp", path)
+            else:
+                os.remove(path)
+        except OSError as e:
+            print(f"WARNING: Could not record which remotes still need a push: {e}")
+
+    def _nothing_to_commit(self, message: str) -> tuple[bool, str]:
+        """
+        Result for a run with nothing new to commit. Remotes whose last push failed (e.g. a mirror that was
+        down) are still behind HEAD, so they are pushed again first.
+        """
+        behind = self._load_push_behind()
+        behind = [target for target in self._push_targets() if target in behind]
+        if not behind:
+            return True, message
+        print(f"Retrying the push to remote(s) that missed the last one: {', '.join(f'{name} ({branch})' for name, branch in behind)}...")
+        success, stdout, _ = self._push_head(behind)
+        if not success:
+            failed = [f"{name} ({branch}): {output}" for name, branch, ok, output in self.last_push_results if not ok]
+            return False, f"{message} Retrying the push to remote(s) that missed the last one failed:\n" + "\n".join(failed)
+        return True, f"{message} Pushed HEAD to remote(s) that missed the last push.\n{stdout}"
+
+    def _make_backend(self, name: str):
+        """Creates the git backend for add/status/commit/push. Falls back to subprocess if dulwich is missing."""
+        if name not in GIT_BACKENDS:
+            raise ValueError(f"Unknown git backend '{name}'. Choose from {', '.join(GIT_BACKENDS)}.")
+        if name == "dulwich" and self.sparse_path:
+            # dulwich does not honour skip-worktree entries, so it would see every path outside the sparse set as deleted.
+            print("WARNING: Git backend 'dulwich' does not support sparse checkouts. Using the git subprocess backend.")
+        elif name == "dulwich":
+            try:
+                return DulwichGitBackend(self._run_command, self.local_dir, self._run_network_command)
+            except ImportError:
+                print("WARNING: Git backend 'dulwich' requested but dulwich is not installed. Using the git subprocess backend.")
+        return SubprocessGitBackend(self._run_command, self._run_network_command)
+
+    def _run_command(self, command: list[str], cwd: str = None, env: dict = None, timeout: int = None,
+                     input_text: str = None) -> tuple[bool, str, str]:
         """
         Runs a shell command using subprocess.
         Returns a tuple: (success_status, stdout, stderr).
         """
         effective_cwd = cwd if cwd is not None else self.local_dir
+        extra_kwargs = {"env": env} if env is not None else {}
+        if timeout is not None:
+            extra_kwargs["timeout"] = timeout
+        if input_text is not None:
+            extra_kwargs["input"] = input_text
         
         try:
             process = subprocess.run(
@@ -26,7 +696,8 @@ class GitHubHandler:
                 cwd=effective_cwd,
                 text=True,
                 capture_output=True,
-                check=False 
+                check=False,
+                **extra_kwargs
             )
             success = process.returncode == 0
             # Basic logging for failed commands
@@ -38,27 +709,79 @@ class GitHubHandler:
             return success, process.stdout.strip(), process.stderr.strip()
         except FileNotFoundError as e:
             return False, "", f"Command not found: {command[0]}. Ensure git is installed and in PATH. Error: {e}"
+        except subprocess.TimeoutExpired:
+            return False, "", f"Command timed out after {timeout} seconds: {' '.join(command)}"
         except Exception as e:
             return False, "", f"An unexpected error occurred while running command: {' '.join(command)}. Error: {e}"
 
+    def _state_fingerprint(self) -> dict | None:
+        """
+        Fingerprint of the repo state that _init_repo verifies: the configured remote URL and a hash
+        of .git/config (where remotes live). Returns None if .git/config cannot be read.
+        The .git directory mtime is deliberately not part of it, since every commit changes it.
+        """
+        config_path = os.path.join(self.git_dir, "config")
+        try:
+            with open(config_path, 'rb') as f:
+                config_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        fingerprint = {"repo_url": self.repo_url, "config_sha256": config_hash}
+        if self.mirrors:
+            fingerprint["mirrors"] = [[name, url] for name, url, _ in self.mirrors]
+        return fingerprint
+
+    def _stamp_path(self) -> str:
+        return os.path.join(self.git_dir, self.STATE_STAMP_NAME)
+
+    def _state_is_known_good(self) -> bool:
+        fingerprint = self._state_fingerprint()
+        if fingerprint is None:
+            return False
+        try:
+            with open(self._stamp_path(), 'r') as f:
+                return json.load(f) == fingerprint
+        except (OSError, ValueError):
+            return False
+
+    def _write_state_stamp(self):
+        """Records the current fingerprint. Failure only means the next run re-checks the remote."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint is None:
+            return
+        try:
+            with open(self._stamp_path(), 'w') as f:
+                json.dump(fingerprint, f)
+        except OSError:
+            pass
+
     def _init_repo(self):
         """
         Initializes the local directory as a git repository and configures the remote.
+        If the state stamp matches the current remote URL and .git/config, no git commands are run.
         """
-        git_dir_path = os.path.join(self.local_dir, ".git")
+        git_dir_path = self.git_dir
         
         if not (os.path.exists(git_dir_path) and os.path.isdir(git_dir_path)):
-            print(f"'{self.local_dir}' is not a git repository. Initializing...")
-            success, stdout, stderr = self._run_command(["git", "init"])
+            if self.sparse_path and self.repo_url:
+                self._init_sparse_checkout()
+                return
+            print(f"'{self.repo_root}' is not a git repository. Initializing...")
+            success, stdout, stderr = self._run_command(["git", "init"], cwd=self.repo_root)
             if not success:
-                print(f"Failed to initialize git repository in '{self.local_dir}': {stderr}")
+                print(f"Failed to initialize git repository in '{self.repo_root}': {stderr}")
                 return 
+        elif self.repo_url and self._state_is_known_good():
+            self.repo_state_cached = True
+            return
 
-        success, remotes_out, stderr = self._run_command(["git", "remote", "-v"])
+        success, remotes_out, stderr = self._run_command(["git", "remote", "-v"], cwd=self.repo_root)
         if not success:
-            print(f"Failed to get remotes for '{self.local_dir}': {stderr}")
+            print(f"Failed to get remotes for '{self.repo_root}': {stderr}")
             return
 
+        mirrors_ready = self._configure_mirror_remotes(remotes_out)
+
         origin_present = False
         correct_url_for_origin = False
         if self.repo_url: # Only proceed if repo_url is actually provided
@@ -75,69 +798,133 @@ class GitHubHandler:
             if not correct_url_for_origin and self.repo_url:
                 print(f"Remote 'origin' exists but with incorrect URL. Updating to '{self.repo_url}'...")
                 # Attempt to remove then add, or set-url. Set-url is cleaner.
-                success_set_url, _, stderr_set_url = self._run_command(["git", "remote", "set-url", "origin", self.repo_url])
+                success_set_url, _, stderr_set_url = self._run_command(["git", "remote", "set-url", "origin", self.repo_url], cwd=self.repo_root)
                 if not success_set_url:
                     print(f"Failed to set remote URL for 'origin' to '{self.repo_url}': {stderr_set_url}")
+                elif mirrors_ready:
+                    self._write_state_stamp()
             elif self.repo_url:
                  print(f"Remote 'origin' with correct URL ('{self.repo_url}') already configured.")
+                 if mirrors_ready:
+                     self._write_state_stamp()
             # else: repo_url is empty, do nothing about remote
         elif self.repo_url: # Origin not present and repo_url is specified
             print(f"Remote 'origin' not found. Adding remote 'origin' with URL '{self.repo_url}'...")
-            success_add, _, stderr_add = self._run_command(["git", "remote", "add", "origin", self.repo_url])
+            success_add, _, stderr_add = self._run_command(["git", "remote", "add", "origin", self.repo_url], cwd=self.repo_root)
             if not success_add:
                 print(f"Failed to add remote 'origin' with URL '{self.repo_url}': {stderr_add}")
+            elif mirrors_ready:
+                self._write_state_stamp()
         # If repo_url is not set, no remote operations are performed.
+
+    def _configure_mirror_remotes(self, remotes_out: str) -> bool:
+        """Adds each mirror remote, or corrects its URL, given `git remote -v` output. Returns True if all are set up."""
+        configured = {}
+        for line in remotes_out.splitlines():
+            parts = line.split()
+            if len(parts) >= 2:
+                configured[parts[0]] = parts[1]
+        all_ready = True
+        for name, url, _ in self.mirrors:
+            if configured.get(name) == url:
+                continue
+            action = "set-url" if name in configured else "add"
+            print(f"{'Updating' if action == 'set-url' else 'Adding'} mirror remote '{name}' with URL '{url}'...")
+            success, _, stderr = self._run_command(["git", "remote", action, name, url], cwd=self.repo_root)
+            if not success:
+                print(f"Failed to configure mirror remote '{name}': {stderr}")
+                all_ready = False
+        return all_ready
+
+    def _init_sparse_checkout(self):
+        """
+        Creates a shallow, sparse checkout of default_branch that contains only sparse_path:
+        only the tip commit is fetched (--depth=1), blobs outside the sparse set are never downloaded
+        (--filter=blob:none, fetched on demand for checked-out paths) and the index is kept sparse.
+        If the remote branch does not exist yet, the repository is left on an unborn branch; the first push creates it.
+        Any other failure (remote unreachable, authentication, fetch) removes the partial repository and raises
+        RuntimeError, so the next run starts over instead of pushing from a branch without the remote's history.
+        """
+        print(f"'{self.repo_root}' is not a git repository. Creating a shallow sparse checkout of '{self.sparse_path}' "
+              f"from '{self.repo_url}' (branch '{self.default_branch}')...")
+        try:
+            self._create_sparse_checkout()
+        except RuntimeError:
+            shutil.rmtree(self.git_dir, ignore_errors=True)
+            raise
+        os.makedirs(self.local_dir, exist_ok=True) # The sparse path may not exist in the remote yet
+        if self._configure_mirror_remotes(""):
+            self._write_state_stamp()
                 
-    def add_commit_push(self, article_filename: str = None, commit_message: str = None) -> tuple[bool, str]:
+    def _create_sparse_checkout(self):
+        steps = [
+            ["git", "init"],
+            ["git", "remote", "add", "origin", self.repo_url],
+            ["git", "sparse-checkout", "set", "--cone", "--sparse-index", self.sparse_path],
+        ]
+        for command in steps:
+            success, _, stderr = self._run_command(command, cwd=self.repo_root)
+            if not success:
+                raise RuntimeError(f"Failed to set up sparse checkout ({' '.join(command[:3])}): {stderr}")
+
+        # ls-remote tells "the branch does not exist yet" (empty output) apart from "the remote cannot be reached".
+        success, heads, stderr = self._run_command(["git", "ls-remote", "--heads", "origin", f"refs/heads/{self.default_branch}"],
+                                                   cwd=self.repo_root, env=self.ssh_env, timeout=self.push_timeout)
+        if not success:
+            raise RuntimeError(f"Could not reach '{self.repo_url}' to create the sparse checkout: {stderr}")
+        if not heads:
+            print(f"Branch '{self.default_branch}' does not exist on the remote yet. The first push will create it.")
+            return
+
+        fetch_command = ["git", "fetch", "--depth=1", "--filter=blob:none", "origin", self.default_branch]
+        success, _, stderr = self._run_command(fetch_command, cwd=self.repo_root, env=self.ssh_env, timeout=self.push_timeout)
+        if not success:
+            raise RuntimeError(f"Could not fetch branch '{self.default_branch}' from '{self.repo_url}': {stderr}")
+        success, _, stderr = self._run_command(["git", "checkout", "-B", self.default_branch, "FETCH_HEAD"], cwd=self.repo_root)
+        if not success:
+            raise RuntimeError(f"Failed to check out '{self.default_branch}': {stderr}")
+
+    def add_commit_push(self, article_filename: str = None, commit_message: str = None,
+                        full_scan: bool = False) -> tuple[bool, str]:
         """
         Adds, commits, and pushes changes to the remote repository.
+        Without article_filename, the changed set is taken from the push manifest and only those paths
+        are staged; if there is no manifest yet (or full_scan is set) everything is staged with `git add .`
+        and the manifest is rebuilt after a successful push.
+        With article_filename, only that article is staged and checked; the rest of the tree is never scanned.
         """
         if not self.repo_url:
             return False, "GitHub repository URL is not configured. Cannot push."
 
-        # Git Add
-        target_to_add = article_filename if article_filename else "."
-        
-        # Security check for article_filename if provided
         if article_filename:
-            # Normalize to prevent path traversal, but allow simple subdirectories if local_dir is the root of articles
-            # For simplicity, we assume article_filename is just a name, or a path relative to local_dir
-            # os.path.join will correctly form the path relative to local_dir.
-            # The main concern is 'git add' itself and what `article_filename` could be.
-            # If article_filename is like "../../../etc/passwd", this is a problem.
-            # For now, assume article_filename is a simple name or relative path within local_dir.
-            # A better check might be to ensure it's relative and within the local_dir.
-            if ".." in article_filename or os.path.isabs(article_filename):
-                 return False, f"Invalid article filename format: '{article_filename}'. Must be a relative path within the articles directory."
-            # If article_filename is just a name, it's fine. If it's "subdir/file.md", it's also fine.
-            # `git add` will operate relative to `self.local_dir`.
+            return self._push_article(article_filename, commit_message)
+        if not full_scan and self.manifest.load():
+            return self._push_changed_paths(commit_message)
+
+        # Git Add
+        target_to_add = "."
 
         print(f"Adding '{target_to_add}' to git index in '{self.local_dir}'...")
-        success_add, stdout_add, stderr_add = self._run_command(["git", "add", target_to_add])
+        success_add, stdout_add, stderr_add = self.backend.add(target_to_add)
         if not success_add:
             return False, f"Git add failed for '{target_to_add}': {stderr_add}"
 
         # Git Commit
         # Check for changes before committing
-        success_status, stdout_status, stderr_status = self._run_command(["git", "status", "--porcelain"])
+        success_status, stdout_status, stderr_status = self.backend.status_porcelain()
         if not success_status:
             return False, f"Git status check failed: {stderr_status}"
         if not stdout_status: 
-            return True, "No changes staged for commit. Working tree clean or changes not added."
+            return self._nothing_to_commit("No changes staged for commit. Working tree clean or changes not added.")
 
         # Determine commit message
-        if commit_message: # Specific message provided
-            final_commit_message = commit_message
-        elif article_filename: # No specific message, but filename provided
-            final_commit_message = f"feat: Add/update {os.path.basename(article_filename)} (via CLI)"
-        else: # No specific message, no specific filename (e.g. git add .)
-             final_commit_message = self.default_commit_message
+        final_commit_message = commit_message or self.default_commit_message
 
         print(f"Committing with message: '{final_commit_message}'...")
-        success_commit, stdout_commit, stderr_commit = self._run_command(["git", "commit", "-m", final_commit_message])
+        success_commit, stdout_commit, stderr_commit = self.backend.commit(final_commit_message)
         if not success_commit:
             if "nothing to commit" in stderr_commit.lower() or "nothing to commit" in stdout_commit.lower():
-                 return True, "No changes to commit." # Should have been caught by status, but as a fallback.
+                 return self._nothing_to_commit("No changes to commit.") # Should have been caught by status, but as a fallback.
             return False, f"Git commit failed: {stderr_commit}"
 
         # Git Push
@@ -147,15 +934,208 @@ class GitHubHandler:
         # creating it if it doesn't exist on the remote.
         
         print(f"Pushing current HEAD to remote branch '{self.default_branch}' at '{self.repo_url}'...")
-        push_command = ["git", "push", "origin", f"HEAD:{self.default_branch}"]
-        success_push, stdout_push, stderr_push = self._run_command(push_command)
+        success_push, stdout_push, stderr_push = self._push_head()
         
         if not success_push:
             # Common errors: authentication failure, remote branch not existing (though HEAD:branch should create), non-fast-forward.
             return False, f"Git push failed: {stderr_push}\nStdout: {stdout_push}"
-        
+
+        self._record_pushed()
         return True, f"Successfully pushed changes to branch '{self.default_branch}'.\n{stdout_push}"
 
+    def _push_article(self, article_filename: str, commit_message: str = None) -> tuple[bool, str]:
+        """Stages, commits and pushes one article, checking only that path instead of the whole working tree."""
+        # Reject path traversal; a plain name or a subdirectory path relative to local_dir is fine.
+        if ".." in article_filename or os.path.isabs(article_filename):
+            return False, f"Invalid article filename format: '{article_filename}'. Must be a relative path within the articles directory."
+        path = article_filename.replace(os.sep, "/")
+        # The manifest answers "unchanged since the last push" with a stat; without one, ask git through cat-file.
+        if (self.manifest.load() and self.manifest.matches(path)) or self.is_article_unchanged(article_filename):
+            return self._nothing_to_commit(f"No changes to commit. '{article_filename}' matches the last commit.")
+
+        print(f"Adding '{article_filename}' to git index in '{self.local_dir}'...")
+        success_add, _, stderr_add = self.backend.add_paths([path])
+        if not success_add:
+            return False, f"Git add failed for '{article_filename}': {stderr_add}"
+        success_staged, stdout_staged, stderr_staged = self.backend.staged_paths([path])
+        if not success_staged:
+            return False, f"Git status check failed: {stderr_staged}"
+        if not stdout_staged:
+            return self._nothing_to_commit("No changes staged for commit. Working tree clean or changes not added.")
+
+        final_commit_message = commit_message or f"feat: Add/update {os.path.basename(article_filename)} (via CLI)"
+        print(f"Committing with message: '{final_commit_message}'...")
+        success_commit, _, stderr_commit = self.backend.commit(final_commit_message, paths=[path])
+        if not success_commit:
+            return False, f"Git commit failed: {stderr_commit}"
+
+        print(f"Pushing current HEAD to remote branch '{self.default_branch}' at '{self.repo_url}'...")
+        success_push, stdout_push, stderr_push = self._push_head()
+        if not success_push:
+            return False, f"Git push failed: {stderr_push}\nStdout: {stdout_push}"
+
+        self._record_pushed([article_filename])
+        return True, f"Successfully pushed changes to branch '{self.default_branch}'.\n{stdout_push}"
+
+    def commit_push_articles(self, article_filenames: list[str], commit_message: str = None) -> tuple[bool, str]:
+        """
+        Stages the given articles (including deleted ones), creates one commit for all of them and pushes once.
+        Used to flush the push queue.
+        """
+        if not self.repo_url:
+            return False, "GitHub repository URL is not configured. Cannot push."
+        for article_filename in article_filenames:
+            if ".." in article_filename or os.path.isabs(article_filename):
+                return False, f"Invalid article filename format: '{article_filename}'. Must be a relative path within the articles directory."
+        paths = sorted({article_filename.replace(os.sep, "/") for article_filename in article_filenames})
+        if not paths:
+            return True, "No articles to push."
+        # An article deleted before it was ever committed has nothing to stage; `git add` would reject the
+        # whole batch over it, again on every retry.
+        missing = [path for path in paths if not os.path.lexists(os.path.join(self.local_dir, path))]
+        if missing:
+            success_tracked, stdout_tracked, stderr_tracked = self.backend.tracked_paths(missing)
+            if not success_tracked:
+                return False, f"Git ls-files failed: {stderr_tracked}"
+            gone = sorted(set(missing) - set(stdout_tracked.splitlines()))
+            if gone:
+                print(f"WARNING: Skipping {len(gone)} article(s) that no longer exist and were never committed: {', '.join(gone)}")
+                paths = [path for path in paths if path not in gone]
+            if not paths:
+                return self._nothing_to_commit("No changes to commit. The queued articles no longer exist.")
+
+        print(f"Adding {len(paths)} article(s) to git index in '{self.local_dir}'...")
+        success_add, _, stderr_add = self.backend.add_paths(paths)
+        if not success_add:
+            return False, f"Git add failed: {stderr_add}"
+        success_staged, stdout_staged, stderr_staged = self.backend.staged_paths(paths)
+        if not success_staged:
+            return False, f"Git status check failed: {stderr_staged}"
+        if not stdout_staged:
+            return self._nothing_to_commit("No changes to commit. The queued articles match the last commit.")
+
+        if not commit_message:
+            if len(paths) == 1:
+                commit_message = f"feat: Add/update {os.path.basename(paths[0])} (via CLI)"
+            else:
+                commit_message = f"feat: Add/update {len(paths)} articles (via CLI)\n\n" + "\n".join(f"- {path}" for path in paths)
+        print(f"Committing {len(paths)} article(s) with message: '{commit_message.splitlines()[0]}'...")
+        success_commit, _, stderr_commit = self.backend.commit(commit_message, paths=paths)
+        if not success_commit:
+            return False, f"Git commit failed: {stderr_commit}"
+
+        print(f"Pushing current HEAD to remote branch '{self.default_branch}' at '{self.repo_url}'...")
+        success_push, stdout_push, stderr_push = self._push_head()
+        if not success_push:
+            return False, f"Git push failed: {stderr_push}\nStdout: {stdout_push}"
+
+        self._record_pushed(paths)
+        return True, f"Successfully pushed {len(paths)} article(s) to branch '{self.default_branch}'.\n{stdout_push}"
+
+    def commit_each_and_push(self, article_commits: list[tuple[str, str]]) -> tuple[bool, str]:
+        """
+        Creates one commit per (article_filename, commit_message), in order and on top of each other,
+        then sends them all with a single `git push`. Articles with nothing to commit are skipped.
+        If a commit fails, the commits made before it are still pushed and the failure is reported.
+        """
+        if not self.repo_url:
+            return False, "GitHub repository URL is not configured. Cannot push."
+        for article_filename, _ in article_commits:
+            if ".." in article_filename or os.path.isabs(article_filename):
+                return False, f"Invalid article filename format: '{article_filename}'. Must be a relative path within the articles directory."
+
+        committed, unchanged, failure = [], [], None
+        for article_filename, commit_message in article_commits:
+            path = article_filename.replace(os.sep, "/")
+            success_add, _, stderr_add = self.backend.add_paths([path])
+            if not success_add:
+                failure = f"Git add failed for '{article_filename}': {stderr_add}"
+                break
+            success_staged, stdout_staged, stderr_staged = self.backend.staged_paths([path])
+            if not success_staged:
+                failure = f"Git status check failed for '{article_filename}': {stderr_staged}"
+                break
+            if not stdout_staged:
+                unchanged.append(article_filename)
+                continue
+            print(f"Committing '{article_filename}' with message: '{commit_message}'...")
+            success_commit, _, stderr_commit = self.backend.commit(commit_message, paths=[path])
+            if not success_commit:
+                failure = f"Git commit failed for '{article_filename}': {stderr_commit}"
+                break
+            committed.append(article_filename)
+
+        summary = f"{len(committed)} commit(s) created"
+        if unchanged:
+            summary += f"; unchanged, not committed: {', '.join(unchanged)}"
+        if not committed:
+            if failure:
+                return False, failure
+            return self._nothing_to_commit(f"No changes to commit ({summary}).")
+
+        print(f"Pushing {len(committed)} commit(s) to remote branch '{self.default_branch}' at '{self.repo_url}'...")
+        success_push, stdout_push, stderr_push = self._push_head()
+        if not success_push:
+            return False, f"Git push failed: {stderr_push}\nStdout: {stdout_push}"
+        self._record_pushed(committed)
+        if failure:
+            return False, f"Pushed {summary}, then stopped: {failure}"
+        return True, f"Successfully pushed {summary} to branch '{self.default_branch}'.\n{stdout_push}"
+
+    def _record_pushed(self, article_filenames: list[str] = None):
+        """Updates the push manifest after a successful push of some articles or of the whole directory."""
+        try:
+            if article_filenames is None:
+                self.manifest.rebuild()
+            elif self.manifest.load():
+                pending = {}
+                for article_filename in article_filenames:
+                    article_path = os.path.join(self.local_dir, article_filename)
+                    blob_id = git_blob_sha1(article_path)
+                    relative_path = article_filename.replace(os.sep, "/")
+                    pending[relative_path] = None if blob_id is None else self.manifest.make_entry(os.stat(article_path), blob_id)
+                self.manifest.apply(pending)
+            else:
+                return # Keep "no manifest" so the next full push does a full scan
+        except OSError:
+            return
+        self.manifest.save()
+
+    def _push_changed_paths(self, commit_message: str = None) -> tuple[bool, str]:
+        """Stages, commits and pushes only the paths that changed since the manifest was recorded."""
+        try:
+            changed, pending = self.manifest.changed_paths()
+        except OSError as e:
+            return False, f"Could not scan '{self.local_dir}' for changes: {e}"
+        if not changed:
+            self.manifest.save() # Persist refreshed mtimes of touched-but-identical files
+            return self._nothing_to_commit("No changes since the last push.")
+
+        print(f"Adding {len(changed)} changed path(s) to git index in '{self.local_dir}'...")
+        success_add, _, stderr_add = self.backend.add_paths(changed)
+        if not success_add:
+            return False, f"Git add failed: {stderr_add}"
+
+        success_staged, stdout_staged, stderr_staged = self.backend.staged_paths(changed)
+        if not success_staged:
+            return False, f"Git status check failed: {stderr_staged}"
+        if stdout_staged:
+            final_commit_message = commit_message or self.default_commit_message
+            print(f"Committing with message: '{final_commit_message}'...")
+            success_commit, _, stderr_commit = self.backend.commit(final_commit_message, paths=changed)
+            if not success_commit:
+                return False, f"Git commit failed: {stderr_commit}"
+        # Otherwise the changes were already committed (e.g. by hand); they may still need pushing.
+
+        print(f"Pushing current HEAD to remote branch '{self.default_branch}' at '{self.repo_url}'...")
+        success_push, stdout_push, stderr_push = self._push_head()
+        if not success_push:
+            return False, f"Git push failed: {stderr_push}\nStdout: {stdout_push}"
+
+        self.manifest.apply(pending)
+        self.manifest.save()
+        return True, f"Successfully pushed {len(changed)} changed path(s) to branch '{self.default_branch}'.\n{stdout_push}"
+
 # Example Usage (commented out, for local testing if needed)
 # if __name__ == '__main__':
 #     # IMPORTANT: Set this environment variable to a test SSH repo URL
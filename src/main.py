@@ -1,20 +1,249 @@
 import argparse
+import asyncio
+import contextlib
+import io
+import json
 import os
+import sys
+import threading
 import datetime # Moved to top level
+import fnmatch
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Using relative imports as src is intended to be a package
 from .config import (
     get_drafts_dir, get_final_articles_dir, get_failed_validation_dir,
     get_gemini_api_key, get_chat_history_file_path, get_github_repo_url,
-    get_git_default_branch, get_git_default_commit_message # Added
+    get_gemini_requests_per_minute, get_gemini_tokens_per_minute, get_gemini_max_retries,
+    get_gemini_retry_base_delay_seconds,
+    get_git_default_branch, get_git_default_commit_message, get_git_backend, # Added
+    get_git_ssh_control_dir, get_git_ssh_control_persist, get_git_ssh_server_alive_interval,
+    get_git_sparse_path, get_git_mirror_remotes, get_git_push_timeout_seconds, get_config_warnings,
+    get_response_cache_dir, get_response_cache_max_entries, get_response_cache_ttl_seconds,
+    get_catalog_db_path, get_push_queue_dir, get_push_queue_flush_threshold, get_daemon_socket_path
 )
-from .article_generator import ArticleGenerator
-from .article_utils import save_article, load_article, list_articles, validate_frontmatter
+from .article_generator import ArticleGenerator, ChatHistoryLog
+from .article_utils import (
+    save_article, load_article, validate_frontmatter, validate_article_file, validate_article_files,
+    consume_article_stream, yaml_loader_description, read_frontmatter_head, extract_frontmatter_block, parse_yaml,
+    move_article, fsync_directory, GroupCommit, remove_stale_temp_files
+)
+from .article_catalog import ArticleCatalog
 from .github_handler import GitHubHandler
+from .push_queue import PushQueue
+from .response_cache import ResponseCache
+from .daemon import DaemonServer, run_remote, send_request
+from .rate_limiter import RateLimiter, RetryPolicy
+from .generation_stats import METRICS, PERCENTILES, summarize_generations
+
+# Objects kept alive between commands by `serve` (None outside the daemon): the model client, catalog and
+# git handlers, keyed by the configuration they were built with.
+_warm_objects = None
+# Event loop shared by every async batch in the daemon (None outside it). The SDK caches its grpc.aio client,
+# which only works on the loop it was created on, on the model and module-wide; a warm model therefore needs
+# every batch to run on the same loop instead of a fresh asyncio.run().
+_event_loop = None
+
+
+def _run_async(coroutine):
+    """Runs coroutine to completion: on the daemon's long-lived event loop, or with asyncio.run() outside it."""
+    if _event_loop is None:
+        return asyncio.run(coroutine)
+    return _event_loop.run_until_complete(coroutine)
+
+
+def _reuse(key: tuple, factory):
+    """Returns factory(), or inside the daemon the instance an earlier command built for the same key."""
+    if _warm_objects is None:
+        return factory()
+    if key not in _warm_objects:
+        _warm_objects[key] = factory()
+    return _warm_objects[key]
+
+
+def _release(obj):
+    """Closes obj, unless the daemon keeps it warm for the next command."""
+    if _warm_objects is None:
+        obj.close()
+
+
+def _build_rate_limiter() -> RateLimiter | None:
+    """Returns the client-side limiter for the configured Gemini quota, or None if no limit is set."""
+    requests_per_minute, tokens_per_minute = get_gemini_requests_per_minute(), get_gemini_tokens_per_minute()
+    if requests_per_minute <= 0 and tokens_per_minute <= 0:
+        return None
+    return RateLimiter(requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+
+
+def _build_retry_policy() -> RetryPolicy | None:
+    max_retries = get_gemini_max_retries()
+    if max_retries <= 0:
+        return None
+    return RetryPolicy(max_retries=max_retries, base_delay=get_gemini_retry_base_delay_seconds())
+
+
+def _make_article_generator(args, gemini_key: str, chat_history_path: str) -> ArticleGenerator:
+    # Inside the daemon the rate limiter's state carries over between commands along with the model client
+    return _reuse(
+        ("generator", chat_history_path, gemini_key, bool(args.no_cache)),
+        lambda: ArticleGenerator(
+            chat_history_file=chat_history_path,
+            gemini_api_key=gemini_key,
+            response_cache=_build_response_cache(args),
+            rate_limiter=_build_rate_limiter(),
+            retry_policy=_build_retry_policy()
+        )
+    )
+
+
+def _build_response_cache(args) -> ResponseCache | None:
+    """Returns the response cache for this run, or None when --no-cache is given."""
+    if args.no_cache:
+        return None
+    return ResponseCache(
+        cache_dir=get_response_cache_dir(),
+        max_entries=get_response_cache_max_entries(),
+        ttl_seconds=get_response_cache_ttl_seconds(),
+        # Only responses with valid frontmatter are worth replaying.
+        validator=lambda text: validate_frontmatter(text)[0]
+    )
+
+
+def _read_prompts_file(prompts_file: str) -> list[str]:
+    """
+    Reads one prompt per line from prompts_file.
+    Blank lines and lines starting with '#' are ignored.
+    """
+    with open(prompts_file, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def _generate_batch(args, gemini_key: str, chat_history_path: str):
+    """
+    Generates one article per prompt in args.prompts_file with the async API: up to args.concurrency
+    requests are in flight on one event loop, each bounded by args.timeout seconds if given.
+    Each result is validated and written to drafts or failed as soon as it finishes.
+    """
+    try:
+        prompts = _read_prompts_file(args.prompts_file)
+    except OSError as e:
+        print(f"ERROR: Could not read prompts file '{args.prompts_file}': {e}")
+        return
+
+    if not prompts:
+        print(f"INFO: No prompts found in '{args.prompts_file}'. Nothing to generate.")
+        return
+
+    concurrency = max(1, args.concurrency)
+    drafts_dir = get_drafts_dir()
+    failed_dir = get_failed_validation_dir()
+    # Filenames share one batch timestamp plus the prompt index, so parallel results never collide.
+    batch_timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    print(f"Generating {len(prompts)} articles from '{args.prompts_file}' with concurrency {concurrency}...")
+
+    article_generator = _make_article_generator(args, gemini_key, chat_history_path)
+
+    counts = {"succeeded": 0, "failed": 0}
+    # Totals are cumulative for a generator kept warm by the daemon, so report this batch's share
+    retries_before = article_generator.total_retries
+    wait_before = article_generator.total_rate_limit_wait_seconds
+
+    def save_result(position: int, prompt: str, raw_ai_output: str):
+        index = position + 1
+        if "Error:" in raw_ai_output[:20]:
+            error_filename = f"generation_error_{batch_timestamp}_{index:04d}.txt"
+            saved_path = save_article(f"Prompt: {prompt}\n\nError: {raw_ai_output}", failed_dir, error_filename,
+                                      group_commit=group_commit)
+            print(f"[{index}/{len(prompts)}] ERROR during generation for '{prompt}'. Details saved to: {saved_path}")
+            counts["failed"] += 1
+            return
+
+        filename = f"article_{batch_timestamp}_{index:04d}.md"
+        is_valid, frontmatter_data, error_message = validate_frontmatter(raw_ai_output)
+        if is_valid:
+            saved_path = save_article(raw_ai_output, drafts_dir, filename, group_commit=group_commit)
+            print(f"[{index}/{len(prompts)}] SUCCESS: '{frontmatter_data.get('title', 'N/A')}' saved to: {saved_path}")
+            counts["succeeded"] += 1
+        else:
+            saved_path = save_article(raw_ai_output, failed_dir, filename, group_commit=group_commit)
+            print(f"[{index}/{len(prompts)}] ERROR: Validation failed for '{prompt}': {error_message}. Raw output saved to: {saved_path}")
+            counts["failed"] += 1
+
+    # All requests share one event loop; results are saved, atomically and in place, as they arrive. The
+    # group commit batches the fsyncs (one sync per group) instead of paying them per article.
+    for articles_dir in (drafts_dir, failed_dir):
+        remove_stale_temp_files(articles_dir) # Left by a run that crashed mid-write
+    with GroupCommit() as group_commit:
+        _run_async(article_generator.agenerate_many(prompts, concurrency=concurrency, timeout=args.timeout,
+                                                     on_result=save_result))
+    succeeded, failed = counts["succeeded"], counts["failed"]
+    if article_generator.rate_limiter is not None or article_generator.retry_policy is not None:
+        print(f"Rate limiting: waited {article_generator.total_rate_limit_wait_seconds - wait_before:.1f}s in total; "
+              f"{article_generator.total_retries - retries_before} transient error(s) retried.")
+
+    print(f"\nBatch generation summary: {succeeded} succeeded, {failed} failed, {len(prompts)} total.")
+
+
+def _generate_streaming(args, article_generator: ArticleGenerator):
+    """
+    Streams the article for args.prompt straight into a draft file.
+    The frontmatter is validated as soon as it is complete; if it is invalid the stream is
+    abandoned and only the received header is saved to the failed directory.
+    """
+    drafts_dir = get_drafts_dir()
+    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"article_{timestamp}.md"
+    draft_path = os.path.join(drafts_dir, filename)
+    # Written under a temporary name so review/finalize never see a half-streamed draft.
+    partial_path = draft_path + ".part"
+
+    chunks = article_generator.stream_article(args.prompt)
+    try:
+        with open(partial_path, 'w') as out_file:
+            is_valid, frontmatter_data, error_message, head_text = consume_article_stream(chunks, out_file)
+            if is_valid:
+                out_file.flush()
+                os.fsync(out_file.fileno()) # Durable before it is renamed into place
+    except Exception as e:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        failed_dir = get_failed_validation_dir()
+        error_filename = f"generation_error_{timestamp}.txt"
+        saved_error_path = save_article(f"Prompt: {args.prompt}\n\nError: {e}", failed_dir, error_filename)
+        print(f"\nERROR during streamed article generation: {e}")
+        print(f"Generation error details saved to: {saved_error_path}")
+        return
+    finally:
+        chunks.close() # Stops consuming the model stream if we returned early
+
+    if is_valid:
+        os.replace(partial_path, draft_path)
+        fsync_directory(drafts_dir)
+        print(f"\nSUCCESS: Article draft streamed, validated, and saved to: {draft_path}")
+        print(f"  Title: {frontmatter_data.get('title', 'N/A')}")
+        print(f"  Date: {frontmatter_data.get('date', 'N/A')}")
+    else:
+        os.remove(partial_path)
+        saved_path = save_article(head_text, get_failed_validation_dir(), filename)
+        print(f"\nERROR: Streamed article failed frontmatter validation, stream stopped early: {error_message}")
+        print(f"Received output saved to: {saved_path}")
 
 
 def handle_generate(args):
     """Handles the 'generate' command to create a new article."""
+    if args.prompts_file:
+        if args.stream:
+            print("ERROR: --stream can only be used with a single --prompt.")
+            return
+        gemini_key = get_gemini_api_key()
+        if not gemini_key:
+            print("ERROR: Gemini API key (GEMINI_API_KEY) is not configured in your .env file.")
+            return
+        _generate_batch(args, gemini_key, get_chat_history_file_path())
+        return
+
     print(f"Attempting to generate article with prompt: '{args.prompt}'...")
 
     gemini_key = get_gemini_api_key()
@@ -28,10 +257,11 @@ def handle_generate(args):
         return
 
     try:
-        article_generator = ArticleGenerator(
-            chat_history_file=chat_history_path,
-            gemini_api_key=gemini_key
-        )
+        article_generator = _make_article_generator(args, gemini_key, chat_history_path)
+
+        if args.stream:
+            _generate_streaming(args, article_generator)
+            return
         
         raw_ai_output = article_generator.generate_article(args.prompt)
         
@@ -66,20 +296,69 @@ def handle_generate(args):
         # Consider saving raw_ai_output to failed_dir here too if available
 
 
-def handle_review(args):
-    """Handles the 'review' command to list or view articles based on status."""
+def _print_article_listing(status: str, articles_directory: str, heading: str, args=None) -> int:
+    """
+    Refreshes the catalog for status and prints one page of it under heading.
+    Returns the total number of articles for status (nothing is printed when it is 0).
+    """
+    sort = getattr(args, "sort", "name")
+    descending = getattr(args, "reverse", False)
+    limit = getattr(args, "limit", None)
+    page = getattr(args, "page", 1)
+
+    catalog_path = get_catalog_db_path()
+    catalog = _reuse(("catalog", catalog_path),
+                     lambda: ArticleCatalog(catalog_path, frontmatter_parser=validate_article_file))
+    try:
+        catalog.refresh(status, articles_directory)
+        total = catalog.count(status)
+        articles = catalog.query(status, sort=sort, descending=descending,
+                                 limit=limit, offset=(page - 1) * limit if limit else 0)
+    finally:
+        _release(catalog)
+
+    if articles:
+        print(heading)
+    for article in articles:
+        details = " | ".join(str(value) for value in (article["title"], article["date"]) if value)
+        print(f"- {article['filename']}" + (f"  ({details})" if details else ""))
+    if limit and total > limit:
+        last_page = (total + limit - 1) // limit
+        print(f"\nPage {page} of {last_page} ({total} articles). Use --page to see more.")
+    return total
+
+
+def _status_directory(status: str) -> str | None:
+    """Resolves the directory for a review/validate status, or None for an unknown status."""
     status_map = {
         "draft": get_drafts_dir,
         "final": get_final_articles_dir,
         "failed": get_failed_validation_dir,
     }
-    
-    if args.status not in status_map:
-        print(f"ERROR: Invalid status '{args.status}'. Choose from {', '.join(status_map.keys())}.")
+    return status_map[status]() if status in status_map else None
+
+
+def _list_article_paths(articles_dir: str) -> list[str]:
+    """Returns the paths of all .md files directly inside articles_dir, sorted by name."""
+    try:
+        with os.scandir(articles_dir) as it:
+            return sorted(entry.path for entry in it if entry.name.endswith(".md") and entry.is_file())
+    except FileNotFoundError:
+        return []
+
+
+def handle_review(args):
+    """Handles the 'review' command to list or view articles based on status."""
+    articles_directory = _status_directory(args.status)
+    if articles_directory is None:
+        print(f"ERROR: Invalid status '{args.status}'. Choose from draft, final, failed.")
+        return
+    if args.limit is not None and args.limit <= 0:
+        print("ERROR: --limit must be a positive number of articles.")
+        return
+    if args.page <= 0:
+        print("ERROR: --page must be 1 or greater.")
         return
-        
-    articles_dir_func = status_map[args.status]
-    articles_directory = articles_dir_func() # Call the appropriate getter
 
     print(f"Reviewing articles with status '{args.status}' in directory: '{articles_directory}'")
 
@@ -103,29 +382,113 @@ def handle_review(args):
                 print(f"--- End of Article: {args.article_name} ---")
             else:
                 print(f"INFO: Article '{args.article_name}' not found in '{articles_directory}'.")
-                articles = list_articles(articles_directory)
-                if articles:
-                    print("\nAvailable articles in this directory:")
-                    for article_filename in articles: print(f"- {article_filename}")
-                else: print(f"No articles found in '{articles_directory}'.")
+                if not _print_article_listing(args.status, articles_directory, "\nAvailable articles in this directory:"):
+                    print(f"No articles found in '{articles_directory}'.")
         except Exception as e:
             print(f"ERROR loading article '{args.article_name}': {e}")
     else:
         print(f"Listing all articles in '{articles_directory}'...")
         try:
-            articles = list_articles(articles_directory)
-            if articles:
-                print("\nAvailable articles:")
-                for article_filename in articles: print(f"- {article_filename}")
-            else: print(f"INFO: No articles found in '{articles_directory}' for status '{args.status}'.")
+            if not _print_article_listing(args.status, articles_directory, "\nAvailable articles:", args):
+                print(f"INFO: No articles found in '{articles_directory}' for status '{args.status}'.")
         except Exception as e:
             print(f"ERROR listing articles: {e}")
 
 
+def _validate_paths(article_paths: list[str], jobs: int, on_result=None) -> list[tuple[str, bool, str | None]]:
+    """
+    Validates article_paths by header only and returns (path, is_valid, error) for each, in completion order.
+    With jobs > 1 the work is fanned out in chunks across a process pool, because YAML parsing is
+    CPU-bound and would not run in parallel on threads. on_result(path, is_valid, error) is called
+    as each result arrives.
+    """
+    results = []
+
+    def collect(batch_results):
+        for path, is_valid, error_message in batch_results:
+            results.append((path, is_valid, error_message))
+            if on_result:
+                on_result(path, is_valid, error_message)
+
+    if jobs <= 1 or len(article_paths) <= 1:
+        for path in article_paths:
+            collect(validate_article_files([path]))
+        return results
+
+    # Several files per task keeps inter-process overhead small; enough tasks keep every worker busy.
+    chunk_size = max(1, min(64, len(article_paths) // (jobs * 4)))
+    chunks = [article_paths[i:i + chunk_size] for i in range(0, len(article_paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(validate_article_files, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                batch_results = future.result()
+            except Exception as e: # E.g. a worker process died; report its chunk instead of aborting the run
+                batch_results = [(path, False, f"Validation worker failed: {e}") for path in futures[future]]
+            collect(batch_results)
+    return results
+
+
+def _finalize_many(args, drafts_dir: str, final_dir: str):
+    """
+    Finalizes every draft selected by --all or --glob: validates them all in parallel first,
+    then moves the valid ones to the final directory in a single pass.
+    """
+    draft_paths = _list_article_paths(drafts_dir)
+    if args.glob:
+        if os.path.sep in args.glob or (os.path.altsep and os.path.altsep in args.glob):
+            print(f"ERROR: Invalid pattern '{args.glob}'. It must match plain filenames.")
+            return
+        draft_paths = [path for path in draft_paths if fnmatch.fnmatch(os.path.basename(path), args.glob)]
+
+    selection = f"matching '{args.glob}'" if args.glob else "in the drafts directory"
+    if not draft_paths:
+        print(f"INFO: No draft articles {selection}. Nothing to finalize.")
+        return
+
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    print(f"Re-validating {len(draft_paths)} draft articles {selection} with {jobs} jobs...")
+    results = _validate_paths(draft_paths, jobs)
+
+    remove_stale_temp_files(final_dir) # From a cross-filesystem move that crashed mid-copy
+    moved, failed = [], []
+    # One pass of atomic renames; the directory fsyncs are done once for the whole batch.
+    # Each draft is handled on its own: one that cannot be moved is reported and the rest carry on.
+    try:
+        with GroupCommit() as group_commit:
+            for draft_path, is_valid, error_message in sorted(results):
+                draft_name = os.path.basename(draft_path)
+                if not is_valid:
+                    failed.append((draft_name, f"Frontmatter validation failed: {error_message}"))
+                    continue
+                final_path = os.path.join(final_dir, draft_name)
+                try:
+                    if os.path.exists(final_path):
+                        print(f"WARNING: Article '{draft_name}' already exists in the final directory '{final_dir}'. Overwriting.")
+                    group_commit.move(draft_path, final_path)
+                    moved.append(draft_name)
+                except Exception as e:
+                    failed.append((draft_name, f"Move failed: {e}"))
+    except OSError as e: # The moves are done; only syncing the directories to disk failed
+        print(f"WARNING: Could not sync the article directories to disk: {e}")
+
+    print(f"\nFinalize summary: {len(moved)} moved to '{final_dir}', {len(failed)} failed.")
+    if moved:
+        print("Moved:")
+        for draft_name in moved: print(f"- {draft_name}")
+    if failed:
+        print("Failed (left in drafts):")
+        for draft_name, reason in failed: print(f"- {draft_name}: {reason}")
+
+
 def handle_finalize(args): # Renamed from handle_save
-    """Handles the 'finalize' command to move a draft article to the final directory."""
+    """Handles the 'finalize' command to move one draft (or a selection of drafts) to the final directory."""
     drafts_dir = get_drafts_dir()
     final_dir = get_final_articles_dir()
+
+    if not args.draft_name:
+        _finalize_many(args, drafts_dir, final_dir)
+        return
     
     if ".." in args.draft_name or os.path.sep in args.draft_name or \
        (os.path.altsep and os.path.altsep in args.draft_name):
@@ -147,14 +510,9 @@ def handle_finalize(args): # Renamed from handle_save
         # print(f"ERROR: Article '{args.draft_name}' already exists in final directory. Resolve manually."); return
 
     try:
-        # Optional: Re-validate before finalizing
+        # Optional: Re-validate before finalizing. Only the frontmatter block is read, not the body.
         print(f"Re-validating frontmatter for '{args.draft_name}'...")
-        draft_content = load_article(draft_path)
-        if draft_content is None: # Should not happen if path exists, but good check
-            print(f"ERROR: Could not read content of draft article '{draft_path}'.")
-            return
-            
-        is_valid, _, error_message = validate_frontmatter(draft_content)
+        is_valid, _, error_message = validate_article_file(draft_path)
         if not is_valid:
             print(f"ERROR: Frontmatter validation failed for '{args.draft_name}': {error_message}")
             # Consider moving to failed_validation_dir instead, or just leaving it.
@@ -165,12 +523,136 @@ def handle_finalize(args): # Renamed from handle_save
             return
 
         print(f"Validation successful. Moving '{args.draft_name}' to final articles directory...")
-        os.rename(draft_path, final_path)
+        move_article(draft_path, final_path)
         print(f"SUCCESS: Article '{args.draft_name}' finalized and moved to '{final_path}'.")
     except Exception as e:
         print(f"ERROR during finalization of '{args.draft_name}': {e}")
 
 
+def handle_validate(args):
+    """Handles the 'validate' command to re-check the frontmatter of every article in a status directory."""
+    articles_directory = _status_directory(args.status)
+    if articles_directory is None:
+        print(f"ERROR: Invalid status '{args.status}'. Choose from draft, final, failed.")
+        return
+
+    article_paths = _list_article_paths(articles_directory)
+    if not article_paths:
+        print(f"INFO: No articles found in '{articles_directory}' for status '{args.status}'.")
+        return
+
+    jobs = max(1, args.jobs or os.cpu_count() or 1)
+    print(f"Validating {len(article_paths)} articles in '{articles_directory}' with {jobs} jobs...")
+
+    def report(path, is_valid, error_message):
+        if not is_valid:
+            print(f"FAIL {os.path.basename(path)}: {error_message}")
+        elif not args.failures_only:
+            print(f"OK   {os.path.basename(path)}")
+
+    start = time.perf_counter()
+    results = _validate_paths(article_paths, jobs, on_result=report)
+    elapsed = time.perf_counter() - start
+
+    failures = sorted((os.path.basename(path), error) for path, is_valid, error in results if not is_valid)
+    print(f"\nValidation summary for status '{args.status}':")
+    print(f"  Checked: {len(results)}  Valid: {len(results) - len(failures)}  Invalid: {len(failures)}")
+    print(f"  Elapsed: {elapsed:.2f}s  Throughput: {len(results) / elapsed if elapsed > 0 else float('inf'):.1f} files/s")
+    if failures:
+        print("  Failures:")
+        for filename, error_message in failures:
+            print(f"  - {filename}: {error_message}")
+
+
+def _flush_push_queue(queue: PushQueue, make_handler):
+    """Pushes every queued intent as one commit and one push, then prints the outcome."""
+    def push_intents(intents):
+        articles, commit_message = PushQueue.coalesce(intents)
+        handler = make_handler()
+        try:
+            if articles is None:
+                return handler.add_commit_push(commit_message=commit_message)
+            return handler.commit_push_articles(articles, commit_message=commit_message)
+        finally:
+            _release(handler)
+
+    print(f"Flushing push queue ({len(queue)} queued)...")
+    success, message, flushed = queue.flush(push_intents)
+    print(f"\nPush operation summary:")
+    print(f"Success: {success}")
+    print(f"Intents flushed: {flushed if success else 0}")
+    print(f"Message: {message}")
+
+
+def _parse_since(value: str) -> float | None:
+    """Parses --since as Unix seconds or an ISO date/datetime (local time). Returns None if invalid."""
+    try:
+        if value.replace(".", "", 1).isdigit():
+            return float(value)
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _articles_modified_since(articles_dir: str, since: float) -> list[str]:
+    """Returns the .md filenames in articles_dir modified at or after since, oldest first."""
+    selected = []
+    with os.scandir(articles_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".md") and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if mtime >= since:
+                    selected.append((mtime, entry.name))
+    return [name for _, name in sorted(selected)]
+
+
+def _select_push_articles(args, final_articles_directory: str) -> list[str] | None:
+    """
+    Resolves the articles named with --article_name (repeatable) or selected by --since.
+    Returns [] when neither is given (push everything) and None after printing an error.
+    """
+    article_names = list(args.article_name or [])
+    if args.since:
+        if article_names:
+            print("ERROR: Use either --article_name or --since, not both.")
+            return None
+        since = _parse_since(args.since)
+        if since is None:
+            print(f"ERROR: Invalid --since value '{args.since}'. Use Unix seconds or an ISO date such as 2026-01-31 or 2026-01-31T18:00.")
+            return None
+        article_names = _articles_modified_since(final_articles_directory, since)
+        if not article_names:
+            print(f"INFO: No articles in '{final_articles_directory}' modified since {args.since}. Nothing to push.")
+            return None
+        return article_names
+
+    for article_name in article_names:
+        if ".." in article_name or os.path.sep in article_name or \
+           (os.path.altsep and os.path.altsep in article_name):
+            print(f"ERROR: Invalid article name format '{article_name}'. Provide a plain filename.")
+            return None
+        if not os.path.exists(os.path.join(final_articles_directory, article_name)):
+            print(f"ERROR: Article '{article_name}' not found in '{final_articles_directory}'. Cannot push specific file.")
+            return None
+    return list(dict.fromkeys(article_names)) # Drop repeats, keep order
+
+
+def _article_commit_message(articles_dir: str, article_name: str) -> str:
+    """Commit message for one article, derived from its frontmatter title when it has one."""
+    title = None
+    block = extract_frontmatter_block(read_frontmatter_head(os.path.join(articles_dir, article_name)) or "")
+    if block:
+        try:
+            frontmatter = parse_yaml(block)
+            if isinstance(frontmatter, dict) and frontmatter.get("title"):
+                title = " ".join(str(frontmatter["title"]).split())
+        except Exception:
+            pass # Fall back to the filename-based message
+    if title:
+        return f'feat: Add/update "{title}" ({article_name})'
+    return f"feat: Add/update {article_name} (via CLI)"
+
+
 def handle_push(args):
     """Handles the 'push' command to push articles from FINAL_ARTICLES_DIR to GitHub."""
     repo_url = get_github_repo_url()
@@ -196,42 +678,81 @@ def handle_push(args):
     if not os.path.exists(final_articles_directory):
         print(f"INFO: Final articles directory '{final_articles_directory}' does not exist. Nothing to push.")
         return
-        
-    try:
-        print(f"Initializing GitHub handler for local directory: '{final_articles_directory}', remote: '{repo_url}', branch: '{default_branch}'")
-        handler = GitHubHandler(
+
+    backend = args.git_backend or get_git_backend()
+
+    def build_handler():
+        return GitHubHandler(
             repo_url=repo_url, 
             local_dir=final_articles_directory,
             default_branch=default_branch,
-            default_commit_message=default_commit_msg_from_config # Pass the one from config
+            default_commit_message=default_commit_msg_from_config, # Pass the one from config
+            backend=backend,
+            ssh_control_dir=get_git_ssh_control_dir(),
+            ssh_control_persist=get_git_ssh_control_persist(),
+            ssh_server_alive_interval=get_git_ssh_server_alive_interval(),
+            sparse_path=get_git_sparse_path(),
+            mirrors=get_git_mirror_remotes(),
+            push_timeout=get_git_push_timeout_seconds()
         )
 
+    def make_handler():
+        # Inside the daemon the handler (remote check, cat-file session, SSH connection) survives between pushes
+        return _reuse(("github", repo_url, final_articles_directory, default_branch,
+                       default_commit_msg_from_config, backend), build_handler)
+
+    if args.flush:
+        _flush_push_queue(PushQueue(get_push_queue_dir()), make_handler)
+        return
+
+    article_names = _select_push_articles(args, final_articles_directory)
+    if article_names is None:
+        return
+    if args.message and (args.since or len(article_names) > 1):
+        # --since commits each selected article with a message taken from its title, even if it selects only one
+        print("ERROR: --message applies to a single commit. With --since or several articles, each commit's message is taken from the article's title.")
+        return
+
+    if args.queue:
+        queue = PushQueue(get_push_queue_dir())
+        for article_name in article_names or [None]:
+            queue.enqueue(article_name=article_name, message=args.message)
+        queued = len(queue)
+        print(f"Queued push of {', '.join(article_names) or 'all changed articles'}. {queued} intent(s) pending.")
+        threshold = get_push_queue_flush_threshold()
+        if not threshold or queued < threshold:
+            print("Run 'push --flush' to push them now.")
+            return
+        print(f"Queue reached the flush threshold ({threshold}).")
+        _flush_push_queue(queue, make_handler)
+        return
+        
+    handler = None
+    try:
+        print(f"Initializing GitHub handler for local directory: '{final_articles_directory}', remote: '{repo_url}', branch: '{default_branch}'")
+        handler = make_handler()
+
         # Use args.message if provided by user, otherwise GitHubHandler will use its default.
         user_commit_message = args.message if hasattr(args, 'message') and args.message else None
 
-        if args.article_name:
-            if ".." in args.article_name or os.path.sep in args.article_name or \
-               (os.path.altsep and os.path.altsep in args.article_name):
-                print(f"ERROR: Invalid article name format '{args.article_name}'. Provide a plain filename.")
-                return
-            
-            article_path_to_check = os.path.join(final_articles_directory, args.article_name)
-            if not os.path.exists(article_path_to_check):
-                print(f"ERROR: Article '{args.article_name}' not found in '{final_articles_directory}'. Cannot push specific file.")
-                return
-            
-            print(f"Attempting to push specific article: {args.article_name} from final articles...")
+        if len(article_names) > 1 or (article_names and args.since):
+            print(f"Attempting to push {len(article_names)} articles, one commit each, in a single push...")
+            article_commits = [(name, _article_commit_message(final_articles_directory, name)) for name in article_names]
+            success, message = handler.commit_each_and_push(article_commits)
+        elif article_names:
+            print(f"Attempting to push specific article: {article_names[0]} from final articles...")
             # If user_commit_message is None, GitHubHandler will construct one or use its default.
             # If user_commit_message is provided, it will be used.
             success, message = handler.add_commit_push(
-                article_filename=args.article_name, 
+                article_filename=article_names[0], 
                 commit_message=user_commit_message 
             )
         else:
             print("Attempting to push all new/modified articles in the final articles directory...")
             # If user_commit_message is None, GitHubHandler uses its default_commit_message.
             success, message = handler.add_commit_push(
-                commit_message=user_commit_message
+                commit_message=user_commit_message,
+                full_scan=args.full
             )
 
         print(f"\nPush operation summary:")
@@ -239,13 +760,201 @@ def handle_push(args):
         print(f"Message: {message}")
     except Exception as e:
         print(f"ERROR during GitHub push operation: {e}")
+    finally:
+        if handler is not None:
+            _release(handler)
 
 
-def main_cli():
+def handle_history(args):
+    """Handles the 'history' command to inspect, compact or rotate the chat history log."""
+    history_log = ChatHistoryLog(get_chat_history_file_path())
+
+    if args.rotate:
+        segment_path = history_log.rotate()
+        if segment_path:
+            print(f"SUCCESS: Chat history rotated. Previous records archived to: {segment_path}")
+        else:
+            print(f"INFO: Chat history log '{history_log.log_path}' is empty. Nothing to rotate.")
+        return
+
+    if args.compact is not None:
+        if args.compact < 0:
+            print("ERROR: --compact must be zero or a positive number of records to keep.")
+            return
+        dropped = history_log.compact(args.compact)
+        print(f"SUCCESS: Chat history compacted. Dropped {dropped} records, kept at most {args.compact}.")
+        return
+
+    record_count = sum(1 for _ in history_log.iter_records())
+    print(f"Chat history log: {history_log.log_path}")
+    print(f"Records: {record_count}")
+
+
+def handle_stats(args):
+    """Handles the 'stats' command: token, latency and retry statistics from the chat history log."""
+    if args.last is not None and args.last <= 0:
+        print("ERROR: --last must be a positive number of records.")
+        return
+    history_log = ChatHistoryLog(get_chat_history_file_path())
+    summary = summarize_generations(history_log.iter_records(), model=args.model, last=args.last)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    scope = f"last {args.last} records" if args.last is not None else "all records"
+    if args.model:
+        scope += f", model {args.model}"
+    print(f"Generation stats from {history_log.log_path} ({scope}):")
+    if summary["skipped"]:
+        print(f"  Skipped {summary['skipped']} records written before metrics were recorded.")
+    if not summary["generations"]:
+        print("  No generations with metrics found.")
+        return
+    print(f"  Generations: {summary['generations']} ({summary['errors']} errors, {summary['cached']} cache hits, "
+          f"{summary['streamed']} streamed), {summary['retries']} retries")
+    if summary["output_tokens_per_s"] is not None:
+        print(f"  Output throughput: {summary['output_tokens_per_s']:.1f} tokens/s per request")
+
+    columns = ["count", "mean"] + [f"p{pct}" for pct in PERCENTILES] + ["max"]
+    print(f"  {'Metric':<24}" + "".join(f"{column:>10}" for column in columns))
+    for field, label in METRICS:
+        metric = summary["metrics"].get(field)
+        if metric is None:
+            continue
+        value_format = ">10.0f" if field.endswith("_tokens") else ">10.3f"
+        cells = [f"{metric['count']:>10}"] + [format(metric[column], value_format) for column in columns[1:]]
+        print(f"  {label:<24}" + "".join(cells))
+
+
+def handle_diagnostics(args):
+    """Handles the 'diagnostics' command to report runtime details that affect performance."""
+    import yaml # Already loaded by article_utils; imported here only for its version
+
+    print("Runtime diagnostics:")
+    print(f"  Python: {sys.version.split()[0]} ({sys.executable})")
+    print(f"  PyYAML: {yaml.__version__}")
+    print(f"  YAML loader: {yaml_loader_description()}")
+
+
+def handle_serve(args):
+    """Handles the 'serve' command: runs the daemon in the foreground, or stops a running one."""
+    global _warm_objects, _event_loop
+    socket_path = get_daemon_socket_path()
+
+    if args.stop:
+        try:
+            send_request(socket_path, {"op": "stop"}, timeout=5)
+        except OSError:
+            print(f"INFO: No daemon is listening on '{socket_path}'.")
+            return
+        print(f"SUCCESS: Daemon on '{socket_path}' stopped.")
+        return
+
+    try:
+        server = DaemonServer(socket_path, _run_in_daemon)
+    except (RuntimeError, OSError) as e:
+        print(f"ERROR: Could not start the daemon: {e}")
+        return
+    _warm_objects = {}
+    _event_loop = asyncio.new_event_loop()
+    print(f"Serving on '{socket_path}' (pid {os.getpid()}). Send commands with 'main.py --daemon COMMAND ...'; "
+          f"stop with 'serve --stop' or Ctrl-C. Restart after editing .env.")
+    try:
+        server.serve_until_stopped()
+    finally:
+        warm_objects, _warm_objects = _warm_objects, None
+        for obj in warm_objects.values():
+            if hasattr(obj, "close"):
+                obj.close()
+        event_loop, _event_loop = _event_loop, None
+        event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+        event_loop.close()
+        print("Daemon stopped.")
+
+
+class _ForwardingOutput(io.TextIOBase):
+    """Stand-in for stdout/stderr in the daemon: passes each completed line to write as soon as it is printed."""
+    def __init__(self, write):
+        self._write = write
+        self._pending = ""
+        self._lock = threading.Lock() # Batch commands print from worker threads too
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._pending += text
+            complete, newline, self._pending = self._pending.rpartition("\n")
+            if newline:
+                self._write(complete + newline)
+        return len(text)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, ""
+        if pending:
+            self._write(pending)
+
+
+def _run_in_daemon(argv: list[str], cwd: str | None = None, write=None) -> tuple[int, str]:
+    """
+    Dispatch function of the daemon: runs one CLI command (argv without the program name) in the client's
+    working directory, reusing the warm objects. Returns (exit_code, output not yet passed to write).
+    With write, output is passed to it line by line while the command runs, so the client sees a batch's
+    progress live; without it, everything the command printed is returned.
+    The command runs with the process-wide stdout, stderr and working directory switched over, so the daemon
+    must run one command at a time (DaemonServer does).
+    """
+    output = io.StringIO() if write is None else _ForwardingOutput(write)
+    previous_cwd = os.getcwd()
+    exit_code = 0
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            if cwd:
+                os.chdir(cwd)
+            args = build_parser().parse_args(argv)
+            if args.command == "serve":
+                print("ERROR: 'serve' cannot be sent to the daemon.")
+                exit_code = 2
+            else:
+                args.func(args)
+        except SystemExit as e: # argparse errors and --help
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"\nAn UNEXPECTED error occurred in the daemon: {e}")
+            exit_code = 1
+        finally:
+            os.chdir(previous_cwd)
+    if write is not None:
+        output.flush()
+        return exit_code, ""
+    return exit_code, output.getvalue()
+
+
+def _run_via_daemon(argv: list[str]) -> bool:
+    """Sends the command to the daemon and prints its output. Returns False if no daemon is listening."""
+    socket_path = get_daemon_socket_path()
+    try:
+        exit_code, _ = run_remote(socket_path, argv, on_output=lambda text: print(text, end="", flush=True))
+    except OSError:
+        print(f"INFO: No daemon is listening on '{socket_path}' (start one with 'serve'). Running the command directly.")
+        return False
+    except RuntimeError as e:
+        print(f"ERROR: Daemon request failed: {e}")
+        sys.exit(1)
+    if exit_code:
+        sys.exit(exit_code)
+    return True
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="CLI Tool for Article Automation. Uses AI to generate articles, validates them, and manages them via Git.",
         epilog="Ensure your .env file is configured with API keys, paths (DRAFTS_DIR, etc.), and GitHub SSH URL."
     )
+    parser.add_argument("--daemon", action="store_true", help="Send the command to the daemon started with 'serve' (falls back to running it directly if none is listening).")
     subparsers = parser.add_subparsers(dest="command", help="Available commands", required=True, metavar="COMMAND")
 
     # Generate command
@@ -254,7 +963,13 @@ def main_cli():
         help="Generate a new article, validate frontmatter, and save to drafts or failed.",
         description="Takes a prompt, uses Gemini AI to generate a Markdown article with frontmatter, validates it, and saves to the appropriate directory."
     )
-    generate_parser.add_argument("--prompt", type=str, required=True, help="Prompt for article generation")
+    prompt_source = generate_parser.add_mutually_exclusive_group(required=True)
+    prompt_source.add_argument("--prompt", type=str, help="Prompt for article generation")
+    prompt_source.add_argument("--prompts-file", type=str, metavar="FILE", help="File with one prompt per line; generates all of them as a batch.")
+    generate_parser.add_argument("--concurrency", type=int, default=4, metavar="N", help="Number of concurrent Gemini requests in batch mode (default: 4).")
+    generate_parser.add_argument("--timeout", type=float, metavar="SECONDS", help="Abandon a batch request that takes longer than SECONDS and record it as failed (default: no limit).")
+    generate_parser.add_argument("--stream", action="store_true", help="Stream the response into the draft file and stop early if the frontmatter is invalid.")
+    generate_parser.add_argument("--no-cache", action="store_true", help="Always call the API, bypassing the on-disk response cache.")
     generate_parser.set_defaults(func=handle_generate)
 
     # Review command
@@ -271,30 +986,111 @@ def main_cli():
         help="Status of articles to review (default: draft)."
     )
     review_parser.add_argument("--article_name", type=str, metavar="FILENAME", help="Filename of the article to review.")
+    review_parser.add_argument("--sort", choices=["name", "mtime", "size", "title", "date"], default="name", help="Sort the listing by this field (default: name).")
+    review_parser.add_argument("--reverse", action="store_true", help="Reverse the sort order.")
+    review_parser.add_argument("--limit", type=int, metavar="N", help="Show at most N articles per page (default: all).")
+    review_parser.add_argument("--page", type=int, default=1, metavar="P", help="Page to show when --limit is given (default: 1).")
     review_parser.set_defaults(func=handle_review)
 
     # Finalize command (replaces save)
     finalize_parser = subparsers.add_parser(
         "finalize", 
         help="Finalize a draft article by moving it to the final articles directory after validation.",
-        description="Moves a validated draft article to the final articles directory. Re-validates before moving."
+        description="Moves validated draft articles to the final articles directory. Re-validates before moving; with --all or --glob all selected drafts are validated in parallel and then moved in one pass."
     )
-    finalize_parser.add_argument("--draft_name", type=str, metavar="FILENAME", required=True, help="Filename of the draft article to finalize.")
+    finalize_selection = finalize_parser.add_mutually_exclusive_group(required=True)
+    finalize_selection.add_argument("--draft_name", type=str, metavar="FILENAME", help="Filename of the draft article to finalize.")
+    finalize_selection.add_argument("--all", action="store_true", help="Finalize every valid draft article.")
+    finalize_selection.add_argument("--glob", type=str, metavar="PATTERN", help="Finalize every valid draft whose filename matches PATTERN (e.g. 'article_2026*').")
+    finalize_parser.add_argument("--jobs", "-j", type=int, metavar="N", help="Worker processes for validation with --all/--glob (default: number of CPUs).")
     finalize_parser.set_defaults(func=handle_finalize)
 
+    # Validate command
+    validate_parser = subparsers.add_parser(
+        "validate",
+        help="Re-validate the frontmatter of every article in a status directory.",
+        description="Validates all articles in the drafts, final or failed directory in parallel and prints a summary with throughput and failures."
+    )
+    validate_parser.add_argument(
+        "--status",
+        type=str,
+        choices=['draft', 'final', 'failed'],
+        default='draft',
+        help="Status of articles to validate (default: draft)."
+    )
+    validate_parser.add_argument("--jobs", "-j", type=int, metavar="N", help="Number of worker processes (default: number of CPUs).")
+    validate_parser.add_argument("--failures-only", action="store_true", help="Only print per-file results for invalid articles.")
+    validate_parser.set_defaults(func=handle_validate)
+
     # Push command
     push_parser = subparsers.add_parser(
         "push", 
         help="Push articles from the final articles directory to GitHub.",
         description="Commits and pushes articles from the final articles directory to the configured GitHub repository."
     )
-    push_parser.add_argument("--article_name", type=str, metavar="FILENAME", help="Specific article filename to push (optional; if omitted, pushes all changes in final dir).")
+    push_parser.add_argument("--article_name", type=str, action="append", metavar="FILENAME", help="Specific article filename to push (optional, repeatable; if omitted, pushes all changes in final dir). Several articles get one commit each, sent in a single push.")
+    push_parser.add_argument("--since", type=str, metavar="TIMESTAMP", help="Push every article modified since TIMESTAMP (Unix seconds or ISO date/datetime), one commit per article titled from its frontmatter, in a single push.")
     push_parser.add_argument("--message", "-m", type=str, help="Custom commit message (optional). Overrides default and auto-generated messages.")
+    push_queue_mode = push_parser.add_mutually_exclusive_group()
+    push_queue_mode.add_argument("--queue", action="store_true", help="Queue this push instead of pushing now. Queued pushes are merged into one commit and one push when the queue reaches PUSH_QUEUE_FLUSH_THRESHOLD or on --flush.")
+    push_queue_mode.add_argument("--flush", action="store_true", help="Push all queued articles now as a single commit.")
+    push_parser.add_argument("--full", action="store_true", help="Stage the whole final directory with 'git add .' and rebuild the push manifest, instead of staging only the articles changed since the last push.")
+    push_parser.add_argument("--git-backend", choices=["subprocess", "dulwich"], help="Backend for add/status/commit (default: GIT_BACKEND or 'subprocess'). 'dulwich' runs them in-process; the push itself always uses git.")
     push_parser.set_defaults(func=handle_push)
 
+    # History command
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Show, compact or rotate the chat history log.",
+        description="Shows the number of records in the chat history log. Use --compact or --rotate to keep the log small."
+    )
+    history_actions = history_parser.add_mutually_exclusive_group()
+    history_actions.add_argument("--compact", type=int, metavar="KEEP", help="Keep only the most recent KEEP records.")
+    history_actions.add_argument("--rotate", action="store_true", help="Archive the current log and start a new one.")
+    history_parser.set_defaults(func=handle_history)
+
+    # Stats command
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="Show token counts, latency and retry statistics of past generations.",
+        description="Summarizes the per-generation metrics in the chat history log: prompt and output tokens, latency, time to first byte of streamed runs and rate limit waits, with p50/p90/p99 percentiles."
+    )
+    stats_parser.add_argument("--last", type=int, metavar="N", help="Only consider the most recent N history records.")
+    stats_parser.add_argument("--model", help="Only consider generations by this model.")
+    stats_parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+    stats_parser.set_defaults(func=handle_stats)
+
+    # Diagnostics command
+    diagnostics_parser = subparsers.add_parser(
+        "diagnostics",
+        help="Show runtime details such as the active YAML loader.",
+        description="Prints the Python and PyYAML versions and which YAML loader (libyaml C extension or pure Python) is in use."
+    )
+    diagnostics_parser.set_defaults(func=handle_diagnostics)
+
+    # Serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a local daemon that keeps the model client and git handles warm between commands.",
+        description="Listens on the Unix socket DAEMON_SOCKET. Commands sent with 'main.py --daemon COMMAND ...' run in the daemon, skipping SDK import, model setup and repository checks."
+    )
+    serve_parser.add_argument("--stop", action="store_true", help="Stop the running daemon.")
+    serve_parser.set_defaults(func=handle_serve)
+
+    return parser
+
+
+def main_cli():
+    parser = build_parser()
     args = parser.parse_args()
-    
+
+    if args.daemon and args.command != "serve":
+        if _run_via_daemon([arg for arg in sys.argv[1:] if arg != "--daemon"]):
+            return
+
     if hasattr(args, 'func'):
+        for warning in get_config_warnings():
+            print(f"WARNING: {warning}")
         args.func(args)
     else:
         parser.print_help()
@@ -0,0 +1,132 @@
+import fcntl
+import json
+import os
+import time
+import uuid
+
+
+class PushQueue:
+    """
+    Spool directory of pending push intents, one JSON file per intent.
+    `push --queue` records an intent instead of pushing; flush() hands every pending intent to a
+    push callable in one go, so many queued articles become a single commit and a single push.
+
+    Intent files are written to a temporary name and renamed into place, so a flush never reads a
+    half-written intent. Flushing holds an exclusive, non-blocking flock on the spool's lock file:
+    a second concurrent flush returns immediately instead of pushing the same intents twice.
+    Intents queued while a flush is running are left for the next flush.
+    An intent file that cannot be read, or does not describe a valid push, is moved to the
+    'quarantine' subdirectory by flush() so it cannot fail every later flush.
+    """
+    LOCK_NAME = ".flush.lock"
+    QUARANTINE_DIR = "quarantine"
+
+    def __init__(self, spool_dir: str):
+        self.spool_dir = spool_dir
+
+    def enqueue(self, article_name: str | None = None, message: str | None = None) -> str:
+        """Records a push intent for article_name (None means all changed articles). Returns the intent path."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        # time_ns first so intents sort in the order they were queued
+        intent_name = f"{time.time_ns():020d}_{os.getpid()}_{uuid.uuid4().hex[:8]}.json"
+        intent_path = os.path.join(self.spool_dir, intent_name)
+        tmp_path = f"{intent_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"article": article_name, "message": message, "queued_at": time.time()}, f)
+        os.replace(tmp_path, intent_path)
+        return intent_path
+
+    def _intent_paths(self) -> list[str]:
+        try:
+            with os.scandir(self.spool_dir) as it:
+                return sorted(entry.path for entry in it if entry.name.endswith(".json") and entry.is_file())
+        except FileNotFoundError:
+            return []
+
+    def pending(self) -> list[dict]:
+        """Returns the queued intents, oldest first. Unreadable intent files are skipped."""
+        return [intent for _, intent in self._load(self._intent_paths(), quarantine=False)]
+
+    def __len__(self) -> int:
+        return len(self._intent_paths())
+
+    def _load(self, paths: list[str], quarantine: bool) -> list[tuple[str, dict]]:
+        """Returns (path, intent) for every valid intent. Invalid ones are skipped, or quarantined if requested."""
+        intents = []
+        for path in paths:
+            try:
+                with open(path, 'r') as f:
+                    intent = json.load(f)
+            except FileNotFoundError:
+                continue # Flushed by someone else in the meantime
+            except (OSError, ValueError) as e:
+                problem = f"unreadable: {e}"
+            else:
+                problem = self._intent_problem(intent)
+            if problem is None:
+                intents.append((path, intent))
+            elif quarantine:
+                self._quarantine(path, problem)
+        return intents
+
+    @staticmethod
+    def _intent_problem(intent) -> str | None:
+        """Returns why intent cannot be pushed, or None if it is valid."""
+        if not isinstance(intent, dict):
+            return "not a JSON object"
+        article, message = intent.get("article"), intent.get("message")
+        if article is not None and (not isinstance(article, str) or ".." in article or os.path.isabs(article)):
+            return f"invalid article name {article!r}"
+        if message is not None and not isinstance(message, str):
+            return f"invalid commit message {message!r}"
+        return None
+
+    def _quarantine(self, path: str, problem: str):
+        quarantine_dir = os.path.join(self.spool_dir, self.QUARANTINE_DIR)
+        destination = os.path.join(quarantine_dir, os.path.basename(path))
+        try:
+            os.makedirs(quarantine_dir, exist_ok=True)
+            os.replace(path, destination)
+        except OSError as e:
+            print(f"WARNING: Skipping push intent '{path}' ({problem}); it could not be quarantined: {e}")
+            return
+        print(f"WARNING: Quarantined push intent '{os.path.basename(path)}' ({problem}). Moved to '{destination}'.")
+
+    @staticmethod
+    def coalesce(intents: list[dict]) -> tuple[list[str] | None, str | None]:
+        """
+        Merges intents into (article names, commit message). Article names is None if any intent asked
+        to push all changed articles. The commit message is None when no intent carried a custom one,
+        so the handler's default is used; several distinct custom messages are joined line by line.
+        """
+        push_all = any(not intent.get("article") for intent in intents)
+        articles = sorted({intent["article"] for intent in intents if intent.get("article")})
+        messages = list(dict.fromkeys(intent["message"] for intent in intents if intent.get("message")))
+        return (None if push_all else articles), ("\n".join(messages) if messages else None)
+
+    def flush(self, push_intents) -> tuple[bool, str, int]:
+        """
+        Calls push_intents(intents) -> (success, message) with every pending intent, under the flush lock.
+        On success the flushed intent files are removed; on failure they stay queued.
+        Returns (success, message, number of intents flushed).
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with open(os.path.join(self.spool_dir, self.LOCK_NAME), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False, "Another process is already flushing the push queue.", 0
+            try:
+                loaded = self._load(self._intent_paths(), quarantine=True)
+                if not loaded:
+                    return True, "Push queue is empty. Nothing to push.", 0
+                success, message = push_intents([intent for _, intent in loaded])
+                if success:
+                    for path, _ in loaded:
+                        try:
+                            os.remove(path)
+                        except FileNotFoundError:
+                            pass
+                return success, message, len(loaded)
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
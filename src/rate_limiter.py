@@ -0,0 +1,128 @@
+import asyncio
+import random
+import threading
+import time
+
+# HTTP statuses and google.api_core exception names that mean "try again later" rather than "this request is bad".
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+TRANSIENT_ERROR_NAMES = frozenset({
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "BadGateway", "GatewayTimeout", "DeadlineExceeded", "Aborted",
+})
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    True for quota (429) and server-side (5xx) errors worth retrying. The SDK's exception classes are matched
+    by name and by their HTTP `code`, so google.api_core does not have to be imported to classify them.
+    Timeouts imposed by the caller are not transient: the caller asked to give up.
+    """
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__):
+        return True
+    for attribute in ("code", "status_code"):
+        code = getattr(exc, attribute, None)
+        if isinstance(code, int) and code in TRANSIENT_STATUS_CODES:
+            return True
+    return isinstance(exc, ConnectionError)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate_per_minute, holding at most capacity tokens (default: one second's worth,
+    at least 1). reserve() never blocks: it takes the tokens immediately, letting the level go negative, and
+    returns how long the caller must wait before the reservation is covered. Later callers queue behind it,
+    so concurrent callers are spaced out instead of stampeding when tokens return.
+    """
+    def __init__(self, rate_per_minute: float, capacity: float | None = None, clock=time.monotonic):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.rate = rate_per_minute / 60.0 # Tokens per second
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._level = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """Takes amount tokens. Returns the seconds to wait before using them (0 if available now)."""
+        with self._lock:
+            self._refill()
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / self.rate
+
+    def adjust(self, amount: float):
+        """Takes (positive) or returns (negative) tokens after the fact, e.g. once actual usage is known."""
+        with self._lock:
+            self._refill()
+            self._level = min(self.capacity, self._level - amount)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for the Gemini quota: one bucket for requests per minute and one for tokens per minute.
+    Either limit can be 0 (unlimited). A request's token cost is estimated up front and corrected with
+    record_usage() once the response reports the real count. Tracks the total time callers were made to wait.
+    """
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, clock=time.monotonic):
+        self.request_bucket = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute > 0 else None
+        self.total_wait_seconds = 0.0
+        self.waits = 0 # Number of acquisitions that had to wait
+        self._stats_lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserves one request and tokens. Returns the seconds to wait before sending it."""
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket is not None and tokens > 0:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        if wait > 0:
+            with self._stats_lock:
+                self.total_wait_seconds += wait
+                self.waits += 1
+        return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Blocks until one request with tokens may be sent. Returns the seconds waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Async acquire(): waits on the event loop instead of blocking the thread."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """Corrects the token bucket by the difference between a request's estimated and actual token count."""
+        if self.token_bucket is not None and actual_tokens != estimated_tokens:
+            self.token_bucket.adjust(actual_tokens - estimated_tokens)
+
+
+class RetryPolicy:
+    """
+    Retries transient errors up to max_retries times with exponential backoff and jitter: the delay before
+    retry n (0-based) is drawn uniformly from [cap / 2, cap] with cap = min(max_delay, base_delay * 2**n),
+    so clients that failed together do not retry together.
+    """
+    def __init__(self, max_retries: int = 3, base_delay: float = 2.0, max_delay: float = 60.0, rng=random.random):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng
+
+    def should_retry(self, exc: BaseException, retries_done: int) -> bool:
+        return retries_done < self.max_retries and is_transient_error(exc)
+
+    def delay(self, retries_done: int) -> float:
+        cap = min(self.max_delay, self.base_delay * (2 ** retries_done))
+        return cap / 2 + self._rng() * cap / 2
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    On-disk cache of model responses, one JSON file per entry.
+    Entries are keyed on a SHA-256 of the model name and the full prompt sent to the model,
+    so the same topic on the same date (which produces the same prompt) is only paid for once.
+
+    Eviction:
+    - TTL: entries older than ttl_seconds are treated as misses and removed.
+    - LRU: a hit bumps the entry file's mtime; once more than max_entries are stored,
+      the least recently used entries are removed. The directory is scanned once to count
+      the entries and afterwards only when a put() takes the count over max_entries.
+    """
+    def __init__(self, cache_dir: str, max_entries: int = 500, ttl_seconds: int = 7 * 24 * 3600, validator=None):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Optional callable(text) -> bool. Responses it rejects are never cached,
+        # so a re-run retries them instead of replaying the bad output.
+        self.validator = validator
+        self._entry_count = None # Entries on disk as of the last scan plus those added since; None until scanned
+        self._count_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached response for key, or None on a miss or expired entry."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if self.ttl_seconds and time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self._remove(entry_path)
+            with self._count_lock:
+                if self._entry_count:
+                    self._entry_count -= 1
+            return None
+
+        try:
+            os.utime(entry_path) # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def put(self, key: str, model_name: str, response_text: str) -> bool:
+        """Stores response_text under key. Returns False if the validator rejected it."""
+        if self.validator is not None and not self.validator(response_text):
+            return False
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # A unique temp file per write, so threads and processes storing the same key never share one.
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"model": model_name, "created": time.time(), "response": response_text}, f)
+            is_new = not os.path.exists(entry_path)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._count_added(1 if is_new else 0)
+        return True
+
+    def _count_added(self, added: int):
+        """Updates the entry count and evicts only once it exceeds max_entries."""
+        if not self.max_entries or self.max_entries <= 0:
+            return
+        with self._count_lock:
+            if self._entry_count is None:
+                self._entry_count = len(self._scan_entries())
+            else:
+                self._entry_count += added
+            if self._entry_count > self.max_entries:
+                self._entry_count = self._evict()
+
+    def _scan_entries(self) -> list[tuple[float, str]]:
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self) -> int:
+        """Removes the least recently used entries beyond max_entries. Returns the number of entries left."""
+        entries = self._scan_entries()
+        if len(entries) <= self.max_entries:
+            return len(entries)
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            self._remove(path)
+        return self.max_entries
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
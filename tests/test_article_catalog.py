@@ -0,0 +1,98 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from article_catalog import ArticleCatalog
+from article_utils import validate_article_file
+
+
+class TestArticleCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.articles_dir = os.path.join(self.test_dir, "drafts")
+        os.makedirs(self.articles_dir)
+        self.parsed_paths = []
+
+        def recording_parser(article_path):
+            self.parsed_paths.append(os.path.basename(article_path))
+            return validate_article_file(article_path)
+
+        self.catalog = ArticleCatalog(os.path.join(self.test_dir, "catalog.sqlite3"), frontmatter_parser=recording_parser)
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.test_dir)
+
+    def write_article(self, filename, title, date="2024-01-01"):
+        with open(os.path.join(self.articles_dir, filename), 'w') as f:
+            f.write(f'---\ntitle: "{title}"\ndescription: "D"\nexcerpt: "E"\ncategories: ["Tech"]\n'
+                    f'tags: ["a", "b"]\ndate: "{date}"\n---\nBody\n')
+
+    def test_refresh_indexes_frontmatter(self):
+        self.write_article("one.md", "First", "2024-01-02")
+        with open(os.path.join(self.articles_dir, "notes.txt"), 'w') as f:
+            f.write("not an article")
+
+        counts = self.catalog.refresh("draft", self.articles_dir)
+
+        self.assertEqual(counts["added"], 1)
+        [article] = self.catalog.query("draft")
+        self.assertEqual(article["filename"], "one.md")
+        self.assertEqual(article["title"], "First")
+        self.assertEqual(article["date"], "2024-01-02")
+        self.assertEqual(article["tags"], ["a", "b"])
+        self.assertEqual(article["categories"], ["Tech"])
+        self.assertEqual(article["is_valid"], 1)
+
+    def test_refresh_only_reparses_changed_files(self):
+        self.write_article("one.md", "First")
+        self.write_article("two.md", "Second")
+        self.catalog.refresh("draft", self.articles_dir)
+        self.parsed_paths.clear()
+
+        self.write_article("two.md", "Second, revised and longer")
+        os.remove(os.path.join(self.articles_dir, "one.md"))
+        counts = self.catalog.refresh("draft", self.articles_dir)
+
+        self.assertEqual(self.parsed_paths, ["two.md"])
+        self.assertEqual(counts, {"added": 0, "updated": 1, "removed": 1, "unchanged": 0})
+        self.assertEqual([a["title"] for a in self.catalog.query("draft")], ["Second, revised and longer"])
+
+    def test_unchanged_refresh_parses_nothing(self):
+        self.write_article("one.md", "First")
+        self.catalog.refresh("draft", self.articles_dir)
+        self.parsed_paths.clear()
+
+        counts = self.catalog.refresh("draft", self.articles_dir)
+        self.assertEqual(self.parsed_paths, [])
+        self.assertEqual(counts["unchanged"], 1)
+
+    def test_query_sort_and_page(self):
+        for index, title in enumerate(["Charlie", "Alpha", "Bravo"]):
+            self.write_article(f"article_{index}.md", title, f"2024-01-0{index + 1}")
+        self.catalog.refresh("draft", self.articles_dir)
+
+        self.assertEqual([a["title"] for a in self.catalog.query("draft", sort="title")], ["Alpha", "Bravo", "Charlie"])
+        self.assertEqual([a["date"] for a in self.catalog.query("draft", sort="date", descending=True, limit=2)],
+                         ["2024-01-03", "2024-01-02"])
+        self.assertEqual([a["filename"] for a in self.catalog.query("draft", limit=2, offset=2)], ["article_2.md"])
+        self.assertEqual(self.catalog.count("draft"), 3)
+
+    def test_statuses_are_separate(self):
+        self.write_article("one.md", "First")
+        self.catalog.refresh("draft", self.articles_dir)
+        self.assertEqual(self.catalog.count("final"), 0)
+
+    def test_invalid_sort_key(self):
+        with self.assertRaises(ValueError):
+            self.catalog.query("draft", sort="bogus")
+
+
+if __name__ == '__main__':
+    unittest.main()
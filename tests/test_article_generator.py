@@ -1,15 +1,20 @@
 import unittest
+import asyncio
 from unittest.mock import patch, MagicMock, mock_open
 import os
 import json 
 import sys
 import tempfile # For managing temp files for chat history
+import shutil
+import threading
 import datetime # Added for checking date in prompt
 
 # Add src directory to sys.path to allow direct import of modules from src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from article_generator import ArticleGenerator
+from article_generator import ArticleGenerator, ChatHistoryLog
+from response_cache import ResponseCache
+from rate_limiter import RateLimiter, RetryPolicy
 
 class TestArticleGenerator(unittest.TestCase):
 
@@ -18,9 +23,16 @@ class TestArticleGenerator(unittest.TestCase):
         self.temp_chat_file_path = self.temp_chat_file_obj.name
         self.temp_chat_file_obj.close()
 
+        self.temp_chat_log_path = os.path.splitext(self.temp_chat_file_path)[0] + ".jsonl"
+
     def tearDown(self):
-        if os.path.exists(self.temp_chat_file_path):
-            os.remove(self.temp_chat_file_path)
+        for path in (self.temp_chat_file_path, self.temp_chat_log_path, self.temp_chat_file_path + ".migrated"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_log_records(self):
+        with open(self.temp_chat_log_path, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
 
     @patch('article_generator.genai') 
     def test_init_with_api_key_success(self, mock_genai_module):
@@ -63,6 +75,7 @@ class TestArticleGenerator(unittest.TestCase):
         mock_response = MagicMock()
         mock_response.text = "Mocked Gemini Response with Frontmatter"
         mock_response.parts = [MagicMock(text=mock_response.text)]
+        mock_response.usage_metadata = MagicMock(prompt_token_count=120, candidates_token_count=900, total_token_count=1020)
         mock_model_instance.generate_content.return_value = mock_response
         mock_genai_module.GenerativeModel.return_value = mock_model_instance
 
@@ -81,11 +94,13 @@ class TestArticleGenerator(unittest.TestCase):
         self.assertIn(f"date: Set this to {current_date_str}", generated_prompt_str)
 
         self.assertEqual(len(generator.chat_history), 1)
-        self.assertEqual(generator.chat_history[0], {"user": topic_prompt, "ai": "Mocked Gemini Response with Frontmatter"})
-        
-        with open(self.temp_chat_file_path, 'r') as f:
-            saved_history = json.load(f)
-        self.assertEqual(saved_history, [{"user": topic_prompt, "ai": "Mocked Gemini Response with Frontmatter"}])
+        record = generator.chat_history[0]
+        latency = record.pop("latency_s")
+        self.assertGreaterEqual(latency, 0)
+        self.assertEqual(record, {"user": topic_prompt, "ai": "Mocked Gemini Response with Frontmatter",
+                                  "model": ArticleGenerator.MODEL_NAME, "prompt_tokens": 120, "output_tokens": 900})
+
+        self.assertEqual(self.read_log_records(), [dict(record, latency_s=latency)])
 
     @patch('article_generator.genai')
     def test_generate_article_success_with_parts(self, mock_genai_module):
@@ -109,7 +124,9 @@ class TestArticleGenerator(unittest.TestCase):
         self.assertIn(f'topic: "{topic_prompt}"', generated_prompt_str)
         current_date_str = datetime.datetime.now().strftime('%Y-%m-%d')
         self.assertIn(f"date: Set this to {current_date_str}", generated_prompt_str)
-        self.assertEqual(generator.chat_history[-1], {"user": topic_prompt, "ai": "Part 1. Part 2."})
+        record = generator.chat_history[-1]
+        self.assertEqual((record["user"], record["ai"], record["model"]), (topic_prompt, "Part 1. Part 2.", ArticleGenerator.MODEL_NAME))
+        self.assertNotIn("prompt_tokens", record) # No usage metadata reported
 
     @patch('article_generator.genai')
     def test_generate_article_api_error(self, mock_genai_module):
@@ -132,6 +149,232 @@ class TestArticleGenerator(unittest.TestCase):
         self.assertEqual(len(generator.chat_history), 1)
         self.assertEqual(generator.chat_history[0], {"user": prompt, "ai": expected_error_msg})
 
+    @patch('article_generator.genai')
+    def test_generate_article_uses_response_cache(self, mock_genai_module):
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.return_value = MagicMock(text="Cached-worthy response")
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     response_cache=ResponseCache(cache_dir))
+        first = generator.generate_article("Same topic")
+        second = generator.generate_article("Same topic")
+
+        self.assertEqual(first, "Cached-worthy response")
+        self.assertEqual(second, "Cached-worthy response")
+        mock_model_instance.generate_content.assert_called_once()
+        self.assertEqual(len(generator.chat_history), 2)
+
+    @patch('article_generator.genai')
+    def test_generate_article_does_not_cache_errors(self, mock_genai_module):
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.side_effect = Exception("Simulated API Error")
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     response_cache=ResponseCache(cache_dir))
+        generator.generate_article("Flaky topic")
+        generator.generate_article("Flaky topic")
+
+        self.assertEqual(mock_model_instance.generate_content.call_count, 2)
+
+    @patch('article_generator.genai')
+    def test_stream_article_yields_chunks(self, mock_genai_module):
+        mock_model_instance = MagicMock()
+        usage = MagicMock(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        mock_model_instance.generate_content.return_value = iter([MagicMock(text="---\n"),
+                                                                  MagicMock(text="title: x\n", usage_metadata=usage)])
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key")
+        chunks = list(generator.stream_article("Streamed topic"))
+
+        self.assertEqual(chunks, ["---\n", "title: x\n"])
+        _, kwargs = mock_model_instance.generate_content.call_args
+        self.assertTrue(kwargs["stream"])
+        record = self.read_log_records()[-1]
+        self.assertEqual(record["user"], "Streamed topic")
+        self.assertEqual(record["received_chars"], len("---\ntitle: x\n"))
+        self.assertFalse(record["stopped_early"])
+        self.assertEqual(record["model"], ArticleGenerator.MODEL_NAME)
+        self.assertLessEqual(record["ttfb_s"], record["latency_s"])
+        self.assertEqual((record["prompt_tokens"], record["output_tokens"]), (10, 5))
+
+    @patch('article_generator.genai')
+    def test_stream_article_reports_limiter_wait_and_corrects_the_estimate(self, mock_genai_module):
+        mock_model_instance = MagicMock()
+        usage = MagicMock(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        mock_model_instance.generate_content.return_value = iter([MagicMock(text="---\n"),
+                                                                  MagicMock(text="title: x\n", usage_metadata=usage)])
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        limiter = MagicMock()
+        limiter.acquire.return_value = 1.5
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     rate_limiter=limiter)
+
+        list(generator.stream_article("Streamed topic"))
+
+        estimated_tokens = limiter.acquire.call_args.args[0]
+        limiter.record_usage.assert_called_once_with(estimated_tokens, 15)
+        self.assertEqual(self.read_log_records()[-1]["rate_limit_wait_s"], 1.5)
+        self.assertEqual(generator.total_rate_limit_wait_seconds, 1.5)
+
+    @patch('article_generator.genai')
+    def test_stream_article_closed_early(self, mock_genai_module):
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.return_value = iter([MagicMock(text="a"), MagicMock(text="b")])
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key")
+        chunks = generator.stream_article("Rejected topic")
+        self.assertEqual(next(chunks), "a")
+        chunks.close()
+
+        self.assertTrue(self.read_log_records()[-1]["stopped_early"])
+
+    def test_stream_article_model_not_initialized(self):
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key=None)
+        with self.assertRaises(RuntimeError):
+            next(generator.stream_article("No model"))
+
+    def make_async_generator(self, mock_genai_module, delays: dict):
+        """Generator whose stub model answers prompt containing key after delays[key] seconds (None: never)."""
+        self.in_flight = self.max_in_flight = 0
+
+        async def generate_content_async(prompt):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                topic = next(key for key in delays if key in prompt)
+                await asyncio.sleep(delays[topic] if delays[topic] is not None else 3600)
+                if topic.startswith("fail"):
+                    raise RuntimeError("quota exceeded")
+                return MagicMock(text=f"Article about {topic}")
+            finally:
+                self.in_flight -= 1
+
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content_async.side_effect = generate_content_async
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        return ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key")
+
+    @patch('article_generator.genai')
+    def test_agenerate_many_limits_concurrency_and_keeps_order(self, mock_genai_module):
+        delays = {f"topic {index}": 0.01 * (10 - index) for index in range(10)}
+        delays["fail topic"] = 0
+        delays["slow topic"] = None
+        generator = self.make_async_generator(mock_genai_module, delays)
+        finished = []
+
+        prompts = list(delays)
+        results = asyncio.run(generator.agenerate_many(prompts, concurrency=3, timeout=0.3,
+                                                       on_result=lambda position, prompt, text: finished.append(position)))
+
+        self.assertEqual(results[:10], [f"Article about topic {index}" for index in range(10)])
+        self.assertIn("quota exceeded", results[10])
+        self.assertIn("timed out after 0.3 seconds", results[11])
+        self.assertEqual(self.max_in_flight, 3)
+        self.assertEqual(sorted(finished), list(range(12)))
+        self.assertNotEqual(finished, list(range(12))) # Saved as they finished, not in prompt order
+        self.assertEqual(len(self.read_log_records()), 12)
+
+    @patch('article_generator.genai')
+    def test_agenerate_many_cancellation_cancels_requests(self, mock_genai_module):
+        generator = self.make_async_generator(mock_genai_module, {"never a": None, "never b": None})
+
+        async def run_and_cancel():
+            task = asyncio.create_task(generator.agenerate_many(["never a", "never b"], concurrency=2))
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.in_flight, 2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_and_cancel())
+        self.assertEqual(self.in_flight, 0)
+        self.assertFalse(os.path.exists(self.temp_chat_log_path)) # Cancelled requests are not recorded
+
+    @patch('article_generator.genai')
+    def test_agenerate_article_uses_response_cache(self, mock_genai_module):
+        generator = self.make_async_generator(mock_genai_module, {"cached": 0})
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        generator.response_cache = ResponseCache(cache_dir)
+
+        first = asyncio.run(generator.agenerate_article("cached"))
+        second = asyncio.run(generator.agenerate_article("cached"))
+
+        self.assertEqual(first, second)
+        mock_genai_module.GenerativeModel.return_value.generate_content_async.assert_called_once()
+
+    @patch('article_generator.genai')
+    def test_transient_errors_are_retried_and_recorded(self, mock_genai_module):
+        class ResourceExhausted(Exception):
+            code = 429
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.side_effect = [ResourceExhausted("429 quota"), ResourceExhausted("429 quota"),
+                                                            MagicMock(text="Article after retries")]
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        limiter = RateLimiter(requests_per_minute=60) # One request per second
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     rate_limiter=limiter, retry_policy=RetryPolicy(max_retries=3, base_delay=0.001))
+
+        with patch('article_generator.time.sleep') as mock_sleep:
+            self.assertEqual(generator.generate_article("Busy topic"), "Article after retries")
+        self.assertEqual(mock_sleep.call_count, 4) # Before each retry: the backoff, then the limiter's wait
+        record = self.read_log_records()[-1]
+        self.assertEqual(record["retries"], 2)
+        self.assertAlmostEqual(record["rate_limit_wait_s"], 3.0, places=1) # Waits of 1s and 2s (sleeps are mocked)
+        self.assertEqual(generator.total_retries, 2)
+
+        mock_model_instance.generate_content.side_effect = ValueError("Prompt blocked")
+        with patch('article_generator.time.sleep'):
+            self.assertIn("Prompt blocked", generator.generate_article("Blocked topic"))
+        self.assertEqual(self.read_log_records()[-1]["retries"], 0) # Not transient: no retry
+
+    @patch('article_generator.genai')
+    def test_agenerate_gives_up_after_max_retries(self, mock_genai_module):
+        class ServiceUnavailable(Exception):
+            pass
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content_async.side_effect = ServiceUnavailable("503 overloaded")
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     retry_policy=RetryPolicy(max_retries=2, base_delay=0.001))
+
+        result = asyncio.run(generator.agenerate_article("Overloaded topic"))
+
+        self.assertIn("503 overloaded (gave up after 2 retries)", result)
+        self.assertEqual(mock_model_instance.generate_content_async.call_count, 3)
+
+    @patch('article_generator.genai')
+    def test_retry_backoff_does_not_hold_a_concurrency_slot(self, mock_genai_module):
+        class ServiceUnavailable(Exception):
+            pass
+        attempts = []
+
+        async def generate_content_async(prompt):
+            topic = "busy" if "busy" in prompt else "calm"
+            attempts.append(topic)
+            if attempts == ["busy"]:
+                raise ServiceUnavailable("503 overloaded")
+            return MagicMock(text=f"Article about {topic}")
+
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content_async.side_effect = generate_content_async
+        mock_genai_module.GenerativeModel.return_value = mock_model_instance
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key="test_key",
+                                     retry_policy=RetryPolicy(max_retries=1, base_delay=0.1, rng=lambda: 1.0))
+
+        results = asyncio.run(generator.agenerate_many(["busy topic", "calm topic"], concurrency=1))
+
+        self.assertEqual(results, ["Article about busy", "Article about calm"])
+        self.assertEqual(attempts, ["busy", "calm", "busy"]) # The calm request ran while the busy one backed off
+
     def test_load_chat_history_non_existent(self):
         if os.path.exists(self.temp_chat_file_path): os.remove(self.temp_chat_file_path)
         generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key=None)
@@ -155,5 +398,79 @@ class TestArticleGenerator(unittest.TestCase):
         new_generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key=None)
         self.assertEqual(new_generator.chat_history, sample_history)
 
+    def test_generation_appends_without_loading_history(self):
+        with open(self.temp_chat_log_path, 'w') as f:
+            f.write(json.dumps({"user": "old", "ai": "old reply"}) + "\n")
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key=None)
+        with patch.object(generator.history_log, 'load') as mock_load:
+            generator.generate_article("new prompt")
+            mock_load.assert_not_called()
+        self.assertEqual(len(self.read_log_records()), 2)
+        self.assertEqual(generator.chat_history[-1]["user"], "new prompt")
+
+    def test_legacy_json_history_is_migrated(self):
+        legacy_history = [{"user": "p1", "ai": "r1"}, {"user": "p2", "ai": "r2"}]
+        with open(self.temp_chat_file_path, 'w') as f:
+            json.dump(legacy_history, f, indent=4)
+
+        generator = ArticleGenerator(chat_history_file=self.temp_chat_file_path, gemini_api_key=None)
+        self.assertEqual(generator.chat_history, legacy_history)
+        self.assertEqual(self.read_log_records(), legacy_history)
+        self.assertFalse(os.path.exists(self.temp_chat_file_path))
+        self.assertTrue(os.path.exists(self.temp_chat_file_path + ".migrated"))
+
+    def test_log_skips_torn_last_line(self):
+        with open(self.temp_chat_log_path, 'w') as f:
+            f.write(json.dumps({"user": "p1", "ai": "r1"}) + "\n" + '{"user": "p2", "ai"')
+        self.assertEqual(ChatHistoryLog(self.temp_chat_log_path).load(), [{"user": "p1", "ai": "r1"}])
+
+
+class TestChatHistoryLog(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.log = ChatHistoryLog(os.path.join(self.test_dir, "history.jsonl"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_append_and_load(self):
+        self.log.append({"user": "p1", "ai": "r1"})
+        self.log.append({"user": "p2", "ai": "r2"})
+        self.assertEqual(self.log.load(), [{"user": "p1", "ai": "r1"}, {"user": "p2", "ai": "r2"}])
+
+    def test_compact_keeps_most_recent(self):
+        for i in range(5):
+            self.log.append({"user": f"p{i}", "ai": f"r{i}"})
+        dropped = self.log.compact(keep_last=2)
+        self.assertEqual(dropped, 3)
+        self.assertEqual([r["user"] for r in self.log.load()], ["p3", "p4"])
+
+    def test_append_from_another_process_waits_for_compaction(self):
+        for i in range(3):
+            self.log.append({"user": f"p{i}", "ai": f"r{i}"})
+        # A second instance shares only the flock with self.log, like a log opened by another process
+        other = ChatHistoryLog(self.log.log_path)
+        appender = threading.Thread(target=other.append, args=({"user": "late", "ai": "r"},))
+        write_records = self.log._write_records
+
+        def write_while_other_appends(records):
+            appender.start()
+            appender.join(0.2)
+            self.assertTrue(appender.is_alive()) # Blocked until the compacted log is in place
+            write_records(records)
+
+        with patch.object(self.log, '_write_records', side_effect=write_while_other_appends):
+            self.assertEqual(self.log.compact(keep_last=1), 2)
+        appender.join(5)
+        self.assertEqual([r["user"] for r in self.log.load()], ["p2", "late"])
+
+    def test_rotate_starts_new_segment(self):
+        self.log.append({"user": "p1", "ai": "r1"})
+        segment_path = self.log.rotate()
+        self.assertTrue(os.path.exists(segment_path))
+        self.assertEqual(self.log.load(), [])
+        self.assertIsNone(self.log.rotate()) # Nothing left to rotate
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,13 +4,21 @@ import sys
 import tempfile
 import shutil
 import datetime
+import io
+import errno
+from unittest.mock import patch
 
 import yaml # For TestValidateFrontmatter
 
 # Add src directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from article_utils import save_article, load_article, list_articles, validate_frontmatter
+from article_utils import (
+    save_article, load_article, list_articles, validate_frontmatter, consume_article_stream,
+    read_frontmatter_head, validate_article_file, validate_article_files, parse_yaml,
+    atomic_write_text, move_article, GroupCommit, remove_stale_temp_files
+)
+import article_utils
 
 class TestArticleUtils(unittest.TestCase):
 
@@ -348,5 +356,208 @@ Content
         self.assertIn("Not all items in 'tags' are non-empty strings", error)
 
 
+class TestYamlLoaderSelection(unittest.TestCase):
+    def test_prefers_libyaml_loader_when_available(self):
+        if not hasattr(yaml, "CSafeLoader"):
+            self.skipTest("PyYAML built without libyaml")
+        self.assertIs(article_utils._select_yaml_loader(), yaml.CSafeLoader)
+        self.assertIn("libyaml", article_utils.yaml_loader_description())
+
+    def test_falls_back_to_pure_python_loader(self):
+        class YamlWithoutLibyaml:
+            SafeLoader = yaml.SafeLoader
+        with patch('article_utils.yaml', YamlWithoutLibyaml):
+            self.assertIs(article_utils._select_yaml_loader(), yaml.SafeLoader)
+
+    def test_loaders_agree_on_frontmatter(self):
+        document = 'title: "T"\ntags: ["a", "b"]\ndate: "2024-01-01"\n'
+        self.assertEqual(parse_yaml(document), parse_yaml(document, loader=yaml.SafeLoader))
+
+
+class TestHeaderOnlyValidation(unittest.TestCase):
+    HEADER = """---
+title: "Header Only"
+description: "Desc."
+excerpt: "Exc."
+categories: ["Tech"]
+tags: ["python"]
+date: "2023-10-27"
+---
+"""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write(self, filename, content):
+        path = os.path.join(self.test_dir, filename)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_head_stops_at_closing_delimiter(self):
+        path = self.write("big.md", self.HEADER + "Body line that should never be read.\n" * 10000)
+        self.assertEqual(read_frontmatter_head(path), self.HEADER)
+
+    def test_head_bounded_without_closing_delimiter(self):
+        path = self.write("unterminated.md", "---\ntitle: x\n" + "no closing delimiter\n" * 10000)
+        head = read_frontmatter_head(path, max_chars=1024)
+        self.assertLess(len(head), 2048)
+
+    def test_validate_article_file_matches_full_validation(self):
+        article = self.HEADER + "# Body\n" + "Paragraph.\n" * 1000
+        path = self.write("article.md", article)
+        self.assertEqual(validate_article_file(path), validate_frontmatter(article))
+
+    def test_validate_article_file_invalid(self):
+        path = self.write("invalid.md", "---\ntitle: only\n---\nBody\n")
+        is_valid, data, error = validate_article_file(path)
+        self.assertFalse(is_valid)
+        self.assertIsNone(data)
+        self.assertIn("Missing required field", error)
+
+    def test_validate_article_files_batch(self):
+        good = self.write("good.md", self.HEADER + "Body\n")
+        bad = self.write("bad.md", "no frontmatter")
+        results = validate_article_files([good, bad])
+        self.assertEqual([(path, is_valid) for path, is_valid, _ in results], [(good, True), (bad, False)])
+        self.assertIsNone(results[0][2])
+        self.assertIn("delimiters", results[1][2])
+
+    def test_validate_article_file_not_found(self):
+        is_valid, data, error = validate_article_file(os.path.join(self.test_dir, "missing.md"))
+        self.assertFalse(is_valid)
+        self.assertIn("not found", error)
+
+    def test_unreadable_files_are_reported_not_raised(self):
+        undecodable = os.path.join(self.test_dir, "latin1.md")
+        with open(undecodable, 'wb') as f:
+            f.write(b"---\ntitle: caf\xe9\n---\n")
+        directory = os.path.join(self.test_dir, "directory.md")
+        os.mkdir(directory)
+        good = self.write("good.md", self.HEADER + "Body\n")
+        results = validate_article_files([undecodable, directory, good])
+        self.assertEqual([is_valid for _, is_valid, _ in results], [False, False, True])
+        self.assertIn("Could not read", results[0][2])
+        self.assertIn("Could not read", results[1][2])
+
+
+class TestConsumeArticleStream(unittest.TestCase):
+    VALID_HEADER = """---
+title: "Streamed Title"
+description: "Desc."
+excerpt: "Exc."
+categories: ["Tech"]
+tags: ["python"]
+date: "2023-10-27"
+---
+"""
+
+    @staticmethod
+    def split_into_chunks(text, size):
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def test_valid_stream_is_written_to_file(self):
+        article = self.VALID_HEADER + "# Body\n" + "Paragraph.\n" * 50
+        out_file = io.StringIO()
+        is_valid, data, error, head_text = consume_article_stream(iter(self.split_into_chunks(article, 7)), out_file)
+
+        self.assertTrue(is_valid, error)
+        self.assertEqual(data["title"], "Streamed Title")
+        self.assertEqual(out_file.getvalue(), article)
+        self.assertLess(len(head_text), len(article)) # Body was not buffered
+
+    def test_invalid_frontmatter_stops_early(self):
+        article = "---\ntitle: \"Only a title\"\n---\n" + "Body chunk.\n" * 100
+        chunks = iter(self.split_into_chunks(article, 10))
+        out_file = io.StringIO()
+        is_valid, data, error, head_text = consume_article_stream(chunks, out_file)
+
+        self.assertFalse(is_valid)
+        self.assertIsNone(data)
+        self.assertIn("Missing required field", error)
+        self.assertEqual(out_file.getvalue(), "") # Nothing written for a rejected article
+        self.assertGreater(len(list(chunks)), 0) # Remaining chunks were never consumed
+
+    def test_stream_without_closing_delimiter(self):
+        out_file = io.StringIO()
+        is_valid, _, error, head_text = consume_article_stream(iter(["---\ntitle: x\n", "no end"]), out_file)
+        self.assertFalse(is_valid)
+        self.assertIn("delimiters", error)
+        self.assertEqual(head_text, "---\ntitle: x\nno end")
+
+
+class TestAtomicWrites(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_failed_replace_keeps_old_content_and_no_temp_file(self):
+        path = os.path.join(self.test_dir, "article.md")
+        atomic_write_text(path, "old")
+        with patch('article_utils.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                atomic_write_text(path, "new")
+        with open(path) as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.test_dir), ["article.md"])
+
+    def test_group_commit_publishes_each_write_and_syncs_once_per_batch(self):
+        with patch('article_utils.os.fsync') as mock_fsync, patch('article_utils.os.sync', create=True) as mock_sync:
+            with GroupCommit() as group_commit:
+                for index in range(5):
+                    save_article(f"article {index}", self.test_dir, f"a{index}.md", group_commit=group_commit)
+                    self.assertIn(f"a{index}.md", list_articles(self.test_dir)) # In place at once
+                mock_fsync.assert_not_called() # Nothing synced per article
+                mock_sync.assert_not_called()
+            mock_sync.assert_called_once() # One data sync for the batch
+            self.assertEqual(mock_fsync.call_count, 1) # Plus the directory, once
+        self.assertEqual(sorted(list_articles(self.test_dir)), [f"a{index}.md" for index in range(5)])
+        self.assertEqual(len(os.listdir(self.test_dir)), 5) # No temporary files left
+
+    def test_group_commit_syncs_directories_every_max_pending(self):
+        group_commit = GroupCommit(max_pending=2)
+        with patch('article_utils.fsync_directory') as mock_fsync_directory:
+            for index in range(3):
+                save_article("x", self.test_dir, f"a{index}.md", group_commit=group_commit)
+            self.assertEqual(mock_fsync_directory.call_count, 1)
+            group_commit.commit()
+            self.assertEqual(mock_fsync_directory.call_count, 2)
+        self.assertEqual(sorted(list_articles(self.test_dir)), ["a0.md", "a1.md", "a2.md"])
+
+    def test_remove_stale_temp_files_keeps_those_of_running_writers(self):
+        dead_pid = 2 ** 22 + 1 # Above the kernel's pid limit, so never running
+        stale = os.path.join(self.test_dir, f".a.md.{dead_pid}.140000.tmp")
+        live = os.path.join(self.test_dir, f".b.md.{os.getpid()}.140000.tmp")
+        for path in (stale, live, os.path.join(self.test_dir, "c.md"), os.path.join(self.test_dir, ".notes.tmp")):
+            with open(path, 'w') as f:
+                f.write("x")
+        self.assertEqual(remove_stale_temp_files(self.test_dir), 1)
+        self.assertEqual(sorted(os.listdir(self.test_dir)), [os.path.basename(live), ".notes.tmp", "c.md"])
+        self.assertEqual(remove_stale_temp_files(os.path.join(self.test_dir, "missing")), 0)
+
+    def test_move_across_filesystems_copies_then_removes(self):
+        source_dir, destination_dir = os.path.join(self.test_dir, "drafts"), os.path.join(self.test_dir, "final")
+        source = save_article("draft", source_dir, "a.md")
+        destination = os.path.join(destination_dir, "a.md")
+        os.makedirs(destination_dir)
+        real_replace = os.replace
+        def replace(src, dst):
+            if src == source:
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return real_replace(src, dst)
+        with patch('article_utils.os.replace', side_effect=replace):
+            move_article(source, destination)
+        self.assertFalse(os.path.exists(source))
+        with open(destination) as f:
+            self.assertEqual(f.read(), "draft")
+        self.assertEqual(os.listdir(destination_dir), ["a.md"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -11,11 +11,16 @@ from config import (
     get_openai_api_key, get_github_token, get_huggingface_api_key, get_gemini_api_key,
     get_drafts_dir, get_final_articles_dir, get_failed_validation_dir,
     get_chat_history_file_path, get_github_repo_url, APP_ROOT,
-    get_git_default_branch, get_git_default_commit_message # Added
+    get_git_default_branch, get_git_default_commit_message, # Added
+    get_settings, reload_settings, get_git_mirror_remotes, get_config_warnings
 )
 
 class TestConfig(unittest.TestCase):
 
+    def setUp(self):
+        # Settings are memoized per process; re-resolve them after each test's environment patches are undone.
+        self.addCleanup(reload_settings)
+
     def common_path_test_logic(self, getter_func, env_var_name, default_relative_path, is_file_path=False):
         # --- Test with environment variable set ---
         custom_path_from_env = "my_custom_test_dir"
@@ -29,6 +34,7 @@ class TestConfig(unittest.TestCase):
             expected_makedirs_path = expected_resolved_custom_path
 
         with patch.dict(os.environ, {env_var_name: custom_path_from_env}, clear=True):
+            reload_settings()
             with patch('os.makedirs') as mock_mkdirs:
                 returned_path = getter_func()
                 self.assertEqual(returned_path, expected_resolved_custom_path)
@@ -52,8 +58,9 @@ class TestConfig(unittest.TestCase):
             with patch('os.makedirs') as mock_mkdirs_abs:
                 # Mock os.path.isabs to correctly identify this path as absolute
                 with patch('os.path.isabs', return_value=True) as mock_isabs:
+                    reload_settings()
                     returned_path_abs = getter_func()
-                    mock_isabs.assert_called_with(abs_custom_path) # Verify isabs was checked
+                    mock_isabs.assert_any_call(abs_custom_path) # Verify isabs was checked
                     self.assertEqual(returned_path_abs, abs_custom_path)
                     mock_mkdirs_abs.assert_called_once_with(expected_makedirs_path_abs, exist_ok=True)
         
@@ -65,6 +72,7 @@ class TestConfig(unittest.TestCase):
             expected_default_makedirs_path = expected_default_resolved_path
 
         with patch.dict(os.environ, {}, clear=True): # Ensure env var is not set
+            reload_settings()
             with patch('os.makedirs') as mock_mkdirs_default:
                 returned_path_default = getter_func()
                 self.assertEqual(returned_path_default, expected_default_resolved_path)
@@ -80,7 +88,7 @@ class TestConfig(unittest.TestCase):
         self.common_path_test_logic(get_failed_validation_dir, "FAILED_VALIDATION_DIR", "data/failed_validation")
 
     def test_get_chat_history_file_path(self):
-        self.common_path_test_logic(get_chat_history_file_path, "CHAT_HISTORY_FILE", "data/chat_history.json", is_file_path=True)
+        self.common_path_test_logic(get_chat_history_file_path, "CHAT_HISTORY_FILE", "data/chat_history.jsonl", is_file_path=True)
 
 
     # --- Tests for API keys and GitHub URL (can remain similar) ---
@@ -92,6 +100,7 @@ class TestConfig(unittest.TestCase):
         "GITHUB_REPO_URL": "custom_repo_url"
     })
     def test_get_api_and_url_values_from_env(self): # Renamed for clarity
+        reload_settings()
         self.assertEqual(get_openai_api_key(), "test_openai_key")
         self.assertEqual(get_github_token(), "test_github_token")
         self.assertEqual(get_huggingface_api_key(), "test_hf_key")
@@ -100,6 +109,7 @@ class TestConfig(unittest.TestCase):
 
     @patch.dict(os.environ, {}, clear=True)
     def test_get_default_api_and_url_values(self): # Renamed for clarity
+        reload_settings()
         self.assertIsNone(get_openai_api_key()) 
         self.assertIsNone(get_github_token())
         self.assertIsNone(get_huggingface_api_key())
@@ -109,8 +119,10 @@ class TestConfig(unittest.TestCase):
     # Specific test for Gemini key (already good, can be kept)
     def test_get_gemini_api_key_specific(self): # Renamed for clarity
         with patch.dict(os.environ, {"GEMINI_API_KEY": "specific_gemini_key"}, clear=True):
+            reload_settings()
             self.assertEqual(get_gemini_api_key(), "specific_gemini_key")
         with patch.dict(os.environ, {}, clear=True):
+            reload_settings()
             self.assertIsNone(get_gemini_api_key())
 
     # Removed old test_get_empty_values_for_paths as it targeted old get_articles_dir
@@ -120,22 +132,59 @@ class TestConfig(unittest.TestCase):
     def test_get_git_default_branch(self):
         # Test with environment variable set
         with patch.dict(os.environ, {"GIT_DEFAULT_BRANCH": "feature-branch"}, clear=True):
+            reload_settings()
             self.assertEqual(get_git_default_branch(), "feature-branch")
         
         # Test with environment variable not set (should return default)
         with patch.dict(os.environ, {}, clear=True):
+            reload_settings()
             self.assertEqual(get_git_default_branch(), "main") # Default is "main"
 
     def test_get_git_default_commit_message(self):
         # Test with environment variable set
         custom_message = "chore: Automated article push"
         with patch.dict(os.environ, {"GIT_DEFAULT_COMMIT_MESSAGE": custom_message}, clear=True):
+            reload_settings()
             self.assertEqual(get_git_default_commit_message(), custom_message)
         
         # Test with environment variable not set (should return default)
         with patch.dict(os.environ, {}, clear=True):
+            reload_settings()
             self.assertEqual(get_git_default_commit_message(), "feat: Add/update articles via CLI") # Default
 
+    def test_settings_are_resolved_once_and_dirs_created_once(self):
+        with patch.dict(os.environ, {"DRAFTS_DIR": "memo_drafts", "GIT_DEFAULT_BRANCH": "first"}, clear=True):
+            settings = reload_settings()
+            with patch('os.makedirs') as mock_mkdirs:
+                for _ in range(3):
+                    self.assertEqual(get_drafts_dir(), os.path.join(APP_ROOT, "memo_drafts"))
+            mock_mkdirs.assert_called_once_with(os.path.join(APP_ROOT, "memo_drafts"), exist_ok=True)
+
+            os.environ["GIT_DEFAULT_BRANCH"] = "second"
+            self.assertIs(get_settings(), settings)
+            self.assertEqual(get_git_default_branch(), "first") # Not re-read until reload
+            self.assertEqual(reload_settings().git_default_branch, "second")
+
+        with self.assertRaises(AttributeError):
+            settings.drafts_dir = "elsewhere" # Immutable
+
+    def test_malformed_mirror_entries_become_warnings(self):
+        with patch.dict(os.environ, {"GIT_MIRROR_REMOTES": "backup=git@host:site.git#pages,broken"}, clear=True), \
+                patch('builtins.print') as mock_print:
+            reload_settings()
+            self.assertEqual(get_git_mirror_remotes(), [("backup", "git@host:site.git", "pages")])
+            self.assertEqual(get_config_warnings(),
+                             ["Ignoring malformed GIT_MIRROR_REMOTES entry 'broken' (expected name=url[#branch])."])
+        mock_print.assert_not_called()
+        with patch.dict(os.environ, {}, clear=True):
+            reload_settings()
+            self.assertEqual(get_config_warnings(), [])
+
+    def test_resolving_settings_creates_no_directories(self):
+        with patch('os.makedirs') as mock_mkdirs:
+            reload_settings()
+        mock_mkdirs.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
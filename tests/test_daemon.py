@@ -0,0 +1,84 @@
+import unittest
+import os
+import socket
+import sys
+import tempfile
+import shutil
+import threading
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from daemon import DaemonServer, run_remote, send_request
+
+class TestDaemonServer(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.socket_path = os.path.join(self.root, "d.sock")
+        self.calls = []
+
+    def dispatch(self, argv, cwd, write):
+        self.calls.append((argv, cwd))
+        if argv == ["boom"]:
+            raise ValueError("bad command")
+        if argv[0] == "stream":
+            for word in argv[1:]:
+                write(word + "\n")
+            return 0, "done\n"
+        return len(argv), " ".join(argv)
+
+    def start(self):
+        server = DaemonServer(self.socket_path, self.dispatch)
+        thread = threading.Thread(target=server.serve_until_stopped, daemon=True)
+        thread.start()
+        def stop():
+            if thread.is_alive():
+                send_request(self.socket_path, {"op": "stop"}, timeout=5)
+                thread.join(5)
+        self.addCleanup(stop)
+        return server, thread
+
+    def test_runs_commands_and_stops(self):
+        _, thread = self.start()
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        self.assertEqual(send_request(self.socket_path, {"op": "ping"}, timeout=5)["pid"], os.getpid())
+
+        self.assertEqual(run_remote(self.socket_path, ["review", "--status", "final"], cwd="/tmp"),
+                         (3, "review --status final"))
+        self.assertEqual(self.calls, [(["review", "--status", "final"], "/tmp")])
+        with self.assertRaises(RuntimeError) as ctx:
+            run_remote(self.socket_path, ["boom"])
+        self.assertIn("bad command", str(ctx.exception))
+        self.assertFalse(send_request(self.socket_path, {"op": "unknown"}, timeout=5)["ok"])
+
+        self.assertTrue(send_request(self.socket_path, {"op": "stop"}, timeout=5)["ok"])
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_output_is_streamed_while_the_command_runs(self):
+        self.start()
+        chunks = []
+        exit_code, output = run_remote(self.socket_path, ["stream", "one", "two"], on_output=chunks.append)
+        self.assertEqual((exit_code, output), (0, "one\ntwo\ndone\n"))
+        self.assertEqual(chunks, ["one\n", "two\n", "done\n"])
+
+    def test_no_daemon_raises_oserror(self):
+        with self.assertRaises(OSError):
+            run_remote(self.socket_path, ["review"])
+
+    def test_stale_socket_is_replaced_but_live_one_is_not(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path) # Bound but never listening, like a socket left by a crashed daemon
+        stale.close()
+        self.start()
+        self.assertTrue(send_request(self.socket_path, {"op": "ping"}, timeout=5)["ok"])
+
+        with self.assertRaises(RuntimeError):
+            DaemonServer(self.socket_path, self.dispatch)
+
+
+if __name__ == '__main__':
+    unittest.main()
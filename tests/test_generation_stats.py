@@ -0,0 +1,68 @@
+import unittest
+import os
+import sys
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from generation_stats import percentile, summarize_generations
+
+
+class TestPercentile(unittest.TestCase):
+
+    def test_interpolates_between_ranks(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 50), 3.0)
+        self.assertAlmostEqual(percentile(values, 90), 4.6)
+        self.assertEqual(percentile(values, 100), 5.0)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+
+    def test_empty_raises(self):
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+
+class TestSummarizeGenerations(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [
+            {"user": "old", "ai": "written before metrics"},
+            {"user": "a", "ai": "A", "model": "flash", "latency_s": 2.0, "prompt_tokens": 10, "output_tokens": 100},
+            {"user": "b", "ai": "B", "model": "flash", "latency_s": 4.0, "ttfb_s": 0.5, "streamed": True,
+             "prompt_tokens": 20, "output_tokens": 300, "retries": 2, "rate_limit_wait_s": 1.5},
+            {"user": "c", "ai": "Error: API call failed: quota", "model": "pro", "latency_s": 0.1, "retries": 3},
+            {"user": "a", "ai": "A", "model": "flash", "cached": True},
+        ]
+
+    def test_counts_and_metrics(self):
+        summary = summarize_generations(self.records)
+        self.assertEqual(summary["skipped"], 1)
+        self.assertEqual(summary["generations"], 4)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["cached"], 1)
+        self.assertEqual(summary["streamed"], 1)
+        self.assertEqual(summary["retries"], 5)
+
+        latency = summary["metrics"]["latency_s"]
+        self.assertEqual(latency["count"], 3)
+        self.assertAlmostEqual(latency["mean"], 6.1 / 3)
+        self.assertEqual((latency["min"], latency["p50"], latency["max"]), (0.1, 2.0, 4.0))
+        self.assertEqual(summary["metrics"]["ttfb_s"]["count"], 1)
+        self.assertAlmostEqual(summary["output_tokens_per_s"], 400 / 6.0)
+
+    def test_filters_by_model_and_last(self):
+        self.assertEqual(summarize_generations(self.records, model="pro")["generations"], 1)
+        last_two = summarize_generations(self.records, last=2)
+        self.assertEqual((last_two["generations"], last_two["skipped"]), (2, 0))
+        self.assertNotIn("output_tokens", last_two["metrics"])
+        self.assertIsNone(last_two["output_tokens_per_s"])
+
+    def test_empty_history(self):
+        summary = summarize_generations([])
+        self.assertEqual(summary["generations"], 0)
+        self.assertEqual(summary["metrics"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
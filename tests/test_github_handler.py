@@ -2,11 +2,28 @@ import unittest
 from unittest.mock import patch, MagicMock, call
 import os
 import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import time
 
 # Add src directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from github_handler import GitHubHandler
+from github_handler import GitHubHandler, GitCatFileSession, git_blob_sha1
+from push_queue import PushQueue
+
+try:
+    import dulwich
+    HAS_DULWICH = True
+except ImportError:
+    HAS_DULWICH = False
+
+GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
 
 class TestGitHubHandler(unittest.TestCase):
 
@@ -114,7 +131,7 @@ class TestGitHubHandler(unittest.TestCase):
         mock_subprocess_run.side_effect = [
             MagicMock(returncode=0, stdout=f"origin\t{self.test_repo_url} (fetch)\norigin\t{self.test_repo_url} (push)", stderr=""), 
             MagicMock(returncode=0, stdout="", stderr=""),  # git add
-            MagicMock(returncode=0, stdout=" M file.txt", stderr=""), # git status
+            MagicMock(returncode=0, stdout="specific_article.md", stderr=""), # git diff --cached
             MagicMock(returncode=0, stdout="", stderr=""),  # git commit
             MagicMock(returncode=0, stdout="Pushed...", stderr=""), # git push
         ]
@@ -135,9 +152,10 @@ class TestGitHubHandler(unittest.TestCase):
         
         expected_calls_subprocess = [
             call(['git', 'remote', '-v'], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'add', article_filename], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'status', '--porcelain'], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'commit', '-m', expected_commit_msg], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            call(['git', 'add', '-A', '--', article_filename], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            # Only the article is checked; the rest of the working tree is not scanned with `git status`
+            call(['git', 'diff', '--cached', '--name-only', '--', article_filename], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            call(['git', 'commit', '-m', expected_commit_msg, '--', article_filename], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
             call(['git', 'push', 'origin', f"HEAD:{self.default_branch}"], cwd=self.test_local_dir, text=True, capture_output=True, check=False)
         ]
         mock_subprocess_run.assert_has_calls(expected_calls_subprocess, any_order=False)
@@ -207,9 +225,9 @@ class TestGitHubHandler(unittest.TestCase):
         
         expected_calls_subprocess = [
             call(['git', 'remote', '-v'], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'add', "some_article.md"], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'status', '--porcelain'], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
-            call(['git', 'commit', '-m', custom_user_message], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            call(['git', 'add', '-A', '--', "some_article.md"], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            call(['git', 'diff', '--cached', '--name-only', '--', "some_article.md"], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
+            call(['git', 'commit', '-m', custom_user_message, '--', "some_article.md"], cwd=self.test_local_dir, text=True, capture_output=True, check=False),
             call(['git', 'push', 'origin', f"HEAD:{self.default_branch}"], cwd=self.test_local_dir, text=True, capture_output=True, check=False)
         ]
         mock_subprocess_run.assert_has_calls(expected_calls_subprocess, any_order=False)
@@ -239,5 +257,544 @@ class TestGitHubHandler(unittest.TestCase):
         self.assertEqual(mock_subprocess_run.call_count, 3)
 
 
+class TestRepoStateStamp(unittest.TestCase):
+    """Uses a real git repository in a temp dir; the stamp lives in its .git directory."""
+
+    def setUp(self):
+        self.local_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.local_dir)
+        self.repo_url = "git@github.com:user/repo.git"
+
+    def make_handler(self, repo_url=None):
+        with patch('builtins.print'):
+            return GitHubHandler(repo_url=repo_url or self.repo_url, local_dir=self.local_dir,
+                                 default_branch="main", default_commit_message="msg")
+
+    def test_second_init_skips_git_commands(self):
+        first = self.make_handler()
+        self.assertFalse(first.repo_state_cached)
+        self.assertTrue(os.path.exists(os.path.join(self.local_dir, ".git", GitHubHandler.STATE_STAMP_NAME)))
+
+        with patch('subprocess.run') as mock_subprocess_run:
+            second = self.make_handler()
+        self.assertTrue(second.repo_state_cached)
+        mock_subprocess_run.assert_not_called()
+
+    def test_changed_config_or_url_invalidates_stamp(self):
+        self.make_handler()
+        subprocess.run(["git", "remote", "set-url", "origin", "git@github.com:other/other.git"],
+                       cwd=self.local_dir, check=True, capture_output=True)
+        handler = self.make_handler()
+        self.assertFalse(handler.repo_state_cached)
+        remotes = subprocess.run(["git", "remote", "get-url", "origin"], cwd=self.local_dir,
+                                 text=True, capture_output=True, check=True).stdout.strip()
+        self.assertEqual(remotes, self.repo_url)
+
+        new_url = "git@github.com:user/moved.git"
+        handler = self.make_handler(repo_url=new_url)
+        self.assertFalse(handler.repo_state_cached)
+        self.assertTrue(self.make_handler(repo_url=new_url).repo_state_cached)
+
+
+@patch.dict(os.environ, GIT_IDENTITY)
+class TestGitBackendsEndToEnd(unittest.TestCase):
+    """Pushes to a local bare repository with each backend."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.remote = os.path.join(self.root, "remote.git")
+        subprocess.run(["git", "init", "--bare", "-q", self.remote], check=True)
+        self.local_dir = os.path.join(self.root, "final")
+        os.makedirs(self.local_dir)
+        for index in range(3):
+            with open(os.path.join(self.local_dir, f"article_{index}.md"), 'w') as f:
+                f.write(f"---\ntitle: {index}\n---\nBody\n")
+
+    def remote_files(self):
+        result = subprocess.run(["git", "ls-tree", "-r", "--name-only", "main"], cwd=self.remote,
+                                text=True, capture_output=True, check=True)
+        return sorted(result.stdout.split())
+
+    def push_all(self, backend):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg", backend=backend)
+            self.assertEqual(handler.backend.name, backend)
+            return handler.add_commit_push()
+
+    def check_backend(self, backend):
+        success, message = self.push_all(backend)
+        self.assertTrue(success, message)
+        self.assertEqual(self.remote_files(), ["article_0.md", "article_1.md", "article_2.md"])
+
+        os.remove(os.path.join(self.local_dir, "article_0.md"))
+        with open(os.path.join(self.local_dir, "article_1.md"), 'a') as f:
+            f.write("More\n")
+        success, message = self.push_all(backend)
+        self.assertTrue(success, message)
+        self.assertEqual(self.remote_files(), ["article_1.md", "article_2.md"])
+
+        success, message = self.push_all(backend)
+        self.assertTrue(success)
+        self.assertIn("No changes", message)
+
+    def test_subprocess_backend(self):
+        self.check_backend("subprocess")
+
+    def test_manifest_stages_only_changed_paths(self):
+        success, message = self.push_all("subprocess")
+        self.assertTrue(success, message)
+        self.assertTrue(os.path.exists(os.path.join(self.local_dir, ".git", GitHubHandler.MANIFEST_NAME)))
+
+        with open(os.path.join(self.local_dir, "article_new.md"), 'w') as f:
+            f.write("---\ntitle: new\n---\nBody\n")
+        with patch('subprocess.run', wraps=subprocess.run) as mock_subprocess_run:
+            success, message = self.push_all("subprocess")
+        self.assertTrue(success, message)
+        commands = [c.args[0] for c in mock_subprocess_run.call_args_list]
+        self.assertIn(["git", "add", "-A", "--", "article_new.md"], commands)
+        self.assertNotIn(["git", "status", "--porcelain"], commands)
+        self.assertIn("article_new.md", self.remote_files())
+
+        with patch('subprocess.run', wraps=subprocess.run) as mock_subprocess_run:
+            success, message = self.push_all("subprocess")
+        self.assertEqual(message, "No changes since the last push.")
+        self.assertFalse(any(c.args[0][1] in ("add", "commit", "push") for c in mock_subprocess_run.call_args_list))
+
+    @unittest.skipUnless(HAS_DULWICH, "dulwich is not installed")
+    def test_dulwich_backend(self):
+        self.check_backend("dulwich")
+
+    def check_ignored_files_are_never_staged(self, backend):
+        with open(os.path.join(self.local_dir, ".gitignore"), 'w') as f:
+            f.write("*.log\n")
+        with open(os.path.join(self.local_dir, "debug.log"), 'w') as f:
+            f.write("noise\n")
+        success, message = self.push_all(backend)
+        self.assertTrue(success, message)
+        manifest_path = os.path.join(self.local_dir, ".git", GitHubHandler.MANIFEST_NAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        self.assertNotIn("debug.log", manifest)
+
+        # A manifest written before ignored files were filtered out may still list one
+        manifest["stale.log"] = [1, 1, "0" * 40]
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        with open(os.path.join(self.local_dir, "debug.log"), 'a') as f:
+            f.write("more noise\n")
+        with open(os.path.join(self.local_dir, "article_3.md"), 'w') as f:
+            f.write("---\ntitle: 3\n---\nBody\n")
+        success, message = self.push_all(backend)
+        self.assertTrue(success, message)
+        self.assertEqual(self.remote_files(), [".gitignore", "article_0.md", "article_1.md", "article_2.md", "article_3.md"])
+
+        os.remove(os.path.join(self.local_dir, "debug.log"))
+        self.assertEqual(self.push_all(backend), (True, "No changes since the last push."))
+
+    def test_ignored_files_are_never_staged(self):
+        self.check_ignored_files_are_never_staged("subprocess")
+
+    @unittest.skipUnless(HAS_DULWICH, "dulwich is not installed")
+    def test_ignored_files_are_never_staged_dulwich(self):
+        self.check_ignored_files_are_never_staged("dulwich")
+
+    def test_single_article_push_checks_only_that_article(self):
+        success, message = self.push_all("subprocess")
+        self.assertTrue(success, message)
+        with open(os.path.join(self.local_dir, "article_1.md"), 'a') as f:
+            f.write("More\n")
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg")
+        self.addCleanup(handler.close)
+
+        with patch('subprocess.run', wraps=subprocess.run) as mock_subprocess_run, patch('builtins.print'):
+            success, message = handler.add_commit_push(article_filename="article_1.md")
+        self.assertTrue(success, message)
+        commands = [c.args[0] for c in mock_subprocess_run.call_args_list]
+        self.assertNotIn(["git", "status", "--porcelain"], commands)
+        self.assertIn(["git", "add", "-A", "--", "article_1.md"], commands)
+
+        with patch('subprocess.run', wraps=subprocess.run) as mock_subprocess_run, \
+                patch('subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+            success, message = handler.add_commit_push(article_filename="article_1.md")
+        self.assertTrue(success)
+        self.assertIn("No changes to commit", message)
+        mock_subprocess_run.assert_not_called() # Answered by the manifest alone
+        mock_popen.assert_not_called()
+
+    def test_commit_each_and_push_makes_one_commit_per_article_and_one_push(self):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg")
+            with patch('subprocess.run', wraps=subprocess.run) as mock_subprocess_run:
+                success, message = handler.commit_each_and_push([
+                    ("article_2.md", "feat: Add article two"),
+                    ("article_0.md", "feat: Add article zero"),
+                ])
+        self.assertTrue(success, message)
+        push_calls = [c for c in mock_subprocess_run.call_args_list if c.args[0][:2] == ["git", "push"]]
+        self.assertEqual(len(push_calls), 1)
+        log = subprocess.run(["git", "log", "--format=%s", "--name-only", "main"], cwd=self.remote,
+                             text=True, capture_output=True, check=True).stdout.split()
+        self.assertEqual(" ".join(log), "feat: Add article zero article_0.md feat: Add article two article_2.md")
+
+        with patch('builtins.print'):
+            success, message = handler.commit_each_and_push([("article_0.md", "again")])
+        self.assertTrue(success)
+        self.assertIn("No changes to commit", message)
+
+    def check_per_article_commits_leave_other_staged_files_alone(self, backend):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg", backend=backend)
+            self.addCleanup(handler.close)
+            success, _, stderr = handler.backend.add_paths(["article_1.md"])
+            self.assertTrue(success, stderr)
+            success, message = handler.commit_each_and_push([
+                ("article_2.md", "feat: Add article two"),
+                ("article_0.md", "feat: Add article zero"),
+            ])
+        self.assertTrue(success, message)
+        log = subprocess.run(["git", "log", "--format=%s", "--name-only", "main"], cwd=self.remote,
+                             text=True, capture_output=True, check=True).stdout.split()
+        self.assertEqual(" ".join(log), "feat: Add article zero article_0.md feat: Add article two article_2.md")
+        staged = subprocess.run(["git", "diff", "--cached", "--name-only"], cwd=self.local_dir,
+                                text=True, capture_output=True, check=True).stdout.split()
+        self.assertEqual(staged, ["article_1.md"])
+
+    def test_per_article_commits_leave_other_staged_files_alone(self):
+        self.check_per_article_commits_leave_other_staged_files_alone("subprocess")
+
+    @unittest.skipUnless(HAS_DULWICH, "dulwich is not installed")
+    def test_per_article_commits_leave_other_staged_files_alone_dulwich(self):
+        self.check_per_article_commits_leave_other_staged_files_alone("dulwich")
+
+    def check_queued_article_deleted_before_flush_does_not_wedge_the_queue(self, backend):
+        queue = PushQueue(os.path.join(self.root, "queue"))
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg", backend=backend)
+        self.addCleanup(handler.close)
+
+        def push_intents(intents):
+            articles, message = PushQueue.coalesce(intents)
+            return handler.commit_push_articles(articles, commit_message=message)
+
+        queue.enqueue(article_name="article_1.md")
+        os.remove(os.path.join(self.local_dir, "article_1.md"))
+        with patch('builtins.print'):
+            success, message, flushed = queue.flush(push_intents)
+        self.assertEqual((success, flushed), (True, 1), message)
+        self.assertEqual(len(queue), 0)
+
+        queue.enqueue(article_name="article_2.md")
+        with patch('builtins.print'):
+            success, message, flushed = queue.flush(push_intents)
+        self.assertEqual((success, flushed), (True, 1), message)
+        self.assertEqual(self.remote_files(), ["article_2.md"])
+
+        # A committed article that is then deleted is still pushed as a deletion
+        queue.enqueue(article_name="article_2.md")
+        os.remove(os.path.join(self.local_dir, "article_2.md"))
+        with patch('builtins.print'):
+            success, message, flushed = queue.flush(push_intents)
+        self.assertEqual((success, flushed), (True, 1), message)
+        self.assertEqual(self.remote_files(), [])
+
+    def test_queued_article_deleted_before_flush_does_not_wedge_the_queue(self):
+        self.check_queued_article_deleted_before_flush_does_not_wedge_the_queue("subprocess")
+
+    @unittest.skipUnless(HAS_DULWICH, "dulwich is not installed")
+    def test_queued_article_deleted_before_flush_does_not_wedge_the_queue_dulwich(self):
+        self.check_queued_article_deleted_before_flush_does_not_wedge_the_queue("dulwich")
+
+    def test_push_over_ssh_passes_connection_sharing_options(self):
+        # A stand-in for ssh that logs its arguments and runs the remote command locally.
+        ssh_log = os.path.join(self.root, "ssh_args.jsonl")
+        fake_ssh = os.path.join(self.root, "fake_ssh.py")
+        with open(fake_ssh, 'w') as f:
+            f.write(
+                "import json, subprocess, sys\n"
+                f"with open({ssh_log!r}, 'a') as log: log.write(json.dumps(sys.argv[1:]) + '\\n')\n"
+                "sys.exit(subprocess.call(sys.argv[-1], shell=True))\n"
+            )
+        control_dir = os.path.join(self.root, "ssh")
+        env = {"GIT_SSH_COMMAND": f"{sys.executable} {fake_ssh}", "GIT_SSH_VARIANT": "simple"}
+        with patch.dict(os.environ, env), patch('builtins.print'):
+            handler = GitHubHandler(repo_url=f"ssh://localhost{self.remote}", local_dir=self.local_dir,
+                                    default_branch="main", default_commit_message="msg",
+                                    ssh_control_dir=control_dir, ssh_control_persist=120,
+                                    ssh_server_alive_interval=15)
+            success, message = handler.add_commit_push()
+            self.assertTrue(success, message)
+            with open(os.path.join(self.local_dir, "article_0.md"), 'a') as f:
+                f.write("More\n")
+            success, message = handler.add_commit_push()
+            self.assertTrue(success, message)
+
+        with open(ssh_log) as f:
+            invocations = [json.loads(line) for line in f]
+        self.assertEqual(len(invocations), 2)
+        for ssh_args in invocations:
+            self.assertIn("ControlMaster=auto", ssh_args)
+            self.assertIn(f"ControlPath={os.path.join(control_dir, 'cm-%C')}", ssh_args)
+            self.assertIn("ControlPersist=120", ssh_args)
+            self.assertIn("ServerAliveInterval=15", ssh_args)
+        self.assertTrue(os.path.isdir(control_dir))
+        self.assertIn("article_0.md", self.remote_files())
+
+    def test_connection_sharing_is_skipped_when_socket_path_would_be_too_long(self):
+        control_dir = os.path.join(self.root, "d" * 80)
+        with patch('builtins.print') as mock_print:
+            env = GitHubHandler._ssh_connection_env(control_dir, 600, 30)
+        self.assertIsNone(env)
+        self.assertIn("too long", mock_print.call_args[0][0])
+        self.assertFalse(os.path.exists(control_dir))
+
+    def test_connection_sharing_off_by_default(self):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg")
+        self.assertIsNone(handler.ssh_env)
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            self.push_all("libgit3")
+
+    def make_mirror_handler(self, mirrors):
+        with patch('builtins.print'):
+            return GitHubHandler(repo_url=self.remote, local_dir=self.local_dir, default_branch="main",
+                                 default_commit_message="msg", mirrors=mirrors)
+
+    def test_pushes_to_mirrors_and_branches(self):
+        backup = os.path.join(self.root, "backup.git")
+        subprocess.run(["git", "init", "--bare", "-q", backup], check=True)
+        handler = self.make_mirror_handler([("backup", backup, None), ("staging", self.remote, "staging")])
+        with patch('builtins.print'):
+            success, message = handler.add_commit_push()
+        self.assertTrue(success, message)
+        self.assertEqual([(name, branch, ok) for name, branch, ok, _ in handler.last_push_results],
+                         [("origin", "main", True), ("backup", "main", True), ("staging", "staging", True)])
+        heads = [subprocess.run(["git", "rev-parse", ref], cwd=repo, text=True, capture_output=True,
+                                check=True).stdout.strip()
+                 for repo, ref in ((self.remote, "main"), (backup, "main"), (self.remote, "staging"))]
+        self.assertEqual(len(set(heads)), 1)
+
+        # Remotes are configured once; the next handler trusts the state stamp.
+        self.assertTrue(self.make_mirror_handler([("backup", backup, None), ("staging", self.remote, "staging")]).repo_state_cached)
+
+    def test_failing_mirror_does_not_block_origin(self):
+        missing = os.path.join(self.root, "missing.git")
+        handler = self.make_mirror_handler([("broken", missing, None)])
+        with patch('builtins.print'):
+            success, message = handler.add_commit_push()
+        self.assertFalse(success)
+        self.assertIn("broken (main):", message)
+        self.assertIn("origin (main): OK", message)
+        self.assertEqual(self.remote_files(), ["article_0.md", "article_1.md", "article_2.md"])
+        # Nothing is recorded as pushed, so the next push retries every target.
+        self.assertFalse(handler.manifest.load())
+
+    def test_mirror_that_missed_a_push_is_retried_when_nothing_changed(self):
+        missing = os.path.join(self.root, "late.git")
+        handler = self.make_mirror_handler([("late", missing, None)])
+        with patch('builtins.print'):
+            self.assertFalse(handler.add_commit_push()[0])
+            success, message = handler.add_commit_push() # Nothing new to commit; the mirror is still down
+        self.assertFalse(success)
+        self.assertIn("late (main)", message)
+
+        subprocess.run(["git", "init", "--bare", "-q", missing], check=True)
+        with patch.object(handler.backend, 'push', wraps=handler.backend.push) as mock_push, patch('builtins.print'):
+            success, message = handler.add_commit_push()
+        self.assertTrue(success, message)
+        self.assertIn("missed the last push", message)
+        mock_push.assert_called_once_with("late", "HEAD:main") # Origin is already up to date
+        late_files = subprocess.run(["git", "ls-tree", "-r", "--name-only", "main"], cwd=missing,
+                                    text=True, capture_output=True, check=True).stdout.split()
+        self.assertEqual(sorted(late_files), ["article_0.md", "article_1.md", "article_2.md"])
+
+        with patch.object(handler.backend, 'push') as mock_push, patch('builtins.print'):
+            success, message = handler.add_commit_push()
+        self.assertTrue(success)
+        mock_push.assert_not_called()
+
+    def test_mirror_pushes_run_concurrently(self):
+        handler = self.make_mirror_handler([(f"mirror{index}", self.remote, f"m{index}") for index in range(3)])
+
+        def slow_push(remote, refspec):
+            time.sleep(0.3)
+            return True, f"{remote} {refspec}", ""
+
+        with patch.object(handler.backend, 'push', side_effect=slow_push) as mock_push, patch('builtins.print'):
+            start = time.perf_counter()
+            success, stdout, stderr = handler._push_head()
+            elapsed = time.perf_counter() - start
+        self.assertTrue(success, stderr)
+        self.assertEqual(mock_push.call_count, 4)
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(stdout.splitlines()[0], "origin (main): OK")
+
+    def test_invalid_mirror_name_raises(self):
+        with self.assertRaises(ValueError):
+            self.make_mirror_handler([("origin", self.remote, None)])
+
+
+class TestSparseCheckout(unittest.TestCase):
+    """Sparse, shallow checkout of a site repository with history and files outside the posts path."""
+
+    def setUp(self):
+        env_patcher = patch.dict(os.environ, GIT_IDENTITY)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        site = os.path.join(self.root, "site")
+        os.makedirs(os.path.join(site, "_posts"))
+        os.makedirs(os.path.join(site, "images"))
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=site, check=True)
+        for index in range(3):
+            with open(os.path.join(site, "_posts", f"post_{index}.md"), 'w') as f:
+                f.write(f"post {index}\n")
+            with open(os.path.join(site, "images", f"image_{index}.bin"), 'wb') as f:
+                f.write(os.urandom(1024))
+            subprocess.run(["git", "add", "-A"], cwd=site, check=True)
+            subprocess.run(["git", "commit", "-q", "-m", f"commit {index}"], cwd=site, check=True)
+        self.remote = os.path.join(self.root, "site.git")
+        subprocess.run(["git", "clone", "-q", "--bare", site, self.remote], check=True)
+        subprocess.run(["git", "config", "uploadpack.allowFilter", "true"], cwd=self.remote, check=True)
+
+        self.checkout_root = os.path.join(self.root, "checkout")
+        self.local_dir = os.path.join(self.checkout_root, "_posts")
+
+    def make_handler(self):
+        with patch('builtins.print'):
+            return GitHubHandler(repo_url=f"file://{self.remote}", local_dir=self.local_dir, default_branch="main",
+                                 default_commit_message="msg", sparse_path="_posts")
+
+    def git(self, *args, cwd=None):
+        return subprocess.run(["git", *args], cwd=cwd or self.checkout_root, text=True,
+                              capture_output=True, check=True).stdout.strip()
+
+    def test_checkout_is_shallow_and_sparse_and_pushes(self):
+        handler = self.make_handler()
+        self.addCleanup(handler.close)
+        self.assertEqual(handler.repo_root, self.checkout_root)
+        self.assertEqual(sorted(os.listdir(self.local_dir)), ["post_0.md", "post_1.md", "post_2.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.checkout_root, "images")))
+        self.assertEqual(self.git("rev-parse", "--is-shallow-repository"), "true")
+        self.assertEqual(self.git("rev-list", "--count", "HEAD"), "1")
+        self.assertTrue(handler.is_article_unchanged("post_0.md"))
+
+        with open(os.path.join(self.local_dir, "post_new.md"), 'w') as f:
+            f.write("new post\n")
+        success, message = handler.add_commit_push()
+        self.assertTrue(success, message)
+        remote_tree = self.git("ls-tree", "-r", "--name-only", "main", cwd=self.remote).split()
+        self.assertIn("_posts/post_new.md", remote_tree)
+        self.assertIn("images/image_0.bin", remote_tree)
+        self.assertEqual(self.git("rev-list", "--count", "main", cwd=self.remote), "4")
+
+        # A second handler on the same checkout reuses it without running git.
+        with patch('subprocess.run') as mock_subprocess_run:
+            self.assertTrue(self.make_handler().repo_state_cached)
+        mock_subprocess_run.assert_not_called()
+
+    def test_empty_remote_starts_an_unborn_branch(self):
+        empty_remote = os.path.join(self.root, "empty.git")
+        subprocess.run(["git", "init", "--bare", "-q", empty_remote], check=True)
+        self.remote = empty_remote
+        handler = self.make_handler()
+        self.addCleanup(handler.close)
+        with open(os.path.join(self.local_dir, "post_new.md"), 'w') as f:
+            f.write("new post\n")
+        with patch('builtins.print'):
+            success, message = handler.add_commit_push()
+        self.assertTrue(success, message)
+        self.assertEqual(self.git("ls-tree", "-r", "--name-only", "main", cwd=empty_remote), "_posts/post_new.md")
+
+    def test_unreachable_remote_raises_and_leaves_no_repository(self):
+        self.remote = os.path.join(self.root, "missing.git")
+        with self.assertRaises(RuntimeError):
+            self.make_handler()
+        self.assertFalse(os.path.exists(os.path.join(self.checkout_root, ".git")))
+
+        # Once the remote is reachable, the next run creates the checkout from scratch.
+        self.remote = os.path.join(self.root, "site.git")
+        handler = self.make_handler()
+        self.addCleanup(handler.close)
+        self.assertEqual(self.git("rev-list", "--count", "HEAD"), "1")
+
+    def test_local_dir_must_end_with_sparse_path(self):
+        with self.assertRaises(ValueError):
+            GitHubHandler(repo_url=self.remote, local_dir=os.path.join(self.root, "posts"), default_branch="main",
+                          default_commit_message="msg", sparse_path="_posts")
+
+
+class TestGitCatFileSession(unittest.TestCase):
+
+    def setUp(self):
+        env_patcher = patch.dict(os.environ, GIT_IDENTITY)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        self.local_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.local_dir)
+        subprocess.run(["git", "init", "-q"], cwd=self.local_dir, check=True)
+        self.write("committed.md", "committed\n")
+        subprocess.run(["git", "add", "committed.md"], cwd=self.local_dir, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=self.local_dir, check=True)
+
+    def write(self, name, content):
+        with open(os.path.join(self.local_dir, name), 'w') as f:
+            f.write(content)
+
+    def test_blob_hash_matches_git(self):
+        path = os.path.join(self.local_dir, "committed.md")
+        expected = subprocess.run(["git", "hash-object", path], text=True, capture_output=True, check=True).stdout.strip()
+        self.assertEqual(git_blob_sha1(path), expected)
+        self.assertIsNone(git_blob_sha1(os.path.join(self.local_dir, "missing.md")))
+
+    def test_queries_share_one_process(self):
+        with patch('subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+            with GitCatFileSession(self.local_dir) as session:
+                info = session.object_info("HEAD:committed.md")
+                self.assertEqual(info[1:], ("blob", len("committed\n")))
+                self.assertIsNone(session.object_info("HEAD:missing.md"))
+                for _ in range(10):
+                    session.object_info("HEAD")
+        self.assertEqual(mock_popen.call_count, 1)
+
+    def test_is_article_unchanged(self):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url="", local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg")
+        self.addCleanup(handler.close)
+        self.assertTrue(handler.is_article_unchanged("committed.md"))
+        self.write("new.md", "new\n")
+        self.assertFalse(handler.is_article_unchanged("new.md"))
+        self.write("committed.md", "edited\n")
+        self.assertFalse(handler.is_article_unchanged("committed.md"))
+        self.assertIsNone(handler.is_article_unchanged("missing.md"))
+
+    def test_is_article_unchanged_sees_commits_made_after_the_session_started(self):
+        with patch('builtins.print'):
+            handler = GitHubHandler(repo_url="", local_dir=self.local_dir, default_branch="main",
+                                    default_commit_message="msg")
+        self.addCleanup(handler.close)
+        self.write("committed.md", "edited\n")
+        self.assertFalse(handler.is_article_unchanged("committed.md")) # Starts the session on the old index
+
+        subprocess.run(["git", "add", "committed.md"], cwd=self.local_dir, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "edit"], cwd=self.local_dir, check=True)
+        self.assertTrue(handler.is_article_unchanged("committed.md"))
+        with patch('subprocess.Popen', wraps=subprocess.Popen) as mock_popen:
+            self.assertTrue(handler.is_article_unchanged("committed.md"))
+        mock_popen.assert_not_called() # Still one session while the index is unchanged
+
+
 if __name__ == '__main__':
     unittest.main()
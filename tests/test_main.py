@@ -1,13 +1,21 @@
 import unittest
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock, call, ANY
 import sys
 import os
 import argparse # For creating mock args objects easily
+import tempfile
+import subprocess
+import shutil
+import json
+import asyncio
+from types import SimpleNamespace
 
 # Add parent directory of 'src' (i.e., 'termux_article_cli') to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.main import main_cli
+from src.main import main_cli, _run_in_daemon
+from src.response_cache import ResponseCache
+from src.article_utils import GroupCommit
 
 class TestMainCLIWorkflow(unittest.TestCase):
 
@@ -100,10 +108,11 @@ class TestMainCLICommands(unittest.TestCase):
         mock_ArticleGenerator.return_value = mock_generator_instance
         mock_validate_frontmatter.return_value = (True, {"title": "Valid Title", "date": "2023-01-01"}, None)
 
-        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Test prompt']):
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Test prompt', '--no-cache']):
             main_cli()
 
-        mock_ArticleGenerator.assert_called_once_with(chat_history_file="mock/chat_history.json", gemini_api_key="mock_gemini_key")
+        mock_ArticleGenerator.assert_called_once_with(chat_history_file="mock/chat_history.json", gemini_api_key="mock_gemini_key", response_cache=None,
+                                                     rate_limiter=None, retry_policy=ANY)
         mock_generator_instance.generate_article.assert_called_once_with('Test prompt')
         mock_validate_frontmatter.assert_called_once_with("---valid_fm---content")
         mock_save_article.assert_called_once_with("---valid_fm---content", "mock/drafts_dir")
@@ -124,7 +133,7 @@ class TestMainCLICommands(unittest.TestCase):
         mock_ArticleGenerator.return_value = mock_generator_instance
         mock_validate_frontmatter.return_value = (False, None, "Validation Error")
 
-        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Test prompt invalid']):
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Test prompt invalid', '--no-cache']):
             main_cli()
         
         mock_validate_frontmatter.assert_called_once_with("---invalid_fm---content")
@@ -145,7 +154,7 @@ class TestMainCLICommands(unittest.TestCase):
         mock_generator_instance.generate_article.return_value = "Error: API limit reached" # AI error
         mock_ArticleGenerator.return_value = mock_generator_instance
 
-        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'API error prompt']):
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'API error prompt', '--no-cache']):
             main_cli()
 
         mock_validate_frontmatter.assert_not_called()
@@ -157,13 +166,164 @@ class TestMainCLICommands(unittest.TestCase):
         self.assertEqual(saved_dir_arg, "mock/failed_dir")
 
 
+    @patch('src.main.get_gemini_api_key', return_value="mock_gemini_key")
+    @patch('src.main.get_chat_history_file_path', return_value="mock/chat_history.json")
     @patch('src.main.get_drafts_dir', return_value="mock/drafts_dir")
-    @patch('src.main.list_articles')
+    @patch('src.main.get_failed_validation_dir', return_value="mock/failed_dir")
+    @patch('src.main.ArticleGenerator')
+    @patch('src.main.validate_frontmatter')
+    @patch('src.main.save_article')
+    def test_generate_batch_from_prompts_file(self, mock_save_article, mock_validate_frontmatter,
+                                              mock_ArticleGenerator, mock_failed_dir, mock_drafts_dir,
+                                              mock_chat_hist_path, mock_gemini_key):
+        with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as prompts_file:
+            prompts_file.write("First topic\n\n# a comment\nSecond topic\nThird topic\n")
+        self.addCleanup(os.remove, prompts_file.name)
+
+        outputs = {
+            "First topic": "---valid_fm---content one",
+            "Second topic": "---invalid_fm---content two",
+            "Third topic": "Error: API limit reached",
+        }
+        async def agenerate_many(prompts, concurrency, timeout, on_result):
+            # Results arrive out of prompt order, as they would from concurrent requests
+            for position in reversed(range(len(prompts))):
+                on_result(position, prompts[position], outputs[prompts[position]])
+            return [outputs[prompt] for prompt in prompts]
+        mock_generator_instance = MagicMock()
+        mock_generator_instance.agenerate_many.side_effect = agenerate_many
+        mock_generator_instance.total_retries, mock_generator_instance.total_rate_limit_wait_seconds = 0, 0.0
+        mock_ArticleGenerator.return_value = mock_generator_instance
+        mock_validate_frontmatter.side_effect = lambda text: (
+            (True, {"title": "One"}, None) if "valid_fm---content one" in text else (False, None, "Bad frontmatter")
+        )
+
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompts-file', prompts_file.name, '--concurrency', '2',
+                                        '--timeout', '30', '--no-cache']):
+            main_cli()
+
+        # One generator is shared by the whole batch.
+        mock_ArticleGenerator.assert_called_once_with(chat_history_file="mock/chat_history.json", gemini_api_key="mock_gemini_key", response_cache=None,
+                                                     rate_limiter=None, retry_policy=ANY)
+        mock_generator_instance.agenerate_many.assert_called_once()
+        call_args = mock_generator_instance.agenerate_many.call_args
+        self.assertEqual(call_args.args[0], ["First topic", "Second topic", "Third topic"])
+        self.assertEqual((call_args.kwargs["concurrency"], call_args.kwargs["timeout"]), (2, 30.0))
+        self.assertEqual(mock_validate_frontmatter.call_count, 2) # Generation error is not validated
+
+        saved = {call_args[0][1]: [] for call_args in mock_save_article.call_args_list}
+        for call_args in mock_save_article.call_args_list:
+            saved[call_args[0][1]].append((call_args[0][0], call_args[0][2]))
+        self.assertEqual(len(saved["mock/drafts_dir"]), 1)
+        self.assertEqual(saved["mock/drafts_dir"][0][0], "---valid_fm---content one")
+        self.assertEqual(len(saved["mock/failed_dir"]), 2)
+        filenames = [name for entries in saved.values() for _, name in entries]
+        self.assertEqual(len(filenames), len(set(filenames))) # No filename collisions within a batch
+
+    @patch('src.main.get_gemini_api_key', return_value="mock_gemini_key")
+    @patch('src.main.get_chat_history_file_path', return_value="mock/chat_history.json")
+    @patch('src.main.get_drafts_dir', return_value="mock/drafts_dir")
+    @patch('src.main.get_response_cache_dir', return_value="mock/response_cache")
+    @patch('src.main.ArticleGenerator')
+    @patch('src.main.validate_frontmatter', return_value=(True, {"title": "T"}, None))
+    @patch('src.main.save_article')
+    def test_generate_uses_response_cache_by_default(self, mock_save_article, mock_validate_frontmatter,
+                                                     mock_ArticleGenerator, mock_cache_dir, mock_drafts_dir,
+                                                     mock_chat_hist_path, mock_gemini_key):
+        mock_ArticleGenerator.return_value.generate_article.return_value = "---valid_fm---content"
+
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Cached prompt']):
+            main_cli()
+
+        response_cache = mock_ArticleGenerator.call_args.kwargs["response_cache"]
+        self.assertIsInstance(response_cache, ResponseCache)
+        self.assertEqual(response_cache.cache_dir, "mock/response_cache")
+
+    @patch('src.main.get_gemini_api_key', return_value="mock_gemini_key")
+    @patch('src.main.get_chat_history_file_path', return_value="mock/chat_history.json")
+    @patch('src.main.get_drafts_dir')
+    @patch('src.main.get_failed_validation_dir')
+    @patch('src.main.ArticleGenerator')
+    def test_generate_stream_valid_and_invalid(self, mock_ArticleGenerator, mock_failed_dir, mock_drafts_dir,
+                                               mock_chat_hist_path, mock_gemini_key):
+        drafts_dir, failed_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, drafts_dir)
+        self.addCleanup(shutil.rmtree, failed_dir)
+        mock_drafts_dir.return_value, mock_failed_dir.return_value = drafts_dir, failed_dir
+
+        valid_article = (
+            '---\ntitle: "T"\ndescription: "D"\nexcerpt: "E"\ncategories: ["C"]\n'
+            'tags: ["t"]\ndate: "2024-01-01"\n---\nBody text\n'
+        )
+        mock_ArticleGenerator.return_value.stream_article.side_effect = lambda prompt: (c for c in [valid_article[:40], valid_article[40:]])
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Streamed', '--stream', '--no-cache']):
+            main_cli()
+        drafts = os.listdir(drafts_dir)
+        self.assertEqual(len(drafts), 1)
+        self.assertTrue(drafts[0].endswith(".md"))
+        with open(os.path.join(drafts_dir, drafts[0])) as f:
+            self.assertEqual(f.read(), valid_article)
+
+        mock_ArticleGenerator.return_value.stream_article.side_effect = lambda prompt: (c for c in ["---\ntitle: x\n---\n", "body"])
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'Bad', '--stream', '--no-cache']):
+            main_cli()
+        self.assertEqual(len(os.listdir(drafts_dir)), 1) # No new draft, no leftover .part file
+        self.assertEqual(len(os.listdir(failed_dir)), 1)
+
+    def test_generate_prompt_and_prompts_file_are_exclusive(self):
+        with patch.object(sys, 'argv', ['main.py', 'generate', '--prompt', 'x', '--prompts-file', 'topics.txt']):
+            with self.assertRaises(SystemExit):
+                main_cli()
+
+    @patch('src.main.get_drafts_dir', return_value="mock/drafts_dir")
+    @patch('src.main.get_catalog_db_path', return_value="mock/catalog.sqlite3")
+    @patch('src.main.ArticleCatalog')
     @patch('os.path.exists', return_value=True) # Assume directory exists
-    def test_review_drafts_list(self, mock_os_exists, mock_list_articles, mock_drafts_dir):
+    def test_review_drafts_list(self, mock_os_exists, mock_ArticleCatalog, mock_catalog_path, mock_drafts_dir):
+        mock_catalog = mock_ArticleCatalog.return_value
+        mock_catalog.count.return_value = 1
+        mock_catalog.query.return_value = [{"filename": "a.md", "title": "A", "date": "2024-01-01"}]
         with patch.object(sys, 'argv', ['main.py', 'review', '--status', 'draft']):
             main_cli()
-        mock_list_articles.assert_called_once_with("mock/drafts_dir")
+        self.assertEqual(mock_ArticleCatalog.call_args[0][0], "mock/catalog.sqlite3")
+        mock_catalog.refresh.assert_called_once_with("draft", "mock/drafts_dir")
+        mock_catalog.query.assert_called_once_with("draft", sort="name", descending=False, limit=None, offset=0)
+        mock_catalog.close.assert_called_once()
+
+    @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
+    @patch('src.main.get_catalog_db_path', return_value="mock/catalog.sqlite3")
+    @patch('src.main.ArticleCatalog')
+    @patch('os.path.exists', return_value=True)
+    def test_review_sorted_and_paged(self, mock_os_exists, mock_ArticleCatalog, mock_catalog_path, mock_final_dir):
+        mock_catalog = mock_ArticleCatalog.return_value
+        mock_catalog.count.return_value = 25
+        mock_catalog.query.return_value = []
+        with patch.object(sys, 'argv', ['main.py', 'review', '--status', 'final', '--sort', 'date', '--reverse',
+                                        '--limit', '10', '--page', '3']):
+            main_cli()
+        mock_catalog.query.assert_called_once_with("final", sort="date", descending=True, limit=10, offset=20)
+
+    @patch('src.main.get_config_warnings', return_value=["Ignoring malformed GIT_MIRROR_REMOTES entry 'broken'."])
+    @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
+    def test_config_warnings_are_reported_before_the_command_runs(self, mock_get_final_dir, mock_get_config_warnings):
+        with patch.object(sys, 'argv', ['main.py', 'review', '--status', 'final', '--limit', '0']), \
+                patch('builtins.print') as mock_print:
+            main_cli()
+        self.assertEqual([c.args[0] for c in mock_print.call_args_list], [
+            "WARNING: Ignoring malformed GIT_MIRROR_REMOTES entry 'broken'.",
+            "ERROR: --limit must be a positive number of articles.",
+        ])
+
+    @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
+    @patch('src.main.ArticleCatalog')
+    def test_review_rejects_non_positive_limit_and_page(self, mock_ArticleCatalog, mock_get_final_dir):
+        for option, value in (("--limit", "0"), ("--limit", "-5"), ("--page", "0")):
+            with patch.object(sys, 'argv', ['main.py', 'review', '--status', 'final', '--limit', '10', option, value]), \
+                    patch('builtins.print') as mock_print:
+                main_cli()
+            mock_print.assert_called_once()
+            self.assertIn(option, mock_print.call_args[0][0])
+        mock_ArticleCatalog.assert_not_called()
 
     @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
     @patch('src.main.load_article')
@@ -176,12 +336,11 @@ class TestMainCLICommands(unittest.TestCase):
 
     @patch('src.main.get_drafts_dir', return_value="mock/drafts_dir")
     @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
-    @patch('src.main.load_article')
-    @patch('src.main.validate_frontmatter')
+    @patch('src.main.validate_article_file')
     @patch('os.path.exists') # This mock will be configured specifically
-    @patch('os.rename')
-    def test_finalize_success(self, mock_os_rename, mock_os_exists, mock_validate_frontmatter, 
-                              mock_load_article, mock_final_dir, mock_drafts_dir):
+    @patch('src.main.move_article')
+    def test_finalize_success(self, mock_move_article, mock_os_exists, mock_validate_article_file,
+                              mock_final_dir, mock_drafts_dir):
         
         draft_name = "to_finalize.md"
         draft_path = os.path.join("mock/drafts_dir", draft_name)
@@ -197,18 +356,23 @@ class TestMainCLICommands(unittest.TestCase):
             return True # Default for any other path (e.g. locale files)
         mock_os_exists.side_effect = os_path_exists_side_effect
         
-        mock_load_article.return_value = "draft content"
-        mock_validate_frontmatter.return_value = (True, {"title": "Finalized"}, None)
+        mock_validate_article_file.return_value = (True, {"title": "Finalized"}, None)
         
         with patch.object(sys, 'argv', ['main.py', 'finalize', '--draft_name', draft_name]):
             main_cli()
         
         mock_os_exists.assert_any_call(draft_path)
         mock_os_exists.assert_any_call(final_path)
-        mock_load_article.assert_called_once_with(draft_path)
-        mock_validate_frontmatter.assert_called_once_with("draft content")
-        mock_os_rename.assert_called_once_with(draft_path, final_path)
-
+        mock_validate_article_file.assert_called_once_with(draft_path) # Header-only validation
+        mock_move_article.assert_called_once_with(draft_path, final_path) # Atomic, fsync-safe move
+
+    @patch('src.main.get_git_push_timeout_seconds', return_value=0)
+    @patch('src.main.get_git_mirror_remotes', return_value=[])
+    @patch('src.main.get_git_backend', return_value="subprocess")
+    @patch('src.main.get_git_sparse_path', return_value=None)
+    @patch('src.main.get_git_ssh_control_dir', return_value="mock/ssh")
+    @patch('src.main.get_git_ssh_control_persist', return_value=600)
+    @patch('src.main.get_git_ssh_server_alive_interval', return_value=30)
     @patch('src.main.get_github_repo_url', return_value="mock_git_url")
     @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
     @patch('src.main.get_git_default_branch', return_value="test-branch") # Added
@@ -217,7 +381,8 @@ class TestMainCLICommands(unittest.TestCase):
     @patch('os.path.exists', return_value=True) 
     def test_push_all_final_no_message_arg(self, mock_os_exists, mock_GitHubHandler, 
                                             mock_git_def_commit_msg, mock_git_def_branch, # Added
-                                            mock_final_dir, mock_git_url):
+                                            mock_final_dir, mock_git_url, mock_ssh_alive, mock_ssh_persist,
+                                            mock_ssh_dir, mock_sparse_path, mock_git_backend, mock_mirrors, mock_push_timeout):
         mock_gh_instance = MagicMock()
         mock_gh_instance.add_commit_push.return_value = (True, "Pushed all with default config message")
         mock_GitHubHandler.return_value = mock_gh_instance
@@ -229,12 +394,26 @@ class TestMainCLICommands(unittest.TestCase):
             repo_url="mock_git_url", 
             local_dir="mock/final_dir",
             default_branch="test-branch",
-            default_commit_message="Test default commit from config"
+            default_commit_message="Test default commit from config",
+            backend="subprocess",
+            ssh_control_dir="mock/ssh",
+            ssh_control_persist=600,
+            ssh_server_alive_interval=30,
+            sparse_path=None,
+            mirrors=[],
+            push_timeout=0
         )
         # args.message is None, so GitHubHandler will use its default_commit_message logic
-        mock_gh_instance.add_commit_push.assert_called_once_with(commit_message=None)
+        mock_gh_instance.add_commit_push.assert_called_once_with(commit_message=None, full_scan=False)
 
 
+    @patch('src.main.get_git_push_timeout_seconds', return_value=0)
+    @patch('src.main.get_git_mirror_remotes', return_value=[])
+    @patch('src.main.get_git_backend', return_value="subprocess")
+    @patch('src.main.get_git_sparse_path', return_value=None)
+    @patch('src.main.get_git_ssh_control_dir', return_value="mock/ssh")
+    @patch('src.main.get_git_ssh_control_persist', return_value=600)
+    @patch('src.main.get_git_ssh_server_alive_interval', return_value=30)
     @patch('src.main.get_github_repo_url', return_value="mock_git_url")
     @patch('src.main.get_final_articles_dir', return_value="mock/final_dir")
     @patch('src.main.get_git_default_branch', return_value="test-branch")
@@ -243,7 +422,9 @@ class TestMainCLICommands(unittest.TestCase):
     @patch('os.path.exists') 
     def test_push_specific_article_with_message_arg(self, mock_os_exists, mock_GitHubHandler,
                                                      mock_git_def_commit_msg, mock_git_def_branch, # Mocks from config
-                                                     mock_final_dir_getter, mock_git_url_getter): # Mocks from config (actual getter names)
+                                                     mock_final_dir_getter, mock_git_url_getter, # Mocks from config (actual getter names)
+                                                     mock_ssh_alive, mock_ssh_persist, mock_ssh_dir,
+                                                     mock_sparse_path, mock_git_backend, mock_mirrors, mock_push_timeout):
         article_name = "my_article.md"
         custom_commit_message = "docs: Update my_article.md with new sections"
         
@@ -269,7 +450,14 @@ class TestMainCLICommands(unittest.TestCase):
             repo_url="mock_git_url", 
             local_dir="mock/final_dir",
             default_branch="test-branch",
-            default_commit_message="Test default commit from config"
+            default_commit_message="Test default commit from config",
+            backend="subprocess",
+            ssh_control_dir="mock/ssh",
+            ssh_control_persist=600,
+            ssh_server_alive_interval=30,
+            sparse_path=None,
+            mirrors=[],
+            push_timeout=0
         )
         mock_gh_instance.add_commit_push.assert_called_once_with(
             article_filename=article_name, 
@@ -277,6 +465,220 @@ class TestMainCLICommands(unittest.TestCase):
         )
 
 
+    @patch('src.main.get_chat_history_file_path')
+    def test_history_compact(self, mock_chat_hist_path):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        log_path = os.path.join(temp_dir, "chat_history.jsonl")
+        mock_chat_hist_path.return_value = log_path
+        with open(log_path, 'w') as f:
+            for i in range(4):
+                f.write(json.dumps({"user": f"p{i}", "ai": f"r{i}"}) + "\n")
+
+        with patch.object(sys, 'argv', ['main.py', 'history', '--compact', '1']):
+            main_cli()
+
+        with open(log_path, 'r') as f:
+            remaining = [json.loads(line) for line in f if line.strip()]
+        self.assertEqual(remaining, [{"user": "p3", "ai": "r3"}])
+
+    @patch('src.main.get_chat_history_file_path')
+    def test_stats_reports_percentiles(self, mock_chat_hist_path):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        log_path = os.path.join(temp_dir, "chat_history.jsonl")
+        mock_chat_hist_path.return_value = log_path
+        with open(log_path, 'w') as f:
+            f.write(json.dumps({"user": "old", "ai": "no metrics"}) + "\n")
+            for i in range(1, 5):
+                f.write(json.dumps({"user": f"p{i}", "ai": f"r{i}", "model": "m", "latency_s": float(i),
+                                    "prompt_tokens": 100, "output_tokens": 200 * i}) + "\n")
+
+        with patch.object(sys, 'argv', ['main.py', 'stats', '--json']), patch('builtins.print') as mock_print:
+            main_cli()
+        summary = json.loads(mock_print.call_args[0][0])
+        self.assertEqual(summary["generations"], 4)
+        self.assertEqual(summary["skipped"], 1)
+        self.assertAlmostEqual(summary["metrics"]["latency_s"]["p50"], 2.5)
+        self.assertAlmostEqual(summary["output_tokens_per_s"], 200.0)
+
+        with patch.object(sys, 'argv', ['main.py', 'stats', '--last', '2']), patch('builtins.print') as mock_print:
+            main_cli()
+        output = "\n".join(str(c[0][0]) for c in mock_print.call_args_list if c[0])
+        self.assertIn("Generations: 2 (0 errors, 0 cache hits, 0 streamed), 0 retries", output)
+        self.assertIn("Latency (s)", output)
+        self.assertNotIn("Time to first byte", output) # No streamed runs, so no row
+
+    def test_importing_cli_does_not_load_gemini_sdk(self):
+        app_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        check = "import sys; import src.main; print('google.generativeai' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", check], cwd=app_root, text=True, capture_output=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "False")
+
+    @patch('src.main.get_drafts_dir')
+    def test_validate_reports_failures(self, mock_drafts_dir):
+        drafts_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, drafts_dir)
+        mock_drafts_dir.return_value = drafts_dir
+        valid_article = (
+            '---\ntitle: "T"\ndescription: "D"\nexcerpt: "E"\ncategories: ["C"]\n'
+            'tags: ["t"]\ndate: "2024-01-01"\n---\nBody\n'
+        )
+        for index in range(5):
+            with open(os.path.join(drafts_dir, f"good_{index}.md"), 'w') as f:
+                f.write(valid_article)
+        with open(os.path.join(drafts_dir, "bad.md"), 'w') as f:
+            f.write("---\ntitle: only\n---\nBody\n")
+        with open(os.path.join(drafts_dir, "binary.md"), 'wb') as f:
+            f.write(b"\xff\xfe---\n")
+
+        for jobs in ("1", "2"):
+            with patch.object(sys, 'argv', ['main.py', 'validate', '--status', 'draft', '--jobs', jobs]):
+                with patch('builtins.print') as mock_print:
+                    main_cli()
+            output = "\n".join(str(c.args[0]) for c in mock_print.call_args_list if c.args)
+            self.assertIn("Checked: 7  Valid: 5  Invalid: 2", output)
+            self.assertIn("FAIL bad.md", output)
+            self.assertIn("FAIL binary.md: Could not read", output)
+            self.assertIn("files/s", output)
+
+    @patch('src.main.get_final_articles_dir')
+    @patch('src.main.get_drafts_dir')
+    def test_finalize_glob_moves_valid_drafts_in_one_pass(self, mock_drafts_dir, mock_final_dir):
+        drafts_dir, final_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, drafts_dir)
+        self.addCleanup(shutil.rmtree, final_dir)
+        mock_drafts_dir.return_value = drafts_dir
+        mock_final_dir.return_value = final_dir
+        valid_article = (
+            '---\ntitle: "T"\ndescription: "D"\nexcerpt: "E"\ncategories: ["C"]\n'
+            'tags: ["t"]\ndate: "2024-01-01"\n---\nBody\n'
+        )
+        for name in ("article_2026_a.md", "article_2026_b.md", "article_2025_c.md"):
+            with open(os.path.join(drafts_dir, name), 'w') as f:
+                f.write(valid_article)
+        with open(os.path.join(drafts_dir, "article_2026_bad.md"), 'w') as f:
+            f.write("---\ntitle: only\n---\nBody\n")
+
+        with patch.object(sys, 'argv', ['main.py', 'finalize', '--glob', 'article_2026*', '--jobs', '2']):
+            with patch('builtins.print') as mock_print:
+                main_cli()
+
+        self.assertEqual(sorted(os.listdir(final_dir)), ["article_2026_a.md", "article_2026_b.md"])
+        self.assertEqual(sorted(os.listdir(drafts_dir)), ["article_2025_c.md", "article_2026_bad.md"])
+        output = "\n".join(str(c.args[0]) for c in mock_print.call_args_list if c.args)
+        self.assertIn("2 moved", output)
+        self.assertIn("1 failed", output)
+        self.assertIn("- article_2026_bad.md: Frontmatter validation failed", output)
+
+    @patch('src.main.get_final_articles_dir')
+    @patch('src.main.get_drafts_dir')
+    def test_finalize_all_carries_on_past_bad_files(self, mock_drafts_dir, mock_final_dir):
+        drafts_dir, final_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, drafts_dir)
+        self.addCleanup(shutil.rmtree, final_dir)
+        mock_drafts_dir.return_value = drafts_dir
+        mock_final_dir.return_value = final_dir
+        valid_article = (
+            '---\ntitle: "T"\ndescription: "D"\nexcerpt: "E"\ncategories: ["C"]\n'
+            'tags: ["t"]\ndate: "2024-01-01"\n---\nBody\n'
+        )
+        for name in ("a.md", "c.md", "d.md"):
+            with open(os.path.join(drafts_dir, name), 'w') as f:
+                f.write(valid_article)
+        with open(os.path.join(drafts_dir, "b.md"), 'wb') as f:
+            f.write(b"\xff\xfe---\n") # Not UTF-8
+
+        real_move = GroupCommit.move
+        def move(group_commit, source, destination):
+            if source.endswith("c.md"):
+                raise RuntimeError("disk on fire")
+            return real_move(group_commit, source, destination)
+
+        for jobs in ("1", "2"):
+            with patch.object(sys, 'argv', ['main.py', 'finalize', '--all', '--jobs', jobs]), \
+                    patch.object(GroupCommit, 'move', move), patch('builtins.print') as mock_print:
+                main_cli()
+            output = "\n".join(str(c.args[0]) for c in mock_print.call_args_list if c.args)
+            self.assertIn("- b.md: Frontmatter validation failed: Could not read", output)
+            self.assertIn("- c.md: Move failed: disk on fire", output)
+        self.assertEqual(sorted(os.listdir(final_dir)), ["a.md", "d.md"])
+        self.assertEqual(sorted(os.listdir(drafts_dir)), ["b.md", "c.md"])
+
+    @patch('src.main.get_push_queue_flush_threshold', return_value=3)
+    @patch('src.main.get_push_queue_dir')
+    @patch('src.main.get_github_repo_url', return_value="mock_git_url")
+    @patch('src.main.get_final_articles_dir')
+    @patch('src.main.GitHubHandler')
+    def test_push_queue_flushes_once_at_threshold(self, mock_GitHubHandler, mock_final_dir, mock_git_url,
+                                                  mock_queue_dir, mock_threshold):
+        final_dir, queue_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, final_dir)
+        self.addCleanup(shutil.rmtree, queue_dir)
+        mock_final_dir.return_value = final_dir
+        mock_queue_dir.return_value = queue_dir
+        mock_GitHubHandler.return_value.commit_push_articles.return_value = (True, "Pushed")
+
+        for name in ("c.md", "a.md", "b.md"):
+            with open(os.path.join(final_dir, name), 'w') as f:
+                f.write("article")
+            with patch.object(sys, 'argv', ['main.py', 'push', '--queue', '--article_name', name]):
+                with patch('builtins.print'):
+                    main_cli()
+            if name != "b.md":
+                mock_GitHubHandler.assert_not_called()
+
+        mock_GitHubHandler.assert_called_once()
+        mock_GitHubHandler.return_value.commit_push_articles.assert_called_once_with(
+            ["a.md", "b.md", "c.md"], commit_message=None
+        )
+        self.assertEqual([name for name in os.listdir(queue_dir) if name.endswith(".json")], [])
+
+        with patch.object(sys, 'argv', ['main.py', 'push', '--flush']):
+            with patch('builtins.print') as mock_print:
+                main_cli()
+        output = "\n".join(str(c.args[0]) for c in mock_print.call_args_list if c.args)
+        self.assertIn("Push queue is empty", output)
+        mock_GitHubHandler.assert_called_once()
+
+    @patch('src.main.get_github_repo_url', return_value="mock_git_url")
+    @patch('src.main.get_final_articles_dir')
+    @patch('src.main.GitHubHandler')
+    def test_push_since_commits_each_article_with_its_title(self, mock_GitHubHandler, mock_final_dir, mock_git_url):
+        final_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, final_dir)
+        mock_final_dir.return_value = final_dir
+        mock_GitHubHandler.return_value.commit_each_and_push.return_value = (True, "Pushed")
+        for name, title, mtime in (("old.md", "Old", 1_000), ("b.md", "Second Post", 3_000), ("a.md", None, 2_000)):
+            with open(os.path.join(final_dir, name), 'w') as f:
+                f.write(f"---\ntitle: {title}\n---\nBody\n" if title else "No frontmatter\n")
+            os.utime(os.path.join(final_dir, name), (mtime, mtime))
+
+        with patch.object(sys, 'argv', ['main.py', 'push', '--since', '1500']):
+            with patch('builtins.print'):
+                main_cli()
+
+        mock_GitHubHandler.return_value.commit_each_and_push.assert_called_once_with([
+            ("a.md", "feat: Add/update a.md (via CLI)"),
+            ("b.md", 'feat: Add/update "Second Post" (b.md)'),
+        ])
+
+        mock_GitHubHandler.reset_mock()
+        argv = ['main.py', 'push', '--article_name', 'a.md', '--article_name', 'b.md', '-m', 'one message']
+        with patch.object(sys, 'argv', argv):
+            with patch('builtins.print') as mock_print:
+                main_cli()
+        mock_GitHubHandler.assert_not_called()
+        self.assertIn("--message applies to a single commit", str(mock_print.call_args_list))
+
+        # Also when --since selects just one article: its commit is titled from the frontmatter
+        with patch.object(sys, 'argv', ['main.py', 'push', '--since', '2500', '-m', 'one message']):
+            with patch('builtins.print') as mock_print:
+                main_cli()
+        mock_GitHubHandler.assert_not_called()
+        self.assertIn("--message applies to a single commit", str(mock_print.call_args_list))
+
     # Argparse error tests
     def test_no_command_provided_exits(self):
         with patch.object(sys, 'argv', ['main.py']):
@@ -288,5 +690,89 @@ class TestMainCLICommands(unittest.TestCase):
             with self.assertRaises(SystemExit):
                 main_cli()
 
+class TestDaemonDispatch(unittest.TestCase):
+
+    @patch('src.main.get_gemini_api_key', return_value="mock_gemini_key")
+    @patch('src.main.get_chat_history_file_path', return_value="mock/chat_history.jsonl")
+    @patch('src.main.get_daemon_socket_path')
+    @patch('src.main.get_failed_validation_dir')
+    @patch('src.main.get_drafts_dir')
+    @patch('src.main.ArticleGenerator')
+    def test_daemon_reuses_model_client_between_commands(self, mock_ArticleGenerator, mock_drafts_dir, mock_failed_dir,
+                                                         mock_socket_path, mock_history_path, mock_gemini_key):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        mock_drafts_dir.return_value = root
+        mock_failed_dir.return_value = root
+        mock_socket_path.return_value = os.path.join(root, "none.sock")
+        # Stubbed model: every prompt yields a valid article
+        mock_ArticleGenerator.return_value.generate_article.return_value = (
+            "---\ntitle: 'Warm'\ndescription: 'd'\nexcerpt: 'e'\ncategories: ['c']\ntags: ['t1', 't2']\n"
+            "date: '2024-01-01'\n---\nBody\n"
+        )
+
+        with patch('src.main._warm_objects', {}):
+            for prompt in ("one", "two"):
+                exit_code, output = _run_in_daemon(["generate", "--prompt", prompt, "--no-cache"], cwd=root)
+                self.assertEqual(exit_code, 0, output)
+                self.assertIn("SUCCESS: Article draft generated", output)
+            exit_code, output = _run_in_daemon(["generate"])
+            self.assertEqual(exit_code, 2) # argparse error is reported, not raised
+            self.assertIn("required", output)
+            # Streamed: each line is handed over as it is printed, nothing is left for the reply
+            chunks = []
+            self.assertEqual(_run_in_daemon(["generate", "--prompt", "four", "--no-cache"], cwd=root,
+                                            write=chunks.append), (0, ""))
+            self.assertTrue(all(chunk.endswith("\n") for chunk in chunks))
+            self.assertIn("SUCCESS: Article draft generated", "".join(chunks))
+        mock_ArticleGenerator.assert_called_once()
+
+        # Without a daemon listening, --daemon runs the command in-process.
+        with patch.object(sys, 'argv', ['main.py', '--daemon', 'generate', '--prompt', 'three', '--no-cache']):
+            with patch('builtins.print') as mock_print:
+                main_cli()
+        output = "\n".join(str(c.args[0]) for c in mock_print.call_args_list if c.args)
+        self.assertIn("No daemon is listening", output)
+        self.assertEqual(mock_ArticleGenerator.call_count, 2)
+
+    @patch('src.main.get_gemini_api_key', return_value="mock_gemini_key")
+    @patch('src.main.get_chat_history_file_path')
+    @patch('src.main.get_failed_validation_dir')
+    @patch('src.main.get_drafts_dir')
+    @patch('src.article_generator._load_genai')
+    def test_daemon_runs_every_batch_on_one_event_loop(self, mock_load_genai, mock_drafts_dir, mock_failed_dir,
+                                                       mock_history_path, mock_gemini_key):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        mock_drafts_dir.return_value = os.path.join(root, "drafts")
+        mock_failed_dir.return_value = os.path.join(root, "failed")
+        mock_history_path.return_value = os.path.join(root, "chat_history.jsonl")
+        prompts_file = os.path.join(root, "prompts.txt")
+        with open(prompts_file, 'w') as f:
+            f.write("one\ntwo\n")
+
+        class LoopBoundModel:
+            """Like the SDK's model: its grpc.aio client is created on first use and only works on that loop."""
+            def __init__(self, model_name):
+                self.loops = []
+            async def generate_content_async(self, prompt):
+                loop = asyncio.get_running_loop()
+                if self.loops and loop is not self.loops[0]:
+                    raise RuntimeError("Task got Future attached to a different loop")
+                self.loops.append(loop)
+                return SimpleNamespace(text="---\ntitle: 'Warm'\ndescription: 'd'\nexcerpt: 'e'\ncategories: ['c']\n"
+                                            "tags: ['t1', 't2']\ndate: '2024-01-01'\n---\nBody\n")
+        mock_load_genai.return_value.GenerativeModel = LoopBoundModel
+
+        event_loop = asyncio.new_event_loop()
+        self.addCleanup(event_loop.close)
+        with patch('src.main._warm_objects', {}), patch('src.main._event_loop', event_loop):
+            for _ in range(2):
+                exit_code, output = _run_in_daemon(["generate", "--prompts-file", prompts_file, "--no-cache"], cwd=root)
+                self.assertEqual(exit_code, 0, output)
+                self.assertIn("2 succeeded, 0 failed", output)
+        mock_load_genai.return_value.configure.assert_called_once() # One warm generator for both batches
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import fcntl
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from push_queue import PushQueue
+
+class TestPushQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir)
+
+    def test_enqueue_keeps_order(self):
+        queue = PushQueue(self.spool_dir)
+        for name in ("b.md", "a.md", None):
+            queue.enqueue(article_name=name)
+        self.assertEqual(len(queue), 3)
+        self.assertEqual([intent["article"] for intent in queue.pending()], ["b.md", "a.md", None])
+
+    def test_coalesce(self):
+        articles, message = PushQueue.coalesce([
+            {"article": "b.md", "message": None},
+            {"article": "a.md", "message": "docs: a"},
+            {"article": "b.md", "message": "docs: a"},
+        ])
+        self.assertEqual(articles, ["a.md", "b.md"])
+        self.assertEqual(message, "docs: a")
+
+        articles, message = PushQueue.coalesce([{"article": "a.md"}, {"article": None}])
+        self.assertIsNone(articles)
+        self.assertIsNone(message)
+
+    def test_flush_removes_intents_only_on_success(self):
+        queue = PushQueue(self.spool_dir)
+        queue.enqueue(article_name="a.md")
+        queue.enqueue(article_name="b.md")
+
+        success, _, flushed = queue.flush(lambda intents: (False, "push failed"))
+        self.assertFalse(success)
+        self.assertEqual(len(queue), 2)
+
+        received = []
+        def push_intents(intents):
+            received.append([intent["article"] for intent in intents])
+            queue.enqueue(article_name="c.md") # Arrives while flushing
+            return True, "pushed"
+        success, message, flushed = queue.flush(push_intents)
+        self.assertTrue(success)
+        self.assertEqual(flushed, 2)
+        self.assertEqual(received, [["a.md", "b.md"]])
+        self.assertEqual([intent["article"] for intent in queue.pending()], ["c.md"])
+
+    def test_concurrent_flush_is_refused(self):
+        queue = PushQueue(self.spool_dir)
+        queue.enqueue(article_name="a.md")
+        with open(os.path.join(self.spool_dir, PushQueue.LOCK_NAME), 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            calls = []
+            success, message, flushed = queue.flush(lambda intents: calls.append(intents) or (True, ""))
+        self.assertFalse(success)
+        self.assertIn("already flushing", message)
+        self.assertEqual(calls, [])
+        self.assertEqual(len(queue), 1)
+
+    def test_bad_intents_are_quarantined_and_do_not_block_the_queue(self):
+        queue = PushQueue(self.spool_dir)
+        queue.enqueue(article_name="a.md")
+        bad_intents = {"0_torn.json": "{not json", "1_list.json": "[1, 2]", "2_escape.json": '{"article": "../etc/passwd"}',
+                       "3_number.json": '{"article": 7}', "4_message.json": '{"article": "b.md", "message": ["x"]}'}
+        for name, content in bad_intents.items():
+            with open(os.path.join(self.spool_dir, name), 'w') as f:
+                f.write(content)
+
+        received = []
+        with patch('builtins.print') as mock_print:
+            success, _, flushed = queue.flush(lambda intents: received.append(PushQueue.coalesce(intents)) or (True, "pushed"))
+        self.assertTrue(success)
+        self.assertEqual(flushed, 1)
+        self.assertEqual(received, [(["a.md"], None)])
+        self.assertEqual(mock_print.call_count, len(bad_intents))
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.spool_dir, PushQueue.QUARANTINE_DIR))), sorted(bad_intents))
+
+    def test_flush_empty_queue(self):
+        success, message, flushed = PushQueue(self.spool_dir).flush(lambda intents: (False, "unused"))
+        self.assertTrue(success)
+        self.assertEqual(flushed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
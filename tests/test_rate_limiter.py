@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from rate_limiter import TokenBucket, RateLimiter, RetryPolicy, is_transient_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResourceExhausted(Exception): # Same name as google.api_core.exceptions.ResourceExhausted
+    code = 429
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_reservations_queue_behind_each_other(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock) # 1 token per second, capacity 1
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        self.assertAlmostEqual(bucket.reserve(), 2.0)
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0.0) # Refilled, but never beyond capacity
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    def test_adjust_takes_and_returns_tokens(self):
+        clock = FakeClock()
+        bucket = TokenBucket(6000, clock=clock) # 100 tokens per second, capacity 100
+        self.assertAlmostEqual(bucket.reserve(300), 2.0)
+        bucket.adjust(-200) # Used 200 fewer than reserved
+        self.assertEqual(bucket.reserve(0), 0.0)
+        bucket.adjust(100)
+        self.assertAlmostEqual(bucket.reserve(0), 1.0)
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_wait_is_the_tighter_of_both_limits(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=60_000, clock=clock)
+        self.assertEqual(limiter.reserve(500), 0.0)
+        self.assertAlmostEqual(limiter.reserve(500), 1.0) # Request limit: 1 per second
+        self.assertAlmostEqual(limiter.reserve(3000), 3.0) # Token limit: 1000 per second
+        self.assertEqual(limiter.waits, 2)
+        self.assertAlmostEqual(limiter.total_wait_seconds, 4.0)
+
+    def test_unlimited_never_waits(self):
+        limiter = RateLimiter()
+        self.assertEqual([limiter.reserve(10**6) for _ in range(100)], [0.0] * 100)
+
+    def test_acquire_sleeps_for_the_wait(self):
+        limiter = RateLimiter(requests_per_minute=60, clock=FakeClock())
+        with patch('rate_limiter.time.sleep') as mock_sleep:
+            limiter.acquire()
+            limiter.acquire()
+        mock_sleep.assert_called_once_with(1.0)
+
+        with patch('rate_limiter.asyncio.sleep') as mock_async_sleep:
+            async def noop(seconds):
+                pass
+            mock_async_sleep.side_effect = noop
+            self.assertAlmostEqual(asyncio.run(limiter.aacquire()), 2.0)
+        mock_async_sleep.assert_called_once()
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_grows_with_jitter_and_is_capped(self):
+        low = RetryPolicy(base_delay=2.0, max_delay=10.0, rng=lambda: 0.0)
+        high = RetryPolicy(base_delay=2.0, max_delay=10.0, rng=lambda: 1.0)
+        self.assertEqual([low.delay(n) for n in range(4)], [1.0, 2.0, 4.0, 5.0])
+        self.assertEqual([high.delay(n) for n in range(4)], [2.0, 4.0, 8.0, 10.0])
+
+    def test_only_transient_errors_are_retried(self):
+        policy = RetryPolicy(max_retries=2)
+        self.assertTrue(policy.should_retry(ResourceExhausted("quota"), 0))
+        self.assertTrue(policy.should_retry(ResourceExhausted("quota"), 1))
+        self.assertFalse(policy.should_retry(ResourceExhausted("quota"), 2))
+        self.assertFalse(policy.should_retry(ValueError("bad prompt"), 0))
+
+    def test_is_transient_error(self):
+        class ServiceUnavailable(Exception):
+            pass
+        class HttpError(Exception):
+            def __init__(self, status_code):
+                self.status_code = status_code
+        self.assertTrue(is_transient_error(ServiceUnavailable()))
+        self.assertTrue(is_transient_error(HttpError(503)))
+        self.assertTrue(is_transient_error(ConnectionResetError()))
+        self.assertFalse(is_transient_error(HttpError(400)))
+        self.assertFalse(is_transient_error(TimeoutError()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_key_depends_on_model_and_prompt(self):
+        key = ResponseCache.make_key("model-a", "prompt")
+        self.assertEqual(key, ResponseCache.make_key("model-a", "prompt"))
+        self.assertNotEqual(key, ResponseCache.make_key("model-b", "prompt"))
+        self.assertNotEqual(key, ResponseCache.make_key("model-a", "other prompt"))
+
+    def test_put_and_get(self):
+        cache = ResponseCache(self.cache_dir)
+        key = cache.make_key("model", "prompt")
+        self.assertIsNone(cache.get(key))
+        self.assertTrue(cache.put(key, "model", "---\ntitle: T\n---\nBody"))
+        self.assertEqual(cache.get(key), "---\ntitle: T\n---\nBody")
+
+    def test_validator_rejects_response(self):
+        cache = ResponseCache(self.cache_dir, validator=lambda text: text.startswith("---"))
+        key = cache.make_key("model", "prompt")
+        self.assertFalse(cache.put(key, "model", "not an article"))
+        self.assertIsNone(cache.get(key))
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ResponseCache(self.cache_dir, ttl_seconds=60)
+        key = cache.make_key("model", "prompt")
+        cache.put(key, "model", "response")
+        with patch('response_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get(key))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = ResponseCache(self.cache_dir, max_entries=2)
+        keys = [cache.make_key("model", f"prompt {i}") for i in range(3)]
+        cache.put(keys[0], "model", "r0")
+        cache.put(keys[1], "model", "r1")
+        # Make entry 0 the most recently used and entry 1 the oldest.
+        now = time.time()
+        os.utime(os.path.join(self.cache_dir, f"{keys[1]}.json"), (now - 100, now - 100))
+        os.utime(os.path.join(self.cache_dir, f"{keys[0]}.json"), (now - 50, now - 50))
+        cache.get(keys[0])
+        cache.put(keys[2], "model", "r2")
+
+        self.assertEqual(cache.get(keys[0]), "r0")
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[2]), "r2")
+
+    def test_directory_is_scanned_only_when_over_the_limit(self):
+        cache = ResponseCache(self.cache_dir, max_entries=3)
+        with patch.object(cache, '_scan_entries', wraps=cache._scan_entries) as mock_scan:
+            for i in range(3):
+                cache.put(cache.make_key("model", f"prompt {i}"), "model", f"r{i}")
+                cache.put(cache.make_key("model", f"prompt {i}"), "model", f"r{i}") # Overwrite: count unchanged
+            self.assertEqual(mock_scan.call_count, 1) # Initial count only
+            cache.put(cache.make_key("model", "prompt 3"), "model", "r3")
+            self.assertEqual(mock_scan.call_count, 2)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_concurrent_puts_of_one_key_use_separate_temp_files(self):
+        cache = ResponseCache(self.cache_dir)
+        key = cache.make_key("model", "prompt")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: cache.put(key, "model", f"r{i}"), range(32)))
+        self.assertTrue(all(results))
+        self.assertIn(cache.get(key), {f"r{i}" for i in range(32)})
+        self.assertEqual(os.listdir(self.cache_dir), [f"{key}.json"]) # No temp files left behind
+
+
+if __name__ == '__main__':
+    unittest.main()